@@ -0,0 +1,82 @@
+import os
+import time
+
+from app.services.metrics_service import REQUEST_LATENCY
+from app.services.profiling_service import profile, profiling_allowed
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request latency per route template.
+
+    Labels use the matched route path (e.g. /api/hackathons) rather than the raw URL
+    so the number of series stays bounded. It avoids BaseHTTPMiddleware to keep the
+    per-request overhead to a couple of timer calls and one histogram observation.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = ["500"]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = str(message["status"])
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.labels(
+                method=scope["method"], route=route_path, status=status_holder[0]
+            ).observe(time.perf_counter() - start)
+
+class ProfilingMiddleware:
+    """
+    Profile individual API requests that carry an X-Profile header.
+
+    The header must carry PROFILING_TOKEN; when no token is configured only
+    requests from the local machine are profiled. Other requests are served
+    normally. An X-Profile-Mode header may name the profiler ("sampling" or
+    "cprofile"), otherwise the configured default is used. The profile file name
+    is returned in the X-Profile-File response header. Only installed when
+    PROFILING_ENABLED is set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = mode = None
+        for key, value in scope["headers"]:
+            if key == b"x-profile":
+                token = value.decode("latin-1").strip()
+            elif key == b"x-profile-mode":
+                mode = value.decode("latin-1").strip().lower()
+
+        client_host = (scope.get("client") or ("", 0))[0]
+        if not token or not profiling_allowed(token, client_host):
+            await self.app(scope, receive, send)
+            return
+
+        mode = mode if mode in ("sampling", "cprofile") else None
+        with profile(f"{scope['method']}-{scope['path']}", mode=mode) as result:
+            profile_file = os.path.basename(result["path"]).encode("latin-1")
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + [(b"x-profile-file", profile_file)]
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
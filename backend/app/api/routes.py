@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
+import gzip
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from app.db.database import get_db
 from app.models.hackathon import Hackathon
-from app.services.hackathon_service import get_hackathons, trigger_scraping, SCRAPE_TASK_NAME
+from app.models.theme import Theme, ThemeModel
+from app.models.notification_preference import NotificationPreferenceModel, NotificationPreferences
+from app.services.hackathon_service import get_hackathons, trigger_scraping, SCRAPE_TASK_NAME, SOURCE_SCRAPERS
 from app.services.last_run_service import get_last_run, update_last_run
-from app.services.notification_service import send_notification
-from firebase_admin import messaging
+from app.services.scrape_schedule_service import get_schedules
+from app.services.subscription_service import subscriber
+from app.services.snapshot_service import upcoming_page
+from app.services.static_snapshot_service import resolve_static_path, MANIFEST_NAME
 from datetime import datetime, timedelta
 
 router = APIRouter()
@@ -18,30 +26,177 @@ async def read_hackathons(
     db: Session = Depends(get_db),
     location: Optional[str] = Query(None, description="Filter by location"),
     source: Optional[str] = Query(None, description="Filter by source platform"),
+    city: Optional[str] = Query(None, description="Filter by normalized city"),
+    country: Optional[str] = Query(None, description="Filter by country"),
+    is_online: Optional[bool] = Query(None, description="Only online (true) or in-person (false) hackathons"),
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Latitude for a radius search"),
+    lon: Optional[float] = Query(None, ge=-180, le=180, description="Longitude for a radius search"),
+    radius_km: Optional[float] = Query(None, gt=0, le=5000, description="Radius around lat/lon in kilometres"),
+    canonical_only: bool = Query(False, description="Hide listings of the same event on other sources"),
+    theme: Optional[List[str]] = Query(None, description="Only hackathons with any of these themes (repeatable)"),
+    min_prize_inr: Optional[int] = Query(None, ge=0, description="Minimum total cash prize in INR"),
+    organizer: Optional[str] = Query(None, description="Filter by organizer"),
+    include_past: bool = Query(False, description="Also return archived hackathons that have ended"),
     skip: int = 0,
     limit: int = 500
 ):
     """
-    Get all hackathons with optional filtering by location and source.
+    Get all hackathons with optional filtering by location, source, structured
+    location fields, distance from a point, themes, prize or organizer.
+    canonical_only returns each event once even when it is listed on several
+    platforms. Ended hackathons are archived and only returned with include_past.
     """
-    return get_hackathons(db, location=location, source=source, skip=skip, limit=limit)
+    radius_params = [lat, lon, radius_km]
+    if any(param is not None for param in radius_params) and None in radius_params:
+        raise HTTPException(status_code=400, detail="lat, lon and radius_km must be given together")
+    
+    # The unfiltered listing is served from the snapshot rebuilt after each scrape
+    filters = [location, source, city, country, is_online, lat, lon, radius_km, theme, min_prize_inr, organizer]
+    if all(value is None for value in filters) and not canonical_only and not include_past:
+        page = upcoming_page(skip, limit)
+        if page is not None:
+            return Response(content=page, media_type="application/json")
+    
+    return get_hackathons(db, location=location, source=source, skip=skip, limit=limit,
+                          city=city, country=country, is_online=is_online,
+                          latitude=lat, longitude=lon, radius_km=radius_km,
+                          canonical_only=canonical_only, themes=theme,
+                          min_prize_inr=min_prize_inr, organizer=organizer,
+                          include_past=include_past)
+
+@router.get("/themes", response_model=List[Theme])
+async def read_themes(db: Session = Depends(get_db)):
+    """
+    Get all known themes, for building theme filters.
+    """
+    return db.query(ThemeModel).order_by(ThemeModel.key).all()
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows a gzip response (q=0 refuses it)"""
+    for coding in accept_encoding.lower().split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip() in ("gzip", "*"):
+            quality = params.strip()
+            if not quality.startswith("q="):
+                return True
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+    return False
+
+def _read_gunzipped(path: str) -> bytes:
+    with gzip.open(path, "rb") as f:
+        return f.read()
+
+@router.get("/snapshots/{path:path}", include_in_schema=False)
+async def read_static_snapshot(path: str, request: Request):
+    """
+    Serve the static JSON snapshots published after each scrape.
+    
+    Shards are content-addressed, so they are stored pre-gzipped and cacheable
+    forever; clients that don't accept gzip get them decompressed on the fly.
+    The manifest naming the current shards is revalidated on every use.
+    """
+    full_path = resolve_static_path(path)
+    if full_path is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    
+    if path == MANIFEST_NAME:
+        return FileResponse(full_path, media_type="application/json", headers={"Cache-Control": "no-cache"})
+    
+    headers = {"Cache-Control": "public, max-age=31536000, immutable", "Vary": "Accept-Encoding"}
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        return FileResponse(full_path, media_type="application/json", headers=dict(headers, **{"Content-Encoding": "gzip"}))
+    content = await run_in_threadpool(_read_gunzipped, full_path)
+    return Response(content, media_type="application/json", headers=headers)
 
 # Notification subscription model
 class SubscriptionRequest(BaseModel):
-    token: str
     topic: str
+    token: Optional[str] = None
+    tokens: List[str] = []
 
 @router.post("/notifications/subscribe", status_code=200)
 async def subscribe_to_topic(request: SubscriptionRequest):
     """
-    Subscribe a device token to a Firebase Cloud Messaging topic.
+    Subscribe one or more device tokens to a Firebase Cloud Messaging topic.
+    Concurrent requests are coalesced into bulk Firebase calls.
+    """
+    tokens = ([request.token] if request.token else []) + request.tokens
+    if not tokens:
+        raise HTTPException(status_code=422, detail="Provide a token or a list of tokens")
+    
+    # Register the devices to receive notifications for the given topic
+    errors = await subscriber.subscribe(tokens, request.topic)
+    
+    if all(errors[token] for token in tokens):
+        raise HTTPException(status_code=500, detail=f"Failed to subscribe: {errors[tokens[0]]}")
+    
+    return {
+        "message": f"Successfully subscribed to {request.topic}",
+        "results": [
+            {"token": token, "success": errors[token] is None, "error": errors[token]}
+            for token in tokens
+        ],
+    }
+
+@router.post("/notifications/preferences", response_model=NotificationPreferences)
+async def save_notification_preferences(preferences: NotificationPreferences, db: Session = Depends(get_db)):
+    """
+    Store the subscription rules for a device token, replacing any existing rules.
+    Empty lists match any value.
+    """
+    existing = db.query(NotificationPreferenceModel).filter(
+        NotificationPreferenceModel.token == preferences.token
+    ).first()
+    
+    if existing:
+        existing.cities = preferences.cities
+        existing.themes = preferences.themes
+        existing.sources = preferences.sources
+        existing.mode = preferences.mode
+        existing.require_prize = preferences.require_prize
+        record = existing
+    else:
+        record = NotificationPreferenceModel(**preferences.dict())
+        db.add(record)
+    
+    db.commit()
+    db.refresh(record)
+    return record
+
+@router.get("/notifications/preferences/{token}", response_model=NotificationPreferences)
+async def read_notification_preferences(token: str, db: Session = Depends(get_db)):
+    """
+    Get the subscription rules stored for a device token.
+    """
+    record = db.query(NotificationPreferenceModel).filter(NotificationPreferenceModel.token == token).first()
+    if not record:
+        raise HTTPException(status_code=404, detail="No preferences stored for this token")
+    return record
+
+@router.delete("/notifications/preferences/{token}", status_code=200)
+async def delete_notification_preferences(token: str, db: Session = Depends(get_db)):
+    """
+    Remove the subscription rules for a device token.
+    """
+    deleted = db.query(NotificationPreferenceModel).filter(NotificationPreferenceModel.token == token).delete()
+    db.commit()
+    if not deleted:
+        raise HTTPException(status_code=404, detail="No preferences stored for this token")
+    return {"message": "Preferences deleted"}
+
+def _next_scheduled_run(last_run: datetime):
+    """
+    When the next scrape is due, with every source's schedule.
+
+    Each source runs on its own adaptive interval; the next run is the earliest
+    one, or a day after the last run if no source has been scheduled yet.
     """
-    try:
-        # Register the device to receive notifications for a given topic
-        messaging.subscribe_to_topic([request.token], request.topic)
-        return {"message": f"Successfully subscribed to {request.topic}"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to subscribe: {str(e)}")
+    schedules = get_schedules(list(SOURCE_SCRAPERS))
+    next_runs = [schedule.next_run for schedule in schedules.values() if schedule]
+    return (min(next_runs) if next_runs else last_run + timedelta(hours=24)), schedules
 
 @router.post("/scrape", status_code=202)
 async def scrape_hackathons():
@@ -63,7 +218,7 @@ async def scrape_hackathons():
     
     # If we have a last run time, include the next scheduled run
     if last_run:
-        next_scheduled = last_run + timedelta(hours=24)
+        next_scheduled, _ = _next_scheduled_run(last_run)
         response["next_scheduled_run"] = next_scheduled.isoformat()
     
     return response
@@ -82,7 +237,7 @@ async def get_scrape_status():
             "message": "No scraping has been performed yet"
         }
     
-    next_scheduled = last_run + timedelta(hours=24)
+    next_scheduled, schedules = _next_scheduled_run(last_run)
     now = datetime.utcnow()
     
     return {
@@ -90,4 +245,11 @@ async def get_scrape_status():
         "next_scheduled_run": next_scheduled.isoformat(),
         "time_since_last_run": str(now - last_run).split('.')[0],  # Remove microseconds
         "time_until_next_run": str(next_scheduled - now).split('.')[0] if next_scheduled > now else "Overdue",
+        "sources": {
+            source: {
+                "next_scheduled_run": schedule.next_run.isoformat(),
+                "interval_hours": schedule.interval_hours,
+            } if schedule else None
+            for source, schedule in schedules.items()
+        },
     }
\ No newline at end of file
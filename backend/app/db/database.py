@@ -1,9 +1,12 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
+import time
 from dotenv import load_dotenv
 
+from app.services.metrics_service import observe_db_query
+
 load_dotenv()
 
 # Database URL from environment variable or default to SQLite for development
@@ -27,6 +30,15 @@ else:
     # Local database connection
     engine = create_engine(DATABASE_URL)
 
+# Record statement execution time for the metrics endpoint
+@event.listens_for(engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start_time"] = time.perf_counter()
+
+@event.listens_for(engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    observe_db_query(statement, time.perf_counter() - conn.info["query_start_time"])
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
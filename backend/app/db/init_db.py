@@ -1,10 +1,137 @@
 import logging
+from sqlalchemy import inspect, text, select, or_
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.db.database import engine, Base
+from app.db.database import engine, Base, SessionLocal
+# Import the models so their tables are registered on Base
+from app.models.hackathon import HackathonModel  # noqa: F401
+from app.models.notification_preference import NotificationPreferenceModel  # noqa: F401
+from app.models.notification_outbox import NotificationOutboxModel  # noqa: F401
+from app.models.scheduler_state import SchedulerStateModel  # noqa: F401
+from app.models.theme import ThemeModel, hackathon_themes  # noqa: F401
+from app.services.location_service import location_columns
+from app.services.prize_service import parse_prize_amount
+from app.services.theme_service import theme_keys, get_or_create_themes, themes_for
+from app.services.dedup_service import deduplicate_hackathons
 
 logger = logging.getLogger(__name__)
 
+# Rows updated per transaction when backfilling new columns
+BACKFILL_BATCH_SIZE = 1000
+
+def _add_missing_columns():
+    """
+    Add columns introduced after a table was created, since create_all skips existing tables.
+
+    Returns:
+        set: (table, column) names that were added
+    """
+    added = set()
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name, schema=table.schema)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            with engine.begin() as connection:
+                connection.execute(text(f"ALTER TABLE {table.schema}.{table.name} ADD COLUMN {column.name} {column_type}"))
+            logger.info(f"Added column {table.name}.{column.name}")
+            added.add((table.name, column.name))
+    return added
+
+def _backfill_locations():
+    """Fill the structured location columns of rows stored before they existed"""
+    db = SessionLocal()
+    try:
+        last_id = 0
+        total = 0
+        while True:
+            rows = db.query(HackathonModel).filter(
+                HackathonModel.is_online.is_(None),
+                HackathonModel.id > last_id,
+            ).order_by(HackathonModel.id).limit(BACKFILL_BATCH_SIZE).all()
+            if not rows:
+                break
+            for row in rows:
+                for column, value in location_columns(row.location).items():
+                    setattr(row, column, value)
+            db.commit()
+            last_id = rows[-1].id
+            total += len(rows)
+        if total:
+            logger.info(f"Backfilled structured locations for {total} hackathons")
+    finally:
+        db.close()
+
+# Description labels scrapers used for themes, prizes and organizers
+_CATALOG_LABELS = ("Themes", "Categories", "Prize", "Prizes", "Organized by")
+
+def _parse_description(description):
+    """Recover themes, prize and organizer from the "Label: value | ..." descriptions scrapers used to flatten them into"""
+    parsed = {"themes": [], "prize_inr": None, "organizer": None}
+    for part in (description or "").split(" | "):
+        label, _, value = part.partition(": ")
+        if label in ("Themes", "Categories"):
+            parsed["themes"].extend(theme for theme in value.split(", ") if theme)
+        elif label == "Prize":
+            parsed["prize_inr"] = parse_prize_amount(value)
+        elif label == "Prizes":
+            amounts = [amount for amount in map(parse_prize_amount, value.split(", ")) if amount]
+            parsed["prize_inr"] = sum(amounts) if amounts else None
+        elif label == "Organized by":
+            parsed["organizer"] = value[:255] or None
+    return parsed
+
+def _backfill_catalog():
+    """
+    Fill themes, prize and organizer of rows stored before they had their own columns.
+
+    Candidates are found from the data rather than from whether the columns were
+    just added, so an interrupted backfill resumes on the next start: rows with
+    none of the three set whose description still carries one of the old labels.
+    """
+    db = SessionLocal()
+    try:
+        last_id = 0
+        total = 0
+        while True:
+            rows = db.query(HackathonModel).filter(
+                HackathonModel.id > last_id,
+                HackathonModel.prize_inr.is_(None),
+                HackathonModel.organizer.is_(None),
+                ~HackathonModel.id.in_(select(hackathon_themes.c.hackathon_id)),
+                or_(*[HackathonModel.description.like(f"%{label}: %") for label in _CATALOG_LABELS]),
+            ).order_by(HackathonModel.id).limit(BACKFILL_BATCH_SIZE).all()
+            if not rows:
+                break
+            parsed = {row.id: _parse_description(row.description) for row in rows}
+            themes_by_key = get_or_create_themes(db, {
+                key: name for values in parsed.values() for key, name in theme_keys(values["themes"]).items()
+            })
+            for row in rows:
+                values = parsed[row.id]
+                row.themes = themes_for(themes_by_key, values["themes"])
+                row.prize_inr = values["prize_inr"]
+                row.organizer = values["organizer"]
+            last_id = rows[-1].id
+            db.commit()
+            total += len(rows)
+        if total:
+            logger.info(f"Backfilled themes, prizes and organizers for {total} hackathons")
+    finally:
+        db.close()
+
+def _link_duplicates():
+    """Run duplicate detection once over rows stored before canonical_id existed"""
+    db = SessionLocal()
+    try:
+        unlinked = db.query(HackathonModel.id).filter(HackathonModel.canonical_id.is_(None)).first()
+    finally:
+        db.close()
+    if unlinked:
+        deduplicate_hackathons()
+
 def init_db():
     """
     Initialize the database by creating all tables.
@@ -12,7 +139,17 @@ def init_db():
     try:
         # Create all tables
         Base.metadata.create_all(bind=engine)
+        
+        # create_all skips tables that already exist, so add columns and indexes introduced later
+        _add_missing_columns()
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
         logger.info("Database tables created successfully.")
+        
+        _backfill_locations()
+        _backfill_catalog()
+        _link_duplicates()
     except SQLAlchemyError as e:
         logger.error(f"Error creating database tables: {str(e)}")
         raise
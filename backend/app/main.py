@@ -1,9 +1,12 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router as api_router
+from app.api.middleware import MetricsMiddleware, ProfilingMiddleware
 import os
 import logging
 from app.services.hackathon_service import check_and_run_scraping_if_needed
+from app.services.metrics_service import render_metrics
+from app.services.profiling_service import PROFILING_ENABLED, PROFILING_TOKEN, PROFILING_ALLOW_LOCAL
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -36,6 +39,15 @@ app.add_middleware(
     max_age=86400,  # Cache preflight requests for 24 hours
 )
 
+# Profile requests sent with an X-Profile header, only installed when enabled
+if PROFILING_ENABLED:
+    if not PROFILING_TOKEN and not PROFILING_ALLOW_LOCAL:
+        logger.warning("PROFILING_ENABLED is set without PROFILING_TOKEN, no request will be profiled")
+    app.add_middleware(ProfilingMiddleware)
+
+# Record request latency per route (outermost so CORS handling is included)
+app.add_middleware(MetricsMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api")
 
@@ -48,6 +60,14 @@ async def root():
         "allowed_origins": allowed_origins,
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Expose API metrics in the Prometheus text format.
+    """
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
 # Add startup event to check for scraping tasks
 @app.on_event("startup")
 async def startup_event():
@@ -1,28 +1,90 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float, Index
+from sqlalchemy.orm import relationship, foreign
 from sqlalchemy.sql import func
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from app.db.database import Base
+from app.models.theme import Theme, ThemeModel, hackathon_themes
 
-# SQLAlchemy ORM model
-class HackathonModel(Base):
-    __tablename__ = "hackathons"
-    __table_args__ = {"schema": "public"}  # Explicitly set schema
-
+class HackathonColumns:
+    """Columns shared by the live hackathons table and its archive"""
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    start_date = Column(DateTime, nullable=True)
-    end_date = Column(DateTime, nullable=True)
+    start_date = Column(DateTime, nullable=True, index=True)  # Indexed for reminder window scans
+    end_date = Column(DateTime, nullable=True, index=True)
     location = Column(String(255), nullable=True)
+    # Structured location from location_service.normalize_location
+    city = Column(String(100), nullable=True, index=True)
+    country = Column(String(100), nullable=True, index=True)
+    is_online = Column(Boolean, nullable=True, index=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
     registration_link = Column(String(512), nullable=False)
     source = Column(String(50), nullable=False)  # Unstop, Devfolio, Devpost
     image_url = Column(String(512), nullable=True)
+    organizer = Column(String(255), nullable=True, index=True)
+    prize_inr = Column(Integer, nullable=True, index=True)  # Total cash prize converted to INR
+    # Lowest id of the cross-source duplicate group (dedup_service), own id if unique
+    canonical_id = Column(Integer, nullable=True, index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+def _themes_relationship(model, **kwargs):
+    """Theme links by hackathon id; ids are kept on archival so the links follow the row"""
+    return relationship(
+        ThemeModel,
+        secondary=hackathon_themes,
+        primaryjoin=lambda: model.id == foreign(hackathon_themes.c.hackathon_id),
+        secondaryjoin=ThemeModel.id == foreign(hackathon_themes.c.theme_id),
+        # Loaded with one extra query per page of results rather than one per hackathon
+        lazy="selectin",
+        order_by=ThemeModel.key,
+        **kwargs
+    )
+
+# SQLAlchemy ORM model
+class HackathonModel(HackathonColumns, Base):
+    """Live hackathons; ended ones are moved to ArchivedHackathonModel by archive_service"""
+    __tablename__ = "hackathons"
+    __table_args__ = (
+        # Bounding-box prefilter for radius queries where PostgreSQL's GiST index
+        # below isn't available; a btree only narrows on latitude
+        Index("ix_hackathons_lat_lon", "latitude", "longitude").ddl_if(
+            callable_=lambda ddl, target, bind, **kw: bind.dialect.name != "postgresql"
+        ),
+        # Never reuse the id of an archived row on SQLite either
+        {"schema": "public", "sqlite_autoincrement": True},  # Explicitly set schema
+    )
+
+HackathonModel.themes = _themes_relationship(HackathonModel)
+
+# Spatial index for radius queries on PostgreSQL: a GiST index over the built-in
+# point type answers "inside this box" on latitude and longitude at once, without
+# needing PostGIS. hackathon_service filters on the same point(longitude, latitude)
+# expression so the planner can use it.
+Index(
+    "ix_hackathons_location_point",
+    func.point(HackathonModel.longitude, HackathonModel.latitude),
+    postgresql_using="gist",
+).ddl_if(dialect="postgresql")
+
+class ArchivedHackathonModel(HackathonColumns, Base):
+    """Hackathons that have ended, with the id they had in the live table"""
+    __tablename__ = "hackathons_archive"
+    __table_args__ = (
+        # Lets scrapers recognize an archived event that is still listed
+        Index("ix_hackathons_archive_source_name", "source", "name"),
+        {"schema": "public"},  # Explicitly set schema
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    archived_at = Column(DateTime, server_default=func.now(), index=True)
+
+ArchivedHackathonModel.themes = _themes_relationship(ArchivedHackathonModel, viewonly=True)
+
 # Pydantic model for API responses
 class Hackathon(BaseModel):
     id: int
@@ -31,9 +93,18 @@ class Hackathon(BaseModel):
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     location: Optional[str] = None
+    city: Optional[str] = None
+    country: Optional[str] = None
+    is_online: Optional[bool] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     registration_link: str
     source: str
     image_url: Optional[str] = None
+    organizer: Optional[str] = None
+    prize_inr: Optional[int] = None
+    themes: List[Theme] = []
+    canonical_id: Optional[int] = None
     created_at: datetime
     updated_at: datetime
 
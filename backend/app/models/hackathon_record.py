@@ -0,0 +1,99 @@
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+# Record fields sent as ISO strings in task arguments and outbox payloads
+DATE_FIELDS = ("start_date", "end_date")
+
+# Record fields stored as HackathonModel columns; themes become theme links
+# and has_prize is only used for notification matching
+COLUMN_FIELDS = (
+    "name", "description", "start_date", "end_date", "location",
+    "registration_link", "source", "image_url", "organizer", "prize_inr",
+)
+
+class HackathonRecord(NamedTuple):
+    """
+    A normalized hackathon as emitted by every scraper.
+
+    A slotted, immutable tuple: it is what the scrapers produce, what ingest
+    stores (building an ORM object only for rows that are actually inserted)
+    and what notifications are built from. id is set once the row is stored.
+    """
+    name: str
+    description: Optional[str]
+    start_date: Optional[datetime]
+    end_date: Optional[datetime]
+    location: Optional[str]
+    registration_link: str
+    source: str
+    image_url: Optional[str] = None
+    organizer: Optional[str] = None
+    prize_inr: Optional[int] = None
+    themes: Tuple[str, ...] = ()
+    has_prize: bool = False
+    id: Optional[int] = None
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        """The (name, source) pair a hackathon is deduplicated on within a source"""
+        return self.name, self.source
+
+    def column_values(self) -> Dict[str, Any]:
+        """Values for the HackathonModel columns the record maps to"""
+        return {field: getattr(self, field) for field in COLUMN_FIELDS}
+
+    def to_payload(self) -> Dict[str, Any]:
+        """JSON-serializable form, for Celery task arguments and outbox payloads"""
+        payload = self._asdict()
+        for field in DATE_FIELDS:
+            if payload[field]:
+                payload[field] = payload[field].isoformat()
+        payload["themes"] = list(self.themes)
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "HackathonRecord":
+        """Rebuild a record from to_payload() output, ignoring keys it doesn't know"""
+        values = {field: payload.get(field, cls._field_defaults.get(field)) for field in cls._fields}
+        # Reminders queued before payloads were built from records only carried "url"
+        values["registration_link"] = values["registration_link"] or payload.get("url", "")
+        for field in DATE_FIELDS:
+            if values.get(field):
+                values[field] = datetime.fromisoformat(values[field])
+        values["themes"] = tuple(values.get("themes") or ())
+        return cls(**values)
+
+    @classmethod
+    def from_model(cls, hackathon) -> "HackathonRecord":
+        """The record for a stored hackathon row"""
+        values = {field: getattr(hackathon, field) for field in COLUMN_FIELDS}
+        return cls(
+            themes=tuple(theme.name for theme in hackathon.themes),
+            has_prize=bool(hackathon.prize_inr),
+            id=hackathon.id,
+            **values
+        )
+
+class HackathonReminder(NamedTuple):
+    """A due "starts soon" or "closing soon" reminder for a stored hackathon"""
+    hackathon: HackathonRecord
+    kind: str
+    due_field: str
+    due_at: str
+    lead_hours: int
+
+    def to_payload(self) -> Dict[str, Any]:
+        """The hackathon's payload plus the reminder fields, as stored in the outbox"""
+        payload = self.hackathon.to_payload()
+        payload.update(reminder=self.kind, due_field=self.due_field, due_at=self.due_at, lead_hours=self.lead_hours)
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "HackathonReminder":
+        return cls(
+            HackathonRecord.from_payload(payload),
+            payload["reminder"],
+            payload["due_field"],
+            payload["due_at"],
+            payload.get("lead_hours", 24),
+        )
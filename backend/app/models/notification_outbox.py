@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Index
+from sqlalchemy.sql import func
+from datetime import datetime
+
+from app.db.database import Base
+
+# SQLAlchemy ORM model for notification events written alongside new hackathons
+class NotificationOutboxModel(Base):
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index("ix_notification_outbox_status_next_attempt", "status", "next_attempt_at"),
+        {"schema": "public"},  # Explicitly set schema
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    idempotency_key = Column(String(255), nullable=False, unique=True)
+    event_type = Column(String(50), nullable=False)  # hackathon_created, hackathon_reminder
+    payload = Column(JSON, nullable=False)  # The hackathon dictionary
+    status = Column(String(20), nullable=False, default="pending")  # pending, processing, sent, failed, cancelled
+    attempts = Column(Integer, nullable=False, default=0)
+    delivered_targets = Column(JSON, nullable=False, default=list)  # Topics/tokens already notified
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    claimed_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+    processed_at = Column(DateTime, nullable=True)
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON
+from sqlalchemy.sql import func
+from pydantic import BaseModel, validator
+from datetime import datetime
+from typing import List
+
+from app.db.database import Base
+
+# Accepted values for the online/offline preference
+PREFERENCE_MODES = ("any", "online", "offline")
+
+# SQLAlchemy ORM model
+class NotificationPreferenceModel(Base):
+    __tablename__ = "notification_preferences"
+    __table_args__ = {"schema": "public"}  # Explicitly set schema
+
+    id = Column(Integer, primary_key=True, index=True)
+    token = Column(String(512), nullable=False, unique=True)  # FCM registration token
+    cities = Column(JSON, nullable=False, default=list)   # Empty list matches any city
+    themes = Column(JSON, nullable=False, default=list)   # Empty list matches any theme
+    sources = Column(JSON, nullable=False, default=list)  # Empty list matches any source
+    mode = Column(String(10), nullable=False, default="any")  # any, online or offline
+    require_prize = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+# Pydantic model for subscription requests
+class NotificationPreferences(BaseModel):
+    token: str
+    cities: List[str] = []
+    themes: List[str] = []
+    sources: List[str] = []
+    mode: str = "any"
+    require_prize: bool = False
+
+    @validator("mode")
+    def validate_mode(cls, value):
+        if value not in PREFERENCE_MODES:
+            raise ValueError(f"mode must be one of {', '.join(PREFERENCE_MODES)}")
+        return value
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+# SQLAlchemy ORM model for last-run times and other scheduling state shared by all nodes
+class SchedulerStateModel(Base):
+    __tablename__ = "scheduler_state"
+    __table_args__ = {"schema": "public"}  # Explicitly set schema
+
+    name = Column(String(100), primary_key=True)  # e.g. scrape_all_sources
+    value = Column(String(64), nullable=False)  # ISO timestamp, compared as-is for compare-and-set
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, Table, ForeignKey, Index
+from pydantic import BaseModel
+
+from app.db.database import Base
+
+# Many-to-many links between hackathons and themes. The primary key leads with
+# theme_id so "hackathons with theme X" is a prefix scan; the hackathon_id index
+# serves loading a page of hackathons' themes. hackathon_id has no foreign key
+# because the row it points to moves to hackathons_archive once the event ends.
+hackathon_themes = Table(
+    "hackathon_themes",
+    Base.metadata,
+    Column("theme_id", Integer, ForeignKey("public.themes.id", ondelete="CASCADE"), primary_key=True),
+    Column("hackathon_id", Integer, primary_key=True),
+    Index("ix_hackathon_themes_hackathon_id", "hackathon_id"),
+    schema="public",
+)
+
+# SQLAlchemy ORM model
+class ThemeModel(Base):
+    __tablename__ = "themes"
+    __table_args__ = {"schema": "public"}  # Explicitly set schema
+
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String(100), nullable=False, unique=True)  # Lowercase lookup key, see theme_service.theme_keys
+    name = Column(String(100), nullable=False)  # Display name as first scraped
+
+# Pydantic model for API responses
+class Theme(BaseModel):
+    id: int
+    key: str
+    name: str
+
+    class Config:
+        orm_mode = True
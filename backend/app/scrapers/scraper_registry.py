@@ -0,0 +1,224 @@
+import os
+import copy
+import logging
+import pkgutil
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from app.models.hackathon_record import HackathonRecord
+from app.services.http_service import Deadline, DeadlineExceeded, HttpClient, client as shared_client
+from app.services.ingest_service import persist_hackathons
+from app.services.circuit_breaker_service import circuit_allows, record_circuit_result
+from app.services.metrics_service import record_scrape_outcome
+
+logger = logging.getLogger(__name__)
+
+# Pages and detail requests a scraper has in flight at once; rate limits still apply
+SCRAPER_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", "4"))
+
+# Upper bound on pages fetched from a source that doesn't report its page count
+SCRAPER_MAX_PAGES = int(os.getenv("SCRAPER_MAX_PAGES", "100"))
+
+# Seconds one source's fetch may take, requests and retries included; what was
+# fetched by then is kept. Keep it below the Celery task_soft_time_limit (300s).
+SCRAPE_SOURCE_BUDGET_SECONDS = float(os.getenv("SCRAPE_SOURCE_BUDGET_SECONDS", "120"))
+
+class ScraperPlugin:
+    """
+    A hackathon source: how to paginate its listing and normalize its entries.
+
+    Subclasses set `source` and implement page_url(), parse_page() and
+    normalize(); everything else is shared. Requests go through the pooled
+    HttpClient (timeouts, retries, per-domain rate limits); once the first page
+    reports how many there are, the remaining pages are fetched concurrently;
+    entries are normalized concurrently, so detail-page lookups overlap; and
+    scrape() stores the new records through ingest_service in batched queries.
+    Each fetch runs within a time budget and behind a per-source circuit
+    breaker (see fetch_with_outcome()). Decorate the subclass with @register_scraper in an
+    app/scrapers/*_scraper.py module and it is picked up by every scrape.
+    """
+    # Name stored in HackathonModel.source
+    source: str = None
+
+    # Position in a full sweep, lowest first
+    order: int = 100
+
+    # (requests per second, burst) per domain this source fetches from; subdomains included
+    rate_limits: Dict[str, Tuple[float, int]] = {}
+
+    def __init__(self, client: HttpClient = None):
+        self.client = client or shared_client
+        self.deadline: Optional[Deadline] = None
+        self.incomplete = False
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET a URL through the shared client, labelled with this source and within the run's budget"""
+        return self.client.get(url, self.source, deadline=self.deadline, **kwargs)
+
+    def prepare(self):
+        """Load anything normalize() needs once per run (e.g. lookup lists)"""
+
+    def page_url(self, page: int) -> str:
+        """URL of a 1-based listing page"""
+        raise NotImplementedError
+
+    def parse_page(self, response: requests.Response) -> Tuple[List[Any], Optional[int]]:
+        """
+        Extract a page's raw entries.
+
+        Returns:
+            Tuple[List[Any], Optional[int]]: The entries and the last page number,
+            or None when the source doesn't say (pages are then fetched one by
+            one until an empty page)
+        """
+        raise NotImplementedError
+
+    def normalize(self, item: Any) -> Optional[HackathonRecord]:
+        """Turn one raw entry into a record, or None to skip it"""
+        raise NotImplementedError
+
+    def _fetch_page(self, page: int) -> Optional[List[Any]]:
+        try:
+            items, _ = self.parse_page(self.get(self.page_url(page)))
+            return items
+        except DeadlineExceeded:
+            self.incomplete = True
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching {self.source} page {page}: {str(e)}")
+            self.incomplete = True
+            return None
+
+    def fetch_items(self) -> List[Any]:
+        """
+        Fetch the raw entries of every listing page.
+
+        A failing or empty page, or running out of budget, ends the listing;
+        entries from the pages before it are kept.
+        """
+        items, last_page = self.parse_page(self.get(self.page_url(1)))
+        if not items:
+            return []
+        all_items = list(items)
+
+        if last_page is not None:
+            pages = range(2, min(last_page, SCRAPER_MAX_PAGES) + 1)
+            with ThreadPoolExecutor(max_workers=SCRAPER_CONCURRENCY) as executor:
+                for page_items in executor.map(self._fetch_page, pages):
+                    if not page_items:
+                        break
+                    all_items.extend(page_items)
+        else:
+            for page in range(2, SCRAPER_MAX_PAGES + 1):
+                page_items = self._fetch_page(page)
+                if not page_items:
+                    break
+                all_items.extend(page_items)
+        return all_items
+
+    def _normalize(self, item: Any) -> Optional[HackathonRecord]:
+        try:
+            return self.normalize(item)
+        except DeadlineExceeded:
+            # Left for the next run rather than stored with missing details
+            self.incomplete = True
+            return None
+        except Exception as e:
+            logger.error(f"Error processing {self.source} hackathon data: {str(e)}")
+            return None
+
+    def _run(self) -> Tuple[List[HackathonRecord], str]:
+        try:
+            self.prepare()
+            items = self.fetch_items()
+        except DeadlineExceeded:
+            logger.error(f"{self.source} listing did not load within {self.deadline.seconds:.0f}s")
+            return [], "failed"
+        except Exception as e:
+            logger.error(f"Error fetching {self.source} data: {str(e)}")
+            return [], "failed"
+
+        with ThreadPoolExecutor(max_workers=SCRAPER_CONCURRENCY) as executor:
+            hackathons = [record for record in executor.map(self._normalize, items) if record is not None]
+        logger.info(f"Fetched {len(items)} hackathons from {self.source}, parsed {len(hackathons)}")
+        return hackathons, "partial" if self.incomplete or self.deadline.expired else "ok"
+
+    def fetch_with_outcome(self, budget_seconds: Optional[float] = None) -> Tuple[List[HackathonRecord], str]:
+        """
+        Fetch and normalize this source's hackathons without touching the database.
+
+        Every request, retry and rate-limit wait shares one deadline, so a hung
+        or throttling platform costs at most the budget. Entries fetched before
+        the deadline are still returned. A run that fails or comes back partial
+        counts against the source's circuit; once it trips, the source is
+        skipped without any request until the circuit's open period has passed.
+
+        Args:
+            budget_seconds: Time budget, defaults to SCRAPE_SOURCE_BUDGET_SECONDS
+
+        Returns:
+            Tuple[List[HackathonRecord], str]: The parsed hackathons, possibly
+            partial, and how the run went: "ok", "partial", "failed" (nothing
+            fetched) or "skipped" (circuit open)
+        """
+        if not circuit_allows(self.source):
+            logger.warning(f"Skipping {self.source}: circuit open after repeated failures")
+            record_scrape_outcome(self.source, "skipped")
+            return [], "skipped"
+
+        # A copy per run keeps the deadline and anything prepare() loads out of concurrent runs
+        run = copy.copy(self)
+        run.deadline = Deadline(budget_seconds or SCRAPE_SOURCE_BUDGET_SECONDS)
+        run.incomplete = False
+        hackathons, outcome = run._run()
+
+        if outcome != "ok":
+            logger.warning(f"{self.source} scrape was {outcome}, keeping {len(hackathons)} hackathons")
+        record_scrape_outcome(self.source, outcome)
+        record_circuit_result(self.source, success=outcome == "ok")
+        return hackathons, outcome
+
+    def fetch(self, budget_seconds: Optional[float] = None) -> List[HackathonRecord]:
+        """
+        Fetch this source's hackathons, see fetch_with_outcome().
+
+        Returns:
+            List[HackathonRecord]: The parsed hackathons, possibly partial; empty
+            if the listing could not be fetched or the source is skipped
+        """
+        return self.fetch_with_outcome(budget_seconds)[0]
+
+    def scrape(self) -> List[HackathonRecord]:
+        """
+        Fetch this source's hackathons and store the ones that are new.
+
+        Returns:
+            List[HackathonRecord]: The new hackathons, with their ids set
+        """
+        return persist_hackathons(self.fetch())
+
+# Registered plugins by source name
+SCRAPERS: Dict[str, ScraperPlugin] = {}
+
+def register_scraper(cls):
+    """Class decorator registering a ScraperPlugin and its rate limits"""
+    plugin = cls()
+    SCRAPERS[plugin.source] = plugin
+    for domain, (rate, burst) in cls.rate_limits.items():
+        plugin.client.set_rate_limit(domain, rate, burst)
+    return cls
+
+def discover_scrapers() -> Dict[str, ScraperPlugin]:
+    """
+    Import every app/scrapers/*_scraper.py module so its plugins register.
+
+    Returns:
+        Dict[str, ScraperPlugin]: Plugins by source name, in sweep order
+    """
+    for module in pkgutil.iter_modules([os.path.dirname(__file__)]):
+        if module.name.endswith("_scraper"):
+            importlib.import_module(f"app.scrapers.{module.name}")
+    return dict(sorted(SCRAPERS.items(), key=lambda item: (item[1].order, item[0])))
@@ -0,0 +1,189 @@
+import os
+import glob
+import uuid
+import logging
+import tempfile
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+
+from app.db.database import SessionLocal
+from app.models.hackathon import HackathonModel, ArchivedHackathonModel
+from app.models.theme import ThemeModel, hackathon_themes
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # Exporting is skipped, the API and scrapers don't need it
+    pa = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Directory holding the daily analytics snapshots
+ANALYTICS_DIR = os.getenv("ANALYTICS_DIR", os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "storage", "analytics"))
+
+# Daily snapshots kept before the oldest are deleted
+ANALYTICS_RETENTION_DAYS = int(os.getenv("ANALYTICS_RETENTION_DAYS", "30"))
+
+# Rows read from the database and written per Parquet row group
+ANALYTICS_BATCH_SIZE = int(os.getenv("ANALYTICS_BATCH_SIZE", "10000"))
+
+LATEST_NAME = "hackathons-latest.parquet"
+
+# Columns exported from both hackathon tables; descriptions are left out as
+# they are large and not used in aggregations
+EXPORT_COLUMNS = (
+    "id", "name", "source", "start_date", "end_date", "city", "country", "is_online",
+    "latitude", "longitude", "organizer", "prize_inr", "canonical_id", "created_at",
+)
+
+def _schema():
+    # Low-cardinality strings are dictionary encoded, which keeps them small on disk and fast to group by
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("id", pa.int64()),
+        ("name", pa.string()),
+        ("source", category),
+        ("start_date", pa.timestamp("us")),
+        ("end_date", pa.timestamp("us")),
+        ("city", category),
+        ("country", category),
+        ("is_online", pa.bool_()),
+        ("latitude", pa.float64()),
+        ("longitude", pa.float64()),
+        ("organizer", pa.string()),
+        ("prize_inr", pa.int64()),
+        ("canonical_id", pa.int64()),
+        ("created_at", pa.timestamp("us")),
+        ("themes", pa.list_(category)),
+        ("archived", pa.bool_()),
+    ])
+
+def _theme_keys_by_hackathon(db) -> Dict[int, List[str]]:
+    keys = defaultdict(list)
+    rows = db.execute(
+        select(hackathon_themes.c.hackathon_id, ThemeModel.key)
+        .join(ThemeModel, ThemeModel.id == hackathon_themes.c.theme_id)
+        .order_by(ThemeModel.key)
+    )
+    for hackathon_id, key in rows:
+        keys[hackathon_id].append(key)
+    return keys
+
+def export_analytics_snapshot(directory: Optional[str] = None, day: Optional[datetime] = None) -> Optional[str]:
+    """
+    Write the live and archived hackathons to a compressed Parquet snapshot.
+
+    Rows are streamed from the database in batches, each written as a row
+    group, so memory stays flat as the tables grow. The day's file is replaced
+    atomically, so repeated exports after each scrape keep one file per day,
+    and hackathons-latest.parquet always points at the newest one.
+    Snapshots older than ANALYTICS_RETENTION_DAYS are deleted.
+
+    Args:
+        directory: Output directory, defaults to ANALYTICS_DIR
+        day: Date the snapshot is filed under, defaults to today (UTC)
+
+    Returns:
+        Optional[str]: Path of the written snapshot, None if pyarrow is not installed
+    """
+    if pa is None:
+        logger.warning("pyarrow is not installed, skipping the analytics snapshot")
+        return None
+
+    directory = directory or ANALYTICS_DIR
+    day = day or datetime.utcnow()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"hackathons-{day:%Y-%m-%d}.parquet")
+    # Exports run concurrently after each source is persisted, so every run
+    # writes to its own temporary file
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    schema = _schema()
+
+    db = SessionLocal()
+    total = 0
+    try:
+        themes = _theme_keys_by_hackathon(db)
+        with pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+            for model, archived in ((HackathonModel, False), (ArchivedHackathonModel, True)):
+                result = db.execute(
+                    select(*[getattr(model, column) for column in EXPORT_COLUMNS]).order_by(model.id)
+                ).yield_per(ANALYTICS_BATCH_SIZE)
+                for rows in result.partitions():
+                    columns = {column: [row[i] for row in rows] for i, column in enumerate(EXPORT_COLUMNS)}
+                    columns["themes"] = [themes.get(row[0], []) for row in rows]
+                    columns["archived"] = [archived] * len(rows)
+                    writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+                    total += len(rows)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    finally:
+        db.close()
+
+    os.replace(tmp_path, path)
+    latest_tmp = os.path.join(directory, f"{LATEST_NAME}.{uuid.uuid4().hex}.tmp")
+    os.symlink(os.path.basename(path), latest_tmp)
+    os.replace(latest_tmp, os.path.join(directory, LATEST_NAME))
+
+    cutoff = f"hackathons-{day - timedelta(days=ANALYTICS_RETENTION_DAYS):%Y-%m-%d}.parquet"
+    for old in glob.glob(os.path.join(directory, "hackathons-????-??-??.parquet")):
+        if os.path.basename(old) < cutoff:
+            os.remove(old)
+
+    logger.info(f"Exported {total} hackathons to {path}")
+    return path
+
+def load_snapshot(path: Optional[str] = None, columns: Optional[Sequence[str]] = None):
+    """
+    Open an analytics snapshot as a pyarrow Table.
+
+    The file is memory-mapped and only the requested columns are decoded, so
+    scans touch a fraction of the data and never reach the production database.
+
+    Args:
+        path: Snapshot file, defaults to the latest one in ANALYTICS_DIR
+        columns: Columns to read, defaults to all
+
+    Returns:
+        pyarrow.Table: The snapshot
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required to read analytics snapshots")
+    path = path or os.path.join(ANALYTICS_DIR, LATEST_NAME)
+    return pq.read_table(path, columns=list(columns) if columns else None, memory_map=True)
+
+def hackathons_per_month(
+    path: Optional[str] = None,
+    by: Sequence[str] = ("city", "source"),
+    canonical_only: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Count hackathons per start month, grouped by the given columns.
+
+    Args:
+        path: Snapshot file, defaults to the latest one
+        by: Columns to group by besides the month
+        canonical_only: Count an event listed on several sources once
+
+    Returns:
+        List[Dict[str, Any]]: One {"month", *by, "count"} row per group, ordered by month
+    """
+    # Each row group has its own dictionaries; grouping needs a shared one
+    table = load_snapshot(path, columns=["id", "start_date", "canonical_id", *by]).unify_dictionaries()
+    table = table.filter(pc.is_valid(table["start_date"]))
+    if canonical_only:
+        canonical = pc.or_kleene(pc.is_null(table["canonical_id"]), pc.equal(table["canonical_id"], table["id"]))
+        table = table.filter(canonical)
+
+    table = table.append_column("month", pc.strftime(table["start_date"], format="%Y-%m"))
+    rows = table.group_by(["month", *by]).aggregate([("id", "count")]).to_pylist()
+    for row in rows:
+        row["count"] = row.pop("id_count")
+    return sorted(rows, key=lambda row: (row["month"], *(str(row[column]) for column in by)))
@@ -0,0 +1,76 @@
+import os
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, delete, insert, or_, select
+
+from app.db.database import SessionLocal
+from app.models.hackathon import HackathonModel, ArchivedHackathonModel
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Days after its end date that a hackathon stays in the live table
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "1"))
+
+# Days after its start date that a hackathon without an end date is archived
+ARCHIVE_UNDATED_AFTER_DAYS = int(os.getenv("ARCHIVE_UNDATED_AFTER_DAYS", "30"))
+
+# Rows moved per transaction
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+
+# Columns copied from the live table; archived_at is filled in by the archive table
+_COLUMNS = [column.name for column in HackathonModel.__table__.columns]
+
+def archive_ended_hackathons(now: Optional[datetime] = None) -> int:
+    """
+    Move hackathons that have ended from the live table to hackathons_archive.
+
+    Rows are selected through the end_date and start_date indexes and moved in
+    batches, each an INSERT ... SELECT followed by a DELETE in one transaction,
+    so a row is always in exactly one of the tables. Ids are kept, so theme
+    links and canonical ids stay valid for archived rows.
+
+    Args:
+        now: Current time, defaults to datetime.utcnow()
+
+    Returns:
+        int: Number of hackathons archived
+    """
+    now = now or datetime.utcnow()
+    ended = or_(
+        HackathonModel.end_date < now - timedelta(days=ARCHIVE_AFTER_DAYS),
+        and_(
+            HackathonModel.end_date.is_(None),
+            HackathonModel.start_date < now - timedelta(days=ARCHIVE_UNDATED_AFTER_DAYS),
+        ),
+    )
+
+    db = SessionLocal()
+    total = 0
+    try:
+        while True:
+            ids = [row.id for row in db.query(HackathonModel.id).filter(ended).limit(ARCHIVE_BATCH_SIZE)]
+            if not ids:
+                break
+
+            live = HackathonModel.__table__
+            archive = ArchivedHackathonModel.__table__
+            db.execute(insert(archive).from_select(
+                _COLUMNS,
+                select(*[live.c[name] for name in _COLUMNS]).where(live.c.id.in_(ids)),
+            ))
+            db.execute(delete(live).where(live.c.id.in_(ids)))
+            db.commit()
+            total += len(ids)
+
+        if total:
+            logger.info(f"Archived {total} ended hackathons")
+        return total
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error archiving hackathons: {str(e)}")
+        raise
+    finally:
+        db.close()
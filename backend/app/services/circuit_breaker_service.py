@@ -0,0 +1,102 @@
+import os
+import logging
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+from app.services.last_run_service import get_state, compare_and_set_state
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Consecutive failed or over-budget scrapes after which a source is skipped
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+
+# Minutes a tripped source is skipped; doubles with every further failure, up to the maximum
+CIRCUIT_OPEN_MINUTES = float(os.getenv("CIRCUIT_OPEN_MINUTES", "30"))
+CIRCUIT_MAX_OPEN_MINUTES = float(os.getenv("CIRCUIT_MAX_OPEN_MINUTES", "1440"))
+
+# Attempts at a compare-and-set before giving up on a contended source
+_CAS_ATTEMPTS = 5
+
+class CircuitState(NamedTuple):
+    """Consecutive failures of a source and until when it is skipped"""
+    failures: int
+    open_until: Optional[datetime]
+
+def _key(source: str) -> str:
+    return f"scrape_circuit:{source}"
+
+def _encode(state: CircuitState) -> str:
+    return f"{state.failures}|{state.open_until.isoformat() if state.open_until else ''}"
+
+def _decode(value: Optional[str]) -> CircuitState:
+    if not value:
+        return CircuitState(0, None)
+    try:
+        failures, open_until = value.split("|")
+        return CircuitState(int(failures), datetime.fromisoformat(open_until) if open_until else None)
+    except ValueError:
+        logger.error(f"Invalid circuit state value: {value}")
+        return CircuitState(0, None)
+
+def get_circuit(source: str) -> CircuitState:
+    """The current circuit state of a source"""
+    return _decode(get_state(_key(source)))
+
+def circuit_allows(source: str, now: datetime = None) -> bool:
+    """
+    Whether a source may be scraped now.
+
+    A source is skipped while its circuit is open. Once the open period has
+    passed, the next scrape goes ahead as a trial: success closes the circuit,
+    another failure opens it again for twice as long.
+
+    Args:
+        source: Source name
+        now: Current time, defaults to datetime.utcnow()
+
+    Returns:
+        bool: False while the circuit is open
+    """
+    now = now or datetime.utcnow()
+    state = get_circuit(source)
+    return state.open_until is None or state.open_until <= now
+
+def record_circuit_result(source: str, success: bool, now: datetime = None) -> Optional[CircuitState]:
+    """
+    Update a source's circuit after a scrape.
+
+    Args:
+        source: Source name
+        success: Whether the scrape completed within its budget
+        now: Current time, defaults to datetime.utcnow()
+
+    Returns:
+        Optional[CircuitState]: The new state, None if the store stayed contended
+    """
+    now = now or datetime.utcnow()
+    for _ in range(_CAS_ATTEMPTS):
+        raw = get_state(_key(source), use_cache=False)
+        current = _decode(raw)
+        if success:
+            if not raw or current == CircuitState(0, None):
+                return current
+            state = CircuitState(0, None)
+        else:
+            failures = current.failures + 1
+            open_until = None
+            if failures >= CIRCUIT_FAILURE_THRESHOLD:
+                minutes = min(CIRCUIT_MAX_OPEN_MINUTES,
+                              CIRCUIT_OPEN_MINUTES * 2 ** (failures - CIRCUIT_FAILURE_THRESHOLD))
+                open_until = now + timedelta(minutes=minutes)
+            state = CircuitState(failures, open_until)
+
+        if compare_and_set_state(_key(source), raw, _encode(state)):
+            if success:
+                logger.info(f"{source} scraped successfully, circuit closed")
+            elif state.open_until:
+                logger.warning(f"{source} failed {state.failures} times in a row, "
+                               f"skipping it until {state.open_until.isoformat()}")
+            return state
+    logger.warning(f"Could not update the circuit for {source}: store is contended")
+    return None
@@ -0,0 +1,206 @@
+import os
+import re
+import random
+import hashlib
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import update
+
+from app.db.database import SessionLocal
+from app.models.hackathon import HackathonModel
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# LSH layout: DEDUP_BANDS bands of DEDUP_ROWS_PER_BAND MinHash values each. Names
+# whose shingle sets have Jaccard similarity above roughly
+# (1 / bands) ** (1 / rows) (about 0.46 here) share a band and become candidates.
+DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", "10"))
+DEDUP_ROWS_PER_BAND = int(os.getenv("DEDUP_ROWS_PER_BAND", "3"))
+
+# Jaccard similarity of name shingles for candidates with overlapping dates...
+DEDUP_NAME_SIMILARITY = float(os.getenv("DEDUP_NAME_SIMILARITY", "0.6"))
+
+# ...and for candidates where either side has no dates to compare
+DEDUP_UNDATED_NAME_SIMILARITY = float(os.getenv("DEDUP_UNDATED_NAME_SIMILARITY", "0.85"))
+
+# Slack allowed between the date ranges of two listings of the same event
+DEDUP_DATE_TOLERANCE_DAYS = int(os.getenv("DEDUP_DATE_TOLERANCE_DAYS", "3"))
+
+# Buckets larger than this come from very generic names and are skipped, which
+# keeps candidate generation near-linear
+DEDUP_MAX_BUCKET_SIZE = int(os.getenv("DEDUP_MAX_BUCKET_SIZE", "50"))
+
+# Words that platforms add or drop around the same event name
+NAME_STOPWORDS = {
+    "hackathon", "hackathons", "the", "a", "an", "of", "by", "edition", "presents",
+    "powered", "season", "online", "virtual", "offline", "in", "person", "inperson",
+}
+
+_SHINGLE_SIZE = 3
+
+# XOR masks standing in for the MinHash permutations, seeded so every run buckets
+# names the same way
+_MASKS = [random.Random(seed).getrandbits(64) for seed in range(DEDUP_BANDS * DEDUP_ROWS_PER_BAND)]
+
+# Stable 64-bit shingle hashes; the shingle vocabulary is small, so they are memoized
+_shingle_hashes: Dict[str, int] = {}
+
+class DedupRecord(NamedTuple):
+    """The columns duplicate detection needs from a hackathon row"""
+    id: int
+    name: str
+    source: str
+    start_date: Optional[datetime]
+    end_date: Optional[datetime]
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a hackathon name for comparison across platforms.
+
+    Lowercases, spells out "&", drops punctuation and filler words such as
+    "hackathon" or "edition", and joins the remaining words without spaces so
+    "Hack MIT" and "HackMIT" compare equal.
+    """
+    words = re.findall(r"[a-z0-9]+", (name or "").lower().replace("&", " and "))
+    return "".join(word for word in words if word not in NAME_STOPWORDS)
+
+def shingles(normalized: str) -> frozenset:
+    """Character n-grams of a normalized name"""
+    if len(normalized) <= _SHINGLE_SIZE:
+        return frozenset([normalized]) if normalized else frozenset()
+    return frozenset(normalized[i:i + _SHINGLE_SIZE] for i in range(len(normalized) - _SHINGLE_SIZE + 1))
+
+def minhash_signature(shingle_set: frozenset) -> Tuple[int, ...]:
+    """MinHash signature of a shingle set, one value per mask"""
+    hashes = []
+    for shingle in shingle_set:
+        value = _shingle_hashes.get(shingle)
+        if value is None:
+            value = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+            _shingle_hashes[shingle] = value
+        hashes.append(value)
+    return tuple(min(map(mask.__xor__, hashes)) for mask in _MASKS)
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def dates_overlap(a: DedupRecord, b: DedupRecord) -> Optional[bool]:
+    """Whether two listings' date ranges overlap (with tolerance), None if either is undated"""
+    a_start, b_start = a.start_date, b.start_date
+    if a_start is None or b_start is None:
+        return None
+    a_end = a.end_date or a_start
+    b_end = b.end_date or b_start
+    tolerance = timedelta(days=DEDUP_DATE_TOLERANCE_DAYS)
+    return a_start <= b_end + tolerance and b_start <= a_end + tolerance
+
+def _is_duplicate(a: DedupRecord, b: DedupRecord, shingle_sets: Dict[int, frozenset]) -> bool:
+    # Cheap checks first; most candidate pairs never need the set comparison
+    if a.source == b.source:
+        # Same-source listings are already deduplicated by exact name
+        return False
+    overlap = dates_overlap(a, b)
+    if overlap is False:
+        return False
+    threshold = DEDUP_UNDATED_NAME_SIMILARITY if overlap is None else DEDUP_NAME_SIMILARITY
+    return jaccard(shingle_sets[a.id], shingle_sets[b.id]) >= threshold
+
+def find_canonical_ids(records: List[DedupRecord]) -> Dict[int, int]:
+    """
+    Group near-duplicate listings and pick a canonical row for each group.
+
+    Each name is normalized, cut into character shingles and MinHashed. The
+    signature is split into LSH bands, and only records that share a band bucket
+    are compared, so the work grows with the number of records rather than
+    the number of pairs. Candidates count as duplicates when they come from
+    different sources, their names are similar enough, and their dates overlap.
+    Duplicate pairs are merged with union-find, and the lowest id in a group is
+    its canonical event, so canonical ids stay stable between runs.
+
+    Args:
+        records: Hackathon rows to deduplicate
+
+    Returns:
+        Dict[int, int]: Canonical id for every record id (its own id if unique)
+    """
+    shingle_sets = {}
+    buckets = defaultdict(list)
+    for record in records:
+        shingle_set = shingles(normalize_name(record.name))
+        if not shingle_set:
+            continue
+        shingle_sets[record.id] = shingle_set
+        signature = minhash_signature(shingle_set)
+        for band in range(DEDUP_BANDS):
+            start = band * DEDUP_ROWS_PER_BAND
+            buckets[(band, signature[start:start + DEDUP_ROWS_PER_BAND])].append(record)
+
+    parent = {record.id: record.id for record in records}
+
+    def find(record_id):
+        while parent[record_id] != record_id:
+            parent[record_id] = parent[parent[record_id]]
+            record_id = parent[record_id]
+        return record_id
+
+    checked = set()
+    for bucket in buckets.values():
+        if len(bucket) < 2 or len(bucket) > DEDUP_MAX_BUCKET_SIZE:
+            continue
+        for i, a in enumerate(bucket):
+            for b in bucket[i + 1:]:
+                pair = (a.id, b.id) if a.id < b.id else (b.id, a.id)
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                if _is_duplicate(a, b, shingle_sets):
+                    root_a, root_b = find(a.id), find(b.id)
+                    if root_a != root_b:
+                        # The lower id becomes the root, so it is the canonical event
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    return {record.id: find(record.id) for record in records}
+
+def deduplicate_hackathons() -> Dict[str, int]:
+    """
+    Link duplicate listings across sources to their canonical event.
+
+    Runs over the whole hackathons table and only writes rows whose canonical_id
+    changed.
+
+    Returns:
+        Dict[str, int]: Rows scanned, rows updated and duplicates linked
+    """
+    db = SessionLocal()
+    try:
+        rows = db.query(
+            HackathonModel.id, HackathonModel.name, HackathonModel.source,
+            HackathonModel.start_date, HackathonModel.end_date, HackathonModel.canonical_id,
+        ).all()
+        current = {row.id: row.canonical_id for row in rows}
+        canonical_ids = find_canonical_ids([DedupRecord(*row[:5]) for row in rows])
+
+        changes = [
+            {"id": row_id, "canonical_id": canonical_id}
+            for row_id, canonical_id in canonical_ids.items()
+            if current[row_id] != canonical_id
+        ]
+        if changes:
+            db.execute(update(HackathonModel), changes)
+            db.commit()
+
+        duplicates = sum(1 for row_id, canonical_id in canonical_ids.items() if row_id != canonical_id)
+        logger.info(f"Deduplicated {len(rows)} hackathons: {duplicates} duplicates, {len(changes)} rows updated")
+        return {"scanned": len(rows), "updated": len(changes), "duplicates": duplicates}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error deduplicating hackathons: {str(e)}")
+        raise
+    finally:
+        db.close()
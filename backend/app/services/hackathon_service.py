@@ -1,6 +1,8 @@
+from sqlalchemy import or_, select, union_all, literal, func
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from celery import Celery
+from typing import List, Optional, Tuple
+from celery import Celery, group
+from concurrent.futures import ThreadPoolExecutor
 import os
 from dotenv import load_dotenv
 import logging
@@ -20,12 +22,24 @@ logger = logging.getLogger(__name__)
 logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 logging.getLogger("celery").setLevel(logging.WARNING)
 
-from app.models.hackathon import HackathonModel
-from app.scrapers.unstop_scraper import scrape_unstop
-from app.scrapers.devfolio_scraper import scrape_devfolio
-from app.scrapers.devpost_scraper import scrape_devpost
-from app.services.notification_service import notify_new_hackathons
-from app.services.last_run_service import update_last_run, should_run_task
+from app.models.hackathon import HackathonModel, ArchivedHackathonModel
+from app.models.theme import ThemeModel, hackathon_themes
+from app.models.hackathon_record import HackathonRecord
+from app.scrapers.scraper_registry import discover_scrapers
+from app.services.location_service import normalize_location, bounding_box, distance_km
+from app.services.preference_matching_service import normalize_theme
+from app.services.ingest_service import IngestResult, ingest_hackathons, serialize_hackathons, deserialize_hackathons
+from app.services.outbox_service import drain_outbox
+from app.services.dedup_service import deduplicate_hackathons
+from app.services.archive_service import archive_ended_hackathons
+from app.services.snapshot_service import build_upcoming_snapshot
+from app.services.static_snapshot_service import publish_static_snapshots
+from app.services.analytics_service import export_analytics_snapshot
+from app.services.reminder_service import schedule_reminders
+from app.services.last_run_service import update_last_run, claim_task_run
+from app.services.scrape_schedule_service import claim_due_sources, record_scrape_result
+from app.services.metrics_service import time_scrape, record_new_hackathons, export_worker_metrics
+from app.services.profiling_service import profiled_task
 
 # Celery configuration - import the app instance from worker.py
 from app.worker import celery_app
@@ -34,53 +48,219 @@ from app.worker import celery_app
 SCRAPE_TASK_NAME = "hackathon_scraping"
 SCRAPE_INTERVAL_HOURS = 24
 
+# Source plugins found in app/scrapers/*_scraper.py, in the order a full sweep runs them
+SCRAPER_PLUGINS = discover_scrapers()
+
+# Scraper per source
+SOURCE_SCRAPERS = {source: plugin.scrape for source, plugin in SCRAPER_PLUGINS.items()}
+
+# Network-only half of each scraper, run on the "fetch" queue; returns the
+# hackathons and the fetch outcome ("ok", "partial", "failed" or "skipped")
+SOURCE_FETCHERS = {source: plugin.fetch_with_outcome for source, plugin in SCRAPER_PLUGINS.items()}
+
+def _filter_hackathons(
+    query,
+    model,
+    location: Optional[str] = None,
+    source: Optional[str] = None,
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+    is_online: Optional[bool] = None,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    radius_km: Optional[float] = None,
+    canonical_only: bool = False,
+    themes: Optional[List[str]] = None,
+    min_prize_inr: Optional[int] = None,
+    organizer: Optional[str] = None,
+):
+    """Apply the listing filters to a query over the live or the archived hackathons"""
+    if location:
+        query = query.filter(model.location.ilike(f"%{location}%"))
+    
+    if source:
+        query = query.filter(model.source == source)
+    
+    if city:
+        query = query.filter(model.city == (normalize_location(city).city or city))
+    
+    if country:
+        query = query.filter(model.country == country)
+    
+    if is_online is not None:
+        query = query.filter(model.is_online == is_online)
+    
+    if themes:
+        keys = [key for theme in themes for key in normalize_theme(theme)[:1]]
+        query = query.filter(model.id.in_(
+            select(hackathon_themes.c.hackathon_id)
+            .join(ThemeModel, ThemeModel.id == hackathon_themes.c.theme_id)
+            .where(ThemeModel.key.in_(keys))
+        ))
+    
+    if min_prize_inr is not None:
+        query = query.filter(model.prize_inr >= min_prize_inr)
+    
+    if organizer:
+        query = query.filter(model.organizer == organizer)
+    
+    if canonical_only:
+        query = query.filter(or_(
+            model.canonical_id.is_(None),
+            model.canonical_id == model.id,
+        ))
+    
+    if radius_km is not None:
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        if query.session.get_bind().dialect.name == "postgresql":
+            # Matches the expression of the GiST index ix_hackathons_location_point
+            query = query.filter(func.point(model.longitude, model.latitude).op("<@")(
+                func.box(func.point(min_lon, min_lat), func.point(max_lon, max_lat))
+            ))
+        else:
+            query = query.filter(
+                model.latitude.between(min_lat, max_lat),
+                model.longitude.between(min_lon, max_lon),
+            )
+    
+    return query
+
+def _within_radius(rows, latitude: float, longitude: float, radius_km: float) -> list:
+    """Keep the bounding-box candidates that are within radius_km of the point"""
+    return [
+        row for row in rows
+        if distance_km(latitude, longitude, row.latitude, row.longitude) <= radius_km
+    ]
+
 def get_hackathons(
     db: Session, 
     location: Optional[str] = None, 
     source: Optional[str] = None,
     skip: int = 0, 
-    limit: int = 100
+    limit: int = 100,
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+    is_online: Optional[bool] = None,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    radius_km: Optional[float] = None,
+    canonical_only: bool = False,
+    themes: Optional[List[str]] = None,
+    min_prize_inr: Optional[int] = None,
+    organizer: Optional[str] = None,
+    include_past: bool = False,
 ) -> List[HackathonModel]:
     """
     Get hackathons from the database with optional filtering.
+    
+    city, country and is_online use the indexed structured location columns.
+    latitude, longitude and radius_km together select hackathons within radius_km
+    of the point: a bounding box narrows the rows down (on the GiST point index on
+    PostgreSQL, the (latitude, longitude) btree elsewhere), then the exact
+    great-circle distance is checked on the candidates' coordinates and only the
+    requested page is loaded. canonical_only
+    leaves out listings linked to the same event on another source.
+    themes matches hackathons linked to any of the given themes through the
+    hackathon_themes index; min_prize_inr and organizer use their own indexes.
+    
+    Only the live table is read unless include_past is set. Then the ids of
+    both tables are combined with UNION ALL so the database orders and pages
+    them, and only the hackathons on the page are loaded.
     """
-    query = db.query(HackathonModel)
+    filters = dict(
+        location=location, source=source, city=city, country=country, is_online=is_online,
+        latitude=latitude, longitude=longitude, radius_km=radius_km, canonical_only=canonical_only,
+        themes=themes, min_prize_inr=min_prize_inr, organizer=organizer,
+    )
     
-    if location:
-        query = query.filter(HackathonModel.location.ilike(f"%{location}%"))
+    if not include_past:
+        query = _filter_hackathons(db.query(HackathonModel), HackathonModel, **filters)
+        query = query.order_by(HackathonModel.start_date.desc())
+        if radius_km is None:
+            return query.offset(skip).limit(limit).all()
+        # Check distances on the candidates' coordinates, then load only the page
+        candidates = query.with_entities(HackathonModel.id, HackathonModel.latitude, HackathonModel.longitude)
+        ids = [row.id for row in _within_radius(candidates.all(), latitude, longitude, radius_km)[skip:skip + limit]]
+        loaded = {h.id: h for h in db.query(HackathonModel).filter(HackathonModel.id.in_(ids))} if ids else {}
+        return [loaded[hackathon_id] for hackathon_id in ids]
     
-    if source:
-        query = query.filter(HackathonModel.source == source)
+    models = (HackathonModel, ArchivedHackathonModel)
+    combined = union_all(*[
+        _filter_hackathons(db.query(
+            model.id.label("id"),
+            model.start_date.label("start_date"),
+            model.latitude.label("latitude"),
+            model.longitude.label("longitude"),
+            literal(part).label("part"),
+        ), model, **filters).statement
+        for part, model in enumerate(models)
+    ]).subquery()
+    page = select(combined).order_by(combined.c.start_date.desc())
+    
+    if radius_km is None:
+        rows = db.execute(page.offset(skip).limit(limit)).all()
+    else:
+        rows = _within_radius(db.execute(page).all(), latitude, longitude, radius_km)[skip:skip + limit]
     
-    return query.order_by(HackathonModel.start_date.desc()).offset(skip).limit(limit).all()
+    loaded = {}
+    for part, model in enumerate(models):
+        ids = [row.id for row in rows if row.part == part]
+        if ids:
+            loaded.update({(part, h.id): h for h in db.query(model).filter(model.id.in_(ids))})
+    return [loaded[(row.part, row.id)] for row in rows]
+
+def _fetch_source(source: str) -> Tuple[List[HackathonRecord], str]:
+    """Run one source's fetcher within its budget and time it"""
+    with time_scrape(source):
+        return SOURCE_FETCHERS[source]()
+
+def _persist_source(source: str, hackathons: List[HackathonRecord], outcome: str = "ok") -> IngestResult:
+    """Store one source's fetched hackathons, record its metrics and adapt its schedule"""
+    result = ingest_hackathons(hackathons)
+    record_new_hackathons(source, len(result.new))
+    record_scrape_result(source, len(result.new) + len(result.updated), outcome)
+    return result
 
 @celery_app.task(name="app.services.hackathon_service.scrape_all_sources")
+@profiled_task(SCRAPE_TASK_NAME)
 def scrape_all_sources():
     """
     Celery task to scrape all hackathon sources.
+
+    Sources are fetched concurrently, each within SCRAPE_SOURCE_BUDGET_SECONDS
+    and behind its circuit breaker, so the sweep takes about as long as the
+    slowest source's budget and one hung platform can't hold up the others.
+    Whatever each source returned, partial or not, is stored afterwards.
     """
     logger.info("┌─── Starting hackathon scraping process ───┐")
     
-    # Scrape from all sources
-    logger.info("├── Fetching hackathons from Unstop...")
-    unstop_hackathons = scrape_unstop() or []
-    logger.info(f"├── Found {len(unstop_hackathons)} new hackathons from Unstop")
+    # Fetch from all sources at once
+    logger.info(f"├── Fetching hackathons from {', '.join(SOURCE_FETCHERS)}...")
+    with ThreadPoolExecutor(max_workers=len(SOURCE_FETCHERS)) as executor:
+        fetched = dict(zip(SOURCE_FETCHERS, executor.map(_fetch_source, SOURCE_FETCHERS)))
     
-    logger.info("├── Fetching hackathons from Devfolio...")
-    devfolio_hackathons = scrape_devfolio() or []
-    logger.info(f"├── Found {len(devfolio_hackathons)} new hackathons from Devfolio")
-    
-    logger.info("├── Fetching hackathons from Devpost...")
-    devpost_hackathons = scrape_devpost() or []
-    logger.info(f"├── Found {len(devpost_hackathons)} new hackathons from Devpost")
+    new_by_source = {}
+    any_updated = False
+    for source, (hackathons, outcome) in fetched.items():
+        result = _persist_source(source, hackathons, outcome)
+        new_by_source[source] = result.new
+        any_updated = any_updated or bool(result.updated)
+        logger.info(f"├── Found {len(result.new)} new and {len(result.updated)} changed hackathons from {source}")
     
     # Combine all new hackathons
-    all_new_hackathons = unstop_hackathons + devfolio_hackathons + devpost_hackathons
+    all_new_hackathons = [h for hackathons in new_by_source.values() for h in hackathons]
+    
+    # Link cross-source duplicates before their notifications go out
+    if all_new_hackathons:
+        deduplicate_hackathons()
+    if all_new_hackathons or any_updated:
+        publish_snapshots.delay()
     
-    # Send notifications for new hackathons
+    # Notifications were queued in the outbox with each new hackathon; hand them
+    # to the outbox consumer so slow FCM calls don't hold up this task
     if all_new_hackathons:
-        logger.info(f"├── Sending notifications for {len(all_new_hackathons)} new hackathons")
-        notify_new_hackathons(all_new_hackathons)
+        logger.info(f"├── Queued notifications for {len(all_new_hackathons)} new hackathons")
+        drain_notification_outbox.delay()
     else:
         logger.info("├── No new hackathons found, skipping notifications")
     
@@ -89,19 +269,112 @@ def scrape_all_sources():
     # Update the last run time
     update_last_run(SCRAPE_TASK_NAME)
     
+    # Push or write the worker's metrics now that the run is complete
+    export_worker_metrics()
+    
+    result = {source.lower(): len(hackathons) for source, hackathons in new_by_source.items()}
+    result["total_new"] = len(all_new_hackathons)
+    return result
+
+@celery_app.task(name="app.services.hackathon_service.fetch_source")
+@profiled_task(SCRAPE_TASK_NAME)
+def fetch_source(source: str):
+    """
+    Celery task fetching and parsing one source's hackathons without touching the
+    database. Routed to the "fetch" queue, served by a high-concurrency thread
+    pool; the results are handed to persist_source on the "persist" queue.
+    """
+    hackathons, outcome = _fetch_source(source)
+    persist_source.delay(source, serialize_hackathons(hackathons), outcome)
+    return {"source": source, "fetched": len(hackathons), "outcome": outcome}
+
+@celery_app.task(name="app.services.hackathon_service.persist_source")
+def persist_source(source: str, hackathons: List[dict], outcome: str = "ok"):
+    """
+    Celery task storing the new and changed hackathons fetched from one source. Routed to the
+    "persist" queue, whose small prefork pool bounds the number of DB connections.
+    """
+    result = _persist_source(source, deserialize_hackathons(hackathons), outcome)
+    if result.new:
+        # Link cross-source duplicates before their notifications go out
+        deduplicate_hackathons()
+        drain_notification_outbox.delay()
+    if result.new or result.updated:
+        publish_snapshots.delay()
+    
+    update_last_run(SCRAPE_TASK_NAME)
+    export_worker_metrics()
+    return {"source": source, "total_new": len(result.new), "total_updated": len(result.updated)}
+
+@celery_app.task(name="app.services.hackathon_service.dispatch_due_scrapes")
+def dispatch_due_scrapes():
+    """
+    Celery task dispatching a scrape for every source whose next run is due.
+    Runs every few minutes so busy sources are picked up soon after they are due.
+    """
+    due = claim_due_sources(list(SOURCE_SCRAPERS))
+    for source in due:
+        fetch_source.delay(source)
+    if due:
+        logger.info(f"Dispatched scrapes for {', '.join(due)}")
+    return due
+
+@celery_app.task(name="app.services.hackathon_service.drain_notification_outbox")
+def drain_notification_outbox():
+    """
+    Celery task delivering queued notifications from the outbox.
+    Runs after each scrape and periodically to pick up retries.
+    """
+    result = drain_outbox()
+    export_worker_metrics()
+    return result
+
+@celery_app.task(name="app.services.hackathon_service.schedule_hackathon_reminders")
+def schedule_hackathon_reminders():
+    """
+    Celery task queueing "starts soon" and "closing soon" reminders for
+    hackathons whose reminder window has opened, then sending them.
+    """
+    queued = schedule_reminders()
+    if any(queued.values()):
+        drain_notification_outbox.delay()
+    return queued
+
+@celery_app.task(name="app.services.hackathon_service.archive_hackathons")
+def archive_hackathons():
+    """
+    Celery task moving ended hackathons to the archive table so listings and
+    their indexes only cover live events.
+    """
+    archived = archive_ended_hackathons()
+    if archived:
+        # Duplicate groups may have lost their canonical row to the archive
+        deduplicate_hackathons()
+        publish_snapshots.delay()
+    return {"archived": archived}
+
+@celery_app.task(name="app.services.hackathon_service.publish_snapshots")
+def publish_snapshots():
+    """
+    Celery task rebuilding the precomputed listings after the hackathons changed:
+    the snapshot the API serves the default listing from, the static JSON
+    files the frontend or a CDN can read without calling the API, and the
+    Parquet file analytics queries run against instead of the database.
+    """
+    manifest = publish_static_snapshots()
     return {
-        "unstop": len(unstop_hackathons),
-        "devfolio": len(devfolio_hackathons),
-        "devpost": len(devpost_hackathons),
-        "total_new": len(all_new_hackathons)
+        "upcoming": build_upcoming_snapshot(),
+        "static": manifest["version"],
+        "analytics": export_analytics_snapshot(),
     }
 
 def trigger_scraping():
     """
-    Trigger the scraping task asynchronously using Celery.
+    Trigger scraping of all sources asynchronously using Celery: one fetch task
+    per source, each handing its results to a persist task.
     """
     logger.info("Triggering scraping task via Celery...")
-    result = scrape_all_sources.delay()
+    result = group(fetch_source.s(source) for source in SOURCE_FETCHERS).apply_async()
     logger.info(f"Scraping task triggered with ID: {result.id}")
     return result.id
 
@@ -110,7 +383,8 @@ def check_and_run_scraping_if_needed():
     Check if it's time to run the scraping task, and run it if needed.
     This should be called when the application starts.
     """
-    if should_run_task(SCRAPE_TASK_NAME, SCRAPE_INTERVAL_HOURS):
+    # Claimed atomically so only one of several API replicas triggers the scrape
+    if claim_task_run(SCRAPE_TASK_NAME, SCRAPE_INTERVAL_HOURS):
         logger.info(f"It's been over {SCRAPE_INTERVAL_HOURS} hours since last scraping, running now...")
         return trigger_scraping()
     else:
@@ -0,0 +1,198 @@
+import os
+import time
+import random
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.services.metrics_service import record_upstream_response, record_upstream_retry
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a connection and for each read from an upstream platform
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+
+# Retries after a 429, a 5xx, a timeout or a connection error
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+
+# Base delay of the exponential backoff between retries, and its cap (also caps Retry-After)
+HTTP_BACKOFF_SECONDS = float(os.getenv("HTTP_BACKOFF_SECONDS", "0.5"))
+HTTP_MAX_BACKOFF_SECONDS = float(os.getenv("HTTP_MAX_BACKOFF_SECONDS", "30"))
+
+# Connections kept open per host, shared by every scraper in the process
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+
+# Requests per second and burst allowed per host when a scraper doesn't declare its own limit
+HTTP_DEFAULT_RATE_PER_SECOND = float(os.getenv("HTTP_DEFAULT_RATE_PER_SECOND", "5"))
+HTTP_DEFAULT_BURST = int(os.getenv("HTTP_DEFAULT_BURST", "10"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Headers to mimic a browser request
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "application/json",
+}
+
+class DeadlineExceeded(Exception):
+    """A request was not started or finished before its scrape's deadline"""
+
+class Deadline:
+    """A time budget shared by every request of one scrape"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self):
+        """Raise DeadlineExceeded once the budget is spent"""
+        if self.expired:
+            raise DeadlineExceeded(f"{self.seconds:.0f}s budget exceeded")
+
+class TokenBucket:
+    """Allow `rate` requests per second on average, with bursts of up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, deadline: Optional[Deadline] = None):
+        """Take a token, sleeping until one is available or the deadline would pass"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            if deadline is not None and wait >= deadline.remaining():
+                raise DeadlineExceeded("rate limit wait would exceed the budget")
+            time.sleep(wait)
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """Seconds requested by a Retry-After header, when given as a number"""
+    value = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+class HttpClient:
+    """
+    Pooled HTTP client shared by the scrapers.
+
+    Every request has a timeout, waits for a token from its host's rate limiter,
+    and is retried with exponential backoff and jitter on 429, 5xx, timeouts and
+    connection errors. Rate limits are set per domain and also apply to its
+    subdomains, so e.g. every "<slug>.devfolio.co" page shares devfolio.co's limit.
+    With a deadline, timeouts shrink to the time left and nothing waits past it.
+    """
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE):
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.limits: Dict[str, Tuple[float, int]] = {}
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def set_rate_limit(self, domain: str, rate: float, burst: int):
+        """Limit requests to a domain and its subdomains"""
+        with self.lock:
+            self.limits[domain.lower()] = (rate, burst)
+            self.buckets.pop(domain.lower(), None)
+
+    def _bucket(self, host: str) -> TokenBucket:
+        host = host.lower()
+        key = next((domain for domain in self.limits if host == domain or host.endswith("." + domain)), host)
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                rate, burst = self.limits.get(key, (HTTP_DEFAULT_RATE_PER_SECOND, HTTP_DEFAULT_BURST))
+                bucket = self.buckets[key] = TokenBucket(rate, burst)
+            return bucket
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        delay = _retry_after(response) if response is not None else None
+        if delay is None:
+            delay = HTTP_BACKOFF_SECONDS * 2 ** attempt * random.uniform(0.5, 1.5)
+        return min(delay, HTTP_MAX_BACKOFF_SECONDS)
+
+    def get(self, url: str, source: str, timeout: Optional[Tuple[float, float]] = None,
+            max_retries: int = HTTP_MAX_RETRIES, deadline: Optional[Deadline] = None,
+            **kwargs) -> requests.Response:
+        """
+        GET a URL from a scraped platform.
+
+        Args:
+            url: The URL to fetch
+            source: Platform name, used to label metrics
+            timeout: (connect, read) timeout, defaults to HTTP_CONNECT_TIMEOUT and HTTP_READ_TIMEOUT
+            max_retries: Retries before giving up
+            deadline: Budget the request, its retries and rate-limit waits must fit in
+            **kwargs: Passed on to requests (headers, params, ...)
+
+        Returns:
+            requests.Response: A successful response
+
+        Raises:
+            requests.RequestException: The last error once retries are exhausted
+            DeadlineExceeded: The deadline passed before a successful response
+        """
+        timeout = timeout or (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+        bucket = self._bucket(urlsplit(url).hostname or "")
+
+        for attempt in range(max_retries + 1):
+            attempt_timeout = timeout
+            if deadline is not None:
+                deadline.check()
+                bucket.acquire(deadline)
+                remaining = max(deadline.remaining(), 0.001)
+                attempt_timeout = (min(timeout[0], remaining), min(timeout[1], remaining))
+            else:
+                bucket.acquire()
+
+            try:
+                response = self.session.get(url, timeout=attempt_timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceeded(f"{source} request to {url} did not finish within the budget") from e
+                if attempt == max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"{source} request to {url} failed ({str(e)}), retrying in {delay:.1f}s")
+            else:
+                record_upstream_response(source, response)
+                if response.status_code not in RETRY_STATUSES or attempt == max_retries:
+                    response.raise_for_status()
+                    return response
+                delay = self._backoff(attempt, response)
+                logger.warning(f"{source} returned {response.status_code} for {url}, retrying in {delay:.1f}s")
+
+            if deadline is not None and delay >= deadline.remaining():
+                raise DeadlineExceeded(f"no time left to retry {source} request to {url}")
+            record_upstream_retry(source)
+            time.sleep(delay)
+
+# Client shared by every scraper in this process
+client = HttpClient()
@@ -0,0 +1,164 @@
+import logging
+from typing import List, Dict, Any, NamedTuple
+
+from app.db.database import SessionLocal
+from app.models.hackathon import HackathonModel, ArchivedHackathonModel
+from app.models.hackathon_record import HackathonRecord
+from app.services.outbox_service import persist_new_hackathon
+from app.services.location_service import location_columns
+from app.services.theme_service import theme_keys, get_or_create_themes, themes_for
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Names checked against the database per query
+_LOOKUP_CHUNK_SIZE = 500
+
+# Columns refreshed on a stored hackathon when its source reports a new value,
+# e.g. a rescheduled date; reminders for the old date are then cancelled
+UPDATABLE_FIELDS = ("start_date", "end_date", "location", "prize_inr")
+
+class IngestResult(NamedTuple):
+    """What persisting one batch of fetched hackathons changed"""
+    new: List[HackathonRecord]
+    updated: List[HackathonRecord]
+
+def serialize_hackathons(hackathons: List[HackathonRecord]) -> List[Dict[str, Any]]:
+    """Make fetched hackathons JSON serializable so they can be passed to a Celery task"""
+    return [hackathon.to_payload() for hackathon in hackathons]
+
+def deserialize_hackathons(hackathons: List[Dict[str, Any]]) -> List[HackathonRecord]:
+    """Turn serialized hackathons back into records"""
+    return [HackathonRecord.from_payload(hackathon) for hackathon in hackathons]
+
+def _existing_rows(db, hackathons: List[HackathonRecord]):
+    """
+    Stored hackathons matching the fetched ones by (name, source).
+
+    Returns:
+        Tuple[set, dict]: Keys found in either table, and the live rows by key
+        (with just the columns needed to detect changes)
+    """
+    names_by_source = {}
+    for hackathon in hackathons:
+        names_by_source.setdefault(hackathon.source, set()).add(hackathon.name)
+
+    existing, live = set(), {}
+    for source, names in names_by_source.items():
+        names = list(names)
+        for i in range(0, len(names), _LOOKUP_CHUNK_SIZE):
+            chunk = names[i:i + _LOOKUP_CHUNK_SIZE]
+            rows = db.query(HackathonModel.id, HackathonModel.name, HackathonModel.source,
+                            *[getattr(HackathonModel, field) for field in UPDATABLE_FIELDS]).filter(
+                HackathonModel.source == source,
+                HackathonModel.name.in_(chunk),
+            )
+            live.update(((row.name, row.source), row) for row in rows)
+            archived = db.query(ArchivedHackathonModel.name, ArchivedHackathonModel.source).filter(
+                ArchivedHackathonModel.source == source,
+                ArchivedHackathonModel.name.in_(chunk),
+            )
+            existing.update((name, row_source) for name, row_source in archived)
+    existing.update(live)
+    return existing, live
+
+def _naive(value):
+    """Datetimes compare as stored: DateTime columns keep no time zone"""
+    return value.replace(tzinfo=None) if hasattr(value, "tzinfo") and value.tzinfo else value
+
+def _changed_values(row, hackathon: HackathonRecord) -> Dict[str, Any]:
+    """Column updates for a stored row whose source now reports different values"""
+    changes = {}
+    for field in UPDATABLE_FIELDS:
+        value = getattr(hackathon, field)
+        # A value the source stopped reporting is kept rather than cleared
+        if value is not None and _naive(value) != _naive(getattr(row, field)):
+            changes[field] = value
+    if "location" in changes:
+        changes.update(location_columns(hackathon.location))
+    return changes
+
+def _update_changed(db, live: Dict, hackathons: List[HackathonRecord]) -> List[HackathonRecord]:
+    """Apply new dates, locations and prizes to stored hackathons in one batch"""
+    updates, updated = [], []
+    for hackathon in hackathons:
+        row = live.get(hackathon.key)
+        changes = _changed_values(row, hackathon) if row is not None else None
+        if changes:
+            updates.append(dict(changes, id=row.id))
+            updated.append(hackathon._replace(id=row.id))
+    if updates:
+        try:
+            db.bulk_update_mappings(HackathonModel, updates)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error updating changed hackathons from {hackathons[0].source}: {str(e)}")
+            return []
+        logger.info(f"Updated {len(updated)} changed hackathons from {hackathons[0].source}")
+    return updated
+
+def ingest_hackathons(hackathons: List[HackathonRecord]) -> IngestResult:
+    """
+    Store fetched hackathons that are not in the database yet and refresh the
+    ones that changed.
+
+    Existing rows are looked up by (name, source) in a few batched queries
+    instead of one query per hackathon, and an ORM object is only built for
+    hackathons that are actually inserted. Each new hackathon gets its structured
+    location columns, organizer, prize and theme links, and is inserted together
+    with its notification event. Live hackathons whose dates, location or prize
+    changed are updated in place, so a rescheduled event gets reminders for its
+    new date; archived ones are left as they are.
+
+    Args:
+        hackathons: Records returned by a fetch_<source>() function
+
+    Returns:
+        IngestResult: The new hackathons and the updated ones, with their ids set
+    """
+    if not hackathons:
+        return IngestResult([], [])
+
+    db = SessionLocal()
+    try:
+        seen, live = _existing_rows(db, hackathons)
+        updated = _update_changed(db, live, hackathons)
+        themes_by_key = get_or_create_themes(db, {
+            key: name
+            for hackathon in hackathons if hackathon.key not in seen
+            for key, name in theme_keys(hackathon.themes).items()
+        })
+        new_hackathons = []
+        for hackathon in hackathons:
+            if hackathon.key in seen:
+                continue
+            seen.add(hackathon.key)
+
+            columns = hackathon.column_values()
+            columns["organizer"] = (hackathon.organizer or "")[:255] or None
+            db_hackathon = HackathonModel(
+                themes=themes_for(themes_by_key, hackathon.themes),
+                **columns,
+                **location_columns(hackathon.location)
+            )
+            try:
+                # Store the hackathon and queue its notification together
+                new_hackathons.append(persist_new_hackathon(db, db_hackathon, hackathon))
+            except Exception as e:
+                logger.error(f"Error saving hackathon {hackathon.name}: {str(e)}")
+
+        if new_hackathons:
+            logger.info(f"Added {len(new_hackathons)} new hackathons from {hackathons[0].source} to the database")
+        return IngestResult(new_hackathons, updated)
+    finally:
+        db.close()
+
+def persist_hackathons(hackathons: List[HackathonRecord]) -> List[HackathonRecord]:
+    """
+    Store fetched hackathons, see ingest_hackathons().
+
+    Returns:
+        List[HackathonRecord]: The hackathons that were new, with their ids set
+    """
+    return ingest_hackathons(hackathons).new
@@ -1,97 +1,333 @@
 import os
 import json
+import time
+import fcntl
+import tempfile
+import threading
 from datetime import datetime, timedelta
 import logging
 
+import redis
+from sqlalchemy.exc import IntegrityError
+
+from app.db.database import SessionLocal
+from app.models.scheduler_state import SchedulerStateModel
+from app.services.metrics_service import record_cache_lookup
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Path to the file that will store last run timestamps
-LAST_RUN_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
+# Path to the file that stores last run timestamps when LAST_RUN_STORE=file
+LAST_RUN_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
                              "storage", "last_run.json")
 
-def _ensure_storage_dir():
-    """Ensure the storage directory exists"""
-    storage_dir = os.path.dirname(LAST_RUN_FILE)
-    if not os.path.exists(storage_dir):
-        os.makedirs(storage_dir)
-
-def _load_last_runs():
-    """Load the last run times from the JSON file"""
-    _ensure_storage_dir()
-    if not os.path.exists(LAST_RUN_FILE):
-        return {}
-    
-    try:
-        with open(LAST_RUN_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        logger.warning(f"Could not read last run file at {LAST_RUN_FILE}, creating new one")
-        return {}
-
-def _save_last_runs(last_runs):
-    """Save the last run times to the JSON file"""
-    _ensure_storage_dir()
-    with open(LAST_RUN_FILE, 'w') as f:
-        json.dump(last_runs, f)
+# Where last-run times live: redis, database or file. Redis and the database are
+# shared by the API replicas and the worker; the file is local to one container.
+LAST_RUN_STORE = os.getenv("LAST_RUN_STORE", "redis" if os.getenv("REDIS_URL") else "database").lower()
+
+# Redis hash holding one field per task
+LAST_RUN_REDIS_KEY = os.getenv("LAST_RUN_REDIS_KEY", "hackradar:last_run")
+
+# Seconds a value read from the store is served from memory
+LAST_RUN_CACHE_TTL = float(os.getenv("LAST_RUN_CACHE_TTL", "30"))
+
+# Attempts at a compare-and-set before giving up on a contended key
+_CAS_ATTEMPTS = 5
+
+class RedisLastRunStore:
+    """Last-run times in a Redis hash, compare-and-set done in a Lua script"""
+    name = "redis"
+
+    _CAS_SCRIPT = """
+    local current = redis.call('HGET', KEYS[1], ARGV[1])
+    if (current == false and ARGV[2] == '') or current == ARGV[2] then
+        redis.call('HSET', KEYS[1], ARGV[1], ARGV[3])
+        return 1
+    end
+    return 0
+    """
+
+    def __init__(self, url, key=LAST_RUN_REDIS_KEY):
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.key = key
+        self._cas = self.client.register_script(self._CAS_SCRIPT)
+
+    def get(self, name):
+        return self.client.hget(self.key, name)
+
+    def compare_and_set(self, name, expected, value):
+        return bool(self._cas(keys=[self.key], args=[name, expected or "", value]))
+
+class DatabaseLastRunStore:
+    """Last-run times in the scheduler_state table, compare-and-set as a conditional UPDATE"""
+    name = "database"
+
+    def get(self, name):
+        db = SessionLocal()
+        try:
+            row = db.get(SchedulerStateModel, name)
+            return row.value if row else None
+        finally:
+            db.close()
+
+    def compare_and_set(self, name, expected, value):
+        db = SessionLocal()
+        try:
+            if expected is None:
+                db.add(SchedulerStateModel(name=name, value=value))
+                db.commit()
+                return True
+            updated = db.query(SchedulerStateModel).filter(
+                SchedulerStateModel.name == name,
+                SchedulerStateModel.value == expected,
+            ).update({SchedulerStateModel.value: value}, synchronize_session=False)
+            db.commit()
+            return updated == 1
+        except IntegrityError:
+            # Another node inserted the row first
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+class FileLastRunStore:
+    """Last-run times in a JSON file, for single-node development setups.
+
+    Writes hold an exclusive lock and replace the file atomically, so readers
+    never see a half-written file.
+    """
+    name = "file"
+
+    def __init__(self, path=LAST_RUN_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            logger.warning(f"Could not read last run file at {self.path}, starting from empty")
+            return {}
+
+    def get(self, name):
+        return self._load().get(name)
+
+    def compare_and_set(self, name, expected, value):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock, open(self.path + ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            last_runs = self._load()
+            if last_runs.get(name) != expected:
+                return False
+            last_runs[name] = value
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump(last_runs, f)
+            os.replace(tmp_path, self.path)
+            return True
+
+def _create_store():
+    if LAST_RUN_STORE == "redis" and os.getenv("REDIS_URL"):
+        return RedisLastRunStore(os.getenv("REDIS_URL"))
+    if LAST_RUN_STORE == "file":
+        return FileLastRunStore()
+    if LAST_RUN_STORE == "redis":
+        logger.warning("LAST_RUN_STORE=redis but REDIS_URL is not set, using the database")
+    return DatabaseLastRunStore()
+
+# Store shared by every last-run call in this process, replaceable with set_store()
+store = _create_store()
+
+# task name -> (raw value, monotonic expiry)
+_cache = {}
+_cache_lock = threading.Lock()
+
+# Values from storage/last_run.json not yet carried over to the store; the
+# file is read at most once per process, None until then
+_legacy_values = None
+_legacy_lock = threading.Lock()
+
+def set_store(new_store):
+    """Replace the last-run store and clear the read cache"""
+    global store, _legacy_values
+    store = new_store
+    with _cache_lock:
+        _cache.clear()
+    with _legacy_lock:
+        _legacy_values = None
+
+def _read(name, use_cache=True):
+    """Read a raw value, served from the in-process cache while it is fresh"""
+    now = time.monotonic()
+    if use_cache:
+        with _cache_lock:
+            cached = _cache.get(name)
+        if cached and cached[1] > now:
+            record_cache_lookup("last_run", hit=True)
+            return cached[0]
+        record_cache_lookup("last_run", hit=False)
+
+    value = store.get(name)
+    if value is None and store.name != "file":
+        value = _import_legacy_value(name)
+    with _cache_lock:
+        _cache[name] = (value, now + LAST_RUN_CACHE_TTL)
+    return value
+
+def _import_legacy_value(name):
+    """Carry a last-run time over from storage/last_run.json the first time it is missing
+
+    The file is loaded once per process and each of its values is offered to
+    the store once, so keys that are simply absent cost nothing afterwards.
+    """
+    global _legacy_values
+    with _legacy_lock:
+        if _legacy_values is None:
+            _legacy_values = FileLastRunStore()._load()
+        legacy = _legacy_values.pop(name, None)
+    if legacy and store.compare_and_set(name, None, legacy):
+        logger.info(f"Imported last run time for task {name} from {LAST_RUN_FILE}")
+        return legacy
+    return store.get(name) if legacy else None
+
+def _write(name, expected, value):
+    """Compare-and-set a raw value and keep this process's cache in step"""
+    swapped = store.compare_and_set(name, expected, value)
+    with _cache_lock:
+        if swapped:
+            _cache[name] = (value, time.monotonic() + LAST_RUN_CACHE_TTL)
+        else:
+            _cache.pop(name, None)
+    return swapped
+
+def _parse(name, value):
+    if value:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            logger.error(f"Invalid timestamp format for task {name}: {value}")
+    return None
 
 def get_last_run(task_name):
     """Get the timestamp of when a task was last run
-    
+
+    Served from a short-lived in-process cache (LAST_RUN_CACHE_TTL seconds),
+    so frequent callers such as the status endpoint rarely hit the store.
+
     Args:
         task_name: The name of the task
-        
+
     Returns:
         datetime or None: The timestamp of when the task was last run,
                           or None if it has never been run
     """
-    last_runs = _load_last_runs()
-    timestamp_str = last_runs.get(task_name)
-    
-    if timestamp_str:
-        try:
-            return datetime.fromisoformat(timestamp_str)
-        except ValueError:
-            logger.error(f"Invalid timestamp format for task {task_name}: {timestamp_str}")
-    
-    return None
+    return _parse(task_name, _read(task_name))
 
 def update_last_run(task_name):
     """Update the last run time for a task to the current time
-    
+
+    Uses compare-and-set so concurrent updates from several nodes never move
+    the time backwards.
+
     Args:
         task_name: The name of the task
     """
-    last_runs = _load_last_runs()
-    last_runs[task_name] = datetime.utcnow().isoformat()
-    _save_last_runs(last_runs)
-    logger.info(f"Updated last run time for task {task_name}")
+    for _ in range(_CAS_ATTEMPTS):
+        current = _read(task_name, use_cache=False)
+        now = datetime.utcnow()
+        current_time = _parse(task_name, current)
+        if current_time and current_time >= now:
+            return
+        if _write(task_name, current, now.isoformat()):
+            logger.info(f"Updated last run time for task {task_name}")
+            return
+    logger.warning(f"Could not update last run time for task {task_name}: store is contended")
+
+def get_state(name, use_cache=True):
+    """Get a raw scheduling-state value shared by all nodes
+
+    Args:
+        name: The state key
+        use_cache: Serve from the in-process cache while it is fresh
+
+    Returns:
+        str or None: The stored value
+    """
+    return _read(name, use_cache)
+
+def compare_and_set_state(name, expected, value):
+    """Set a scheduling-state value only if it still equals expected
+
+    Args:
+        name: The state key
+        expected: The value read before, None if the key was missing
+        value: The new value
+
+    Returns:
+        bool: True if the value was set, False if another node changed it first
+    """
+    return _write(name, expected, value)
 
 def should_run_task(task_name, interval_hours=24):
     """Check if a task should be run based on its last run time
-    
+
     Args:
         task_name: The name of the task
         interval_hours: The minimum interval in hours between runs
-        
+
     Returns:
         bool: True if the task should be run, False otherwise
     """
     last_run = get_last_run(task_name)
-    
+
     # If the task has never been run, or the last run time is invalid, run it
     if not last_run:
         logger.info(f"Task {task_name} has never been run, should run now")
         return True
-    
+
     # Check if enough time has passed since the last run
     next_run_time = last_run + timedelta(hours=interval_hours)
     should_run = datetime.utcnow() >= next_run_time
-    
+
     if should_run:
         logger.info(f"Task {task_name} last ran at {last_run}, should run now")
     else:
         hours_until_next_run = (next_run_time - datetime.utcnow()).total_seconds() / 3600
         logger.info(f"Task {task_name} last ran at {last_run}, next run in {hours_until_next_run:.2f} hours")
-    
-    return should_run 
\ No newline at end of file
+
+    return should_run
+
+def claim_task_run(task_name, interval_hours=24, lease_minutes=60):
+    """Atomically claim a due run of a task so only one node starts it
+
+    The claim is recorded under "<task_name>:claimed" with compare-and-set; a
+    claim older than lease_minutes is treated as abandoned so a crashed run is
+    retried. The last run time itself is still set by update_last_run when the
+    run completes.
+
+    Args:
+        task_name: The name of the task
+        interval_hours: The minimum interval in hours between runs
+        lease_minutes: How long a claim blocks other nodes
+
+    Returns:
+        bool: True if this node should run the task, False otherwise
+    """
+    if not should_run_task(task_name, interval_hours):
+        return False
+
+    claim_name = f"{task_name}:claimed"
+    current = _read(claim_name, use_cache=False)
+    claimed_at = _parse(claim_name, current)
+    now = datetime.utcnow()
+    if claimed_at and now - claimed_at < timedelta(minutes=lease_minutes):
+        logger.info(f"Task {task_name} was already claimed at {claimed_at}, skipping")
+        return False
+
+    if not _write(claim_name, current, now.isoformat()):
+        logger.info(f"Task {task_name} was claimed by another node, skipping")
+        return False
+    return True
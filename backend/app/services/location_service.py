@@ -0,0 +1,234 @@
+import re
+import math
+import logging
+from typing import Dict, Any, NamedTuple, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Offline gazetteer: city -> (country, latitude, longitude)
+GAZETTEER = {
+    "Mumbai": ("India", 19.0760, 72.8777),
+    "Delhi": ("India", 28.7041, 77.1025),
+    "Bangalore": ("India", 12.9716, 77.5946),
+    "Hyderabad": ("India", 17.3850, 78.4867),
+    "Chennai": ("India", 13.0827, 80.2707),
+    "Kolkata": ("India", 22.5726, 88.3639),
+    "Pune": ("India", 18.5204, 73.8567),
+    "Ahmedabad": ("India", 23.0225, 72.5714),
+    "Jaipur": ("India", 26.9124, 75.7873),
+    "Surat": ("India", 21.1702, 72.8311),
+    "Lucknow": ("India", 26.8467, 80.9462),
+    "Kanpur": ("India", 26.4499, 80.3319),
+    "Nagpur": ("India", 21.1458, 79.0882),
+    "Indore": ("India", 22.7196, 75.8577),
+    "Thane": ("India", 19.2183, 72.9781),
+    "Bhopal": ("India", 23.2599, 77.4126),
+    "Visakhapatnam": ("India", 17.6868, 83.2185),
+    "Patna": ("India", 25.5941, 85.1376),
+    "Vadodara": ("India", 22.3072, 73.1812),
+    "Ghaziabad": ("India", 28.6692, 77.4538),
+    "Ludhiana": ("India", 30.9010, 75.8573),
+    "Agra": ("India", 27.1767, 78.0081),
+    "Nashik": ("India", 19.9975, 73.7898),
+    "Ranchi": ("India", 23.3441, 85.3096),
+    "Faridabad": ("India", 28.4089, 77.3178),
+    "Coimbatore": ("India", 11.0168, 76.9558),
+    "Gurgaon": ("India", 28.4595, 77.0266),
+    "Noida": ("India", 28.5355, 77.3910),
+    "Kochi": ("India", 9.9312, 76.2673),
+    "Chandigarh": ("India", 30.7333, 76.7794),
+    "Bhubaneswar": ("India", 20.2961, 85.8245),
+    "Guwahati": ("India", 26.1445, 91.7362),
+    "Dehradun": ("India", 30.3165, 78.0322),
+    "Mysore": ("India", 12.2958, 76.6394),
+    "Mangalore": ("India", 12.9141, 74.8560),
+    "Thiruvananthapuram": ("India", 8.5241, 76.9366),
+    "Vellore": ("India", 12.9165, 79.1325),
+    "Manipal": ("India", 13.3525, 74.7928),
+    "New York": ("United States", 40.7128, -74.0060),
+    "San Francisco": ("United States", 37.7749, -122.4194),
+    "Los Angeles": ("United States", 34.0522, -118.2437),
+    "Boston": ("United States", 42.3601, -71.0589),
+    "Austin": ("United States", 30.2672, -97.7431),
+    "Chicago": ("United States", 41.8781, -87.6298),
+    "Seattle": ("United States", 47.6062, -122.3321),
+    "Toronto": ("Canada", 43.6532, -79.3832),
+    "London": ("United Kingdom", 51.5074, -0.1278),
+    "Berlin": ("Germany", 52.5200, 13.4050),
+    "Paris": ("France", 48.8566, 2.3522),
+    "Amsterdam": ("Netherlands", 52.3676, 4.9041),
+    "Singapore": ("Singapore", 1.3521, 103.8198),
+    "Dubai": ("United Arab Emirates", 25.2048, 55.2708),
+    "Sydney": ("Australia", -33.8688, 151.2093),
+    "Tokyo": ("Japan", 35.6762, 139.6503),
+}
+
+# Alternative spellings -> gazetteer city. This and GAZETTEER are the only city
+# tables: the stored city column, notification topics and preference matching
+# all normalize through normalize_location() / normalize_city()
+CITY_ALIASES = {
+    "Bengaluru": "Bangalore",
+    "New Delhi": "Delhi",
+    "Gurugram": "Gurgaon",
+    "Bombay": "Mumbai",
+    "Navi Mumbai": "Mumbai",
+    "NYC": "New York",
+    "Mumbai Suburban": "Mumbai",
+    "Calcutta": "Kolkata",
+    "Madras": "Chennai",
+    "Mysuru": "Mysore",
+    "Mangaluru": "Mangalore",
+    "Trivandrum": "Thiruvananthapuram",
+    "Cochin": "Kochi",
+    "Vizag": "Visakhapatnam",
+    "New York City": "New York",
+    "SF": "San Francisco",
+}
+
+ONLINE_KEYWORDS = ["online", "virtual", "remote"]
+
+# Country spellings -> canonical name; matched against whole location parts only
+COUNTRY_NAMES = {
+    "india": "India",
+    "usa": "United States",
+    "us": "United States",
+    "united states": "United States",
+    "united states of america": "United States",
+    "uk": "United Kingdom",
+    "united kingdom": "United Kingdom",
+    "england": "United Kingdom",
+    "canada": "Canada",
+    "germany": "Germany",
+    "france": "France",
+    "netherlands": "Netherlands",
+    "singapore": "Singapore",
+    "uae": "United Arab Emirates",
+    "united arab emirates": "United Arab Emirates",
+    "australia": "Australia",
+    "japan": "Japan",
+}
+
+# Indian states and union territories, so "Goa" or "Maharashtra" at least give a country
+INDIAN_STATES = [
+    "andhra pradesh", "assam", "bihar", "chhattisgarh", "goa", "gujarat", "haryana",
+    "himachal pradesh", "jharkhand", "karnataka", "kerala", "madhya pradesh", "maharashtra",
+    "odisha", "punjab", "rajasthan", "tamil nadu", "telangana", "uttar pradesh",
+    "uttarakhand", "west bengal", "jammu and kashmir", "delhi ncr",
+]
+
+# Longest gazetteer name in words, bounds the n-gram lookup below
+_MAX_NAME_WORDS = 3
+
+# Kilometres per degree of latitude
+_KM_PER_DEGREE = 111.32
+
+_EARTH_RADIUS_KM = 6371.0
+
+class LocationInfo(NamedTuple):
+    """Structured form of a scraped location string"""
+    city: Optional[str] = None
+    country: Optional[str] = None
+    is_online: bool = False
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+def _build_city_index() -> Dict[str, str]:
+    index = {city.lower(): city for city in GAZETTEER}
+    for alias, city in CITY_ALIASES.items():
+        index[alias.lower()] = city
+    return index
+
+# Precomputed once so normalization is a handful of dict lookups per location
+CITY_INDEX = _build_city_index()
+
+def normalize_location(location: Optional[str]) -> LocationInfo:
+    """
+    Turn a scraped location string into city, country, online flag and coordinates.
+
+    Handles the formats the scrapers produce, such as "Online | Mumbai",
+    "Pune, India", "Mumbai, Maharashtra, India" or "New York, NY, USA". The first
+    city found in the gazetteer provides the coordinates; an explicit country
+    part overrides the gazetteer's country only when no city was found.
+
+    Args:
+        location: The hackathon's location string
+
+    Returns:
+        LocationInfo: The structured location, with None for unknown fields
+    """
+    if not location:
+        return LocationInfo()
+
+    city = None
+    country = None
+    is_online = False
+    for part in re.split(r"[|,/]", location.lower()):
+        stripped = part.strip()
+        words = re.findall(r"[a-z0-9]+", stripped)
+        if any(word in ONLINE_KEYWORDS for word in words):
+            is_online = True
+
+        if country is None:
+            if stripped in COUNTRY_NAMES:
+                country = COUNTRY_NAMES[stripped]
+            elif stripped in INDIAN_STATES:
+                country = "India"
+
+        if city is None:
+            for size in range(min(_MAX_NAME_WORDS, len(words)), 0, -1):
+                for start in range(len(words) - size + 1):
+                    city = CITY_INDEX.get(" ".join(words[start:start + size]))
+                    if city:
+                        break
+                if city:
+                    break
+
+    if city:
+        city_country, latitude, longitude = GAZETTEER[city]
+        return LocationInfo(city, city_country, is_online, latitude, longitude)
+    return LocationInfo(None, country, is_online)
+
+def normalize_city(name: Optional[str]) -> Optional[str]:
+    """
+    The gazetteer city a city name or alias refers to.
+
+    Args:
+        name: A city name, e.g. "Bengaluru" or "new york city"
+
+    Returns:
+        Optional[str]: The canonical city, e.g. "Bangalore", or None if unknown
+    """
+    if not name:
+        return None
+    return CITY_INDEX.get(" ".join(re.findall(r"[a-z0-9]+", name.lower())))
+
+def location_columns(location: Optional[str]) -> Dict[str, Any]:
+    """Structured location as HackathonModel column values"""
+    return normalize_location(location)._asdict()
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Latitude/longitude box containing every point within radius_km of a point.
+
+    Args:
+        latitude: Centre latitude in degrees
+        longitude: Centre longitude in degrees
+        radius_km: Radius in kilometres
+
+    Returns:
+        Tuple[float, float, float, float]: min_lat, max_lat, min_lon, max_lon
+    """
+    delta_lat = radius_km / _KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(latitude))
+    # Near the poles every longitude is within reach
+    delta_lon = 180.0 if cos_lat < 1e-6 else min(180.0, radius_km / (_KM_PER_DEGREE * cos_lat))
+    return latitude - delta_lat, latitude + delta_lat, longitude - delta_lon, longitude + delta_lon
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle (haversine) distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * _EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
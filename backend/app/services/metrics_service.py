@@ -0,0 +1,186 @@
+import os
+import socket
+import logging
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    CONTENT_TYPE_LATEST,
+    generate_latest,
+    push_to_gateway,
+    write_to_textfile,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Pushgateway used by the Celery worker; when unset the worker writes a textfile instead
+PUSHGATEWAY_URL = os.getenv("PROMETHEUS_PUSHGATEWAY_URL")
+
+# Textfile written by the worker for the node_exporter textfile collector
+WORKER_METRICS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                                   "storage", "metrics", "worker.prom")
+
+# A dedicated registry keeps the exposition limited to HackRadar metrics
+registry = CollectorRegistry(auto_describe=True)
+
+REQUEST_LATENCY = Histogram(
+    "hackradar_http_request_duration_seconds",
+    "API request latency by route",
+    ["method", "route", "status"],
+    registry=registry,
+)
+
+DB_QUERY_LATENCY = Histogram(
+    "hackradar_db_query_duration_seconds",
+    "Database statement execution time",
+    ["statement"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    registry=registry,
+)
+
+CACHE_LOOKUPS = Counter(
+    "hackradar_cache_lookups_total",
+    "Cache lookups by cache name and result (hit or miss)",
+    ["cache", "result"],
+    registry=registry,
+)
+
+SCRAPE_DURATION = Histogram(
+    "hackradar_scrape_duration_seconds",
+    "Time spent scraping a single source",
+    ["source"],
+    buckets=(1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600),
+    registry=registry,
+)
+
+SCRAPE_NEW_HACKATHONS = Counter(
+    "hackradar_scrape_new_hackathons_total",
+    "New hackathons stored per source",
+    ["source"],
+    registry=registry,
+)
+
+UPSTREAM_RESPONSES = Counter(
+    "hackradar_upstream_responses_total",
+    "HTTP responses received from scraped platforms by status code",
+    ["source", "status"],
+    registry=registry,
+)
+
+SCRAPE_OUTCOMES = Counter(
+    "hackradar_scrape_outcomes_total",
+    "Source scrapes by outcome: ok, partial (budget or page errors), failed or skipped (circuit open)",
+    ["source", "outcome"],
+    registry=registry,
+)
+
+UPSTREAM_RETRIES = Counter(
+    "hackradar_upstream_retries_total",
+    "Requests to scraped platforms retried after a 429, 5xx, timeout or connection error",
+    ["source"],
+    registry=registry,
+)
+
+FCM_SEND_LATENCY = Histogram(
+    "hackradar_fcm_send_duration_seconds",
+    "Firebase Cloud Messaging send latency",
+    ["outcome"],
+    registry=registry,
+)
+
+FCM_MESSAGES = Counter(
+    "hackradar_fcm_messages_total",
+    "Firebase Cloud Messaging messages by delivery outcome",
+    ["outcome"],
+    registry=registry,
+)
+
+def render_metrics():
+    """Render the registry in the Prometheus text exposition format
+
+    Returns:
+        tuple: The encoded payload and its content type
+    """
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def observe_db_query(statement, duration):
+    """Record the execution time of a single SQL statement
+
+    Args:
+        statement: The SQL text, only its leading keyword is used as a label
+        duration: Execution time in seconds
+    """
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement else "UNKNOWN"
+    DB_QUERY_LATENCY.labels(statement=keyword).observe(duration)
+
+def record_cache_lookup(cache, hit):
+    """Count a cache lookup so hit ratios can be derived per cache
+
+    Args:
+        cache: The name of the cache
+        hit: Whether the lookup was served from the cache
+    """
+    CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+def record_upstream_response(source, response):
+    """Count an HTTP response received from a scraped platform
+
+    Args:
+        source: The platform name (Devpost, Unstop, Devfolio)
+        response: The requests response object
+    """
+    UPSTREAM_RESPONSES.labels(source=source, status=str(response.status_code)).inc()
+
+def record_scrape_outcome(source, outcome):
+    """Count a source scrape by outcome (ok, partial, failed or skipped)"""
+    SCRAPE_OUTCOMES.labels(source=source, outcome=outcome).inc()
+
+def record_upstream_retry(source):
+    """Count a retried request to a scraped platform"""
+    UPSTREAM_RETRIES.labels(source=source).inc()
+
+@contextmanager
+def time_scrape(source):
+    """Time a scrape of one source"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        SCRAPE_DURATION.labels(source=source).observe(time.perf_counter() - start)
+
+def record_new_hackathons(source, count):
+    """Count the new hackathons stored for a source"""
+    if count:
+        SCRAPE_NEW_HACKATHONS.labels(source=source).inc(count)
+
+def observe_fcm_send(duration, success):
+    """Record the latency of a Firebase Cloud Messaging send"""
+    FCM_SEND_LATENCY.labels(outcome="success" if success else "failure").observe(duration)
+
+def record_fcm_messages(success_count, failure_count):
+    """Count delivered and failed messages from a batch send"""
+    if success_count:
+        FCM_MESSAGES.labels(outcome="success").inc(success_count)
+    if failure_count:
+        FCM_MESSAGES.labels(outcome="failure").inc(failure_count)
+
+def export_worker_metrics():
+    """Export the worker's metrics after a task run
+
+    Celery workers are not scraped directly, so the registry is either pushed to a
+    Pushgateway (when PROMETHEUS_PUSHGATEWAY_URL is set) or written to a textfile
+    for the node_exporter textfile collector.
+    """
+    try:
+        if PUSHGATEWAY_URL:
+            push_to_gateway(PUSHGATEWAY_URL, job="hackradar_worker",
+                            grouping_key={"instance": socket.gethostname()}, registry=registry)
+        else:
+            os.makedirs(os.path.dirname(WORKER_METRICS_FILE), exist_ok=True)
+            write_to_textfile(WORKER_METRICS_FILE, registry)
+    except Exception as e:
+        logger.warning(f"Could not export worker metrics: {str(e)}")
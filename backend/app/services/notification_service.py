@@ -1,11 +1,20 @@
 import firebase_admin
+import requests
 from firebase_admin import credentials, messaging
 import logging
 import os
 import base64
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from collections import defaultdict
+from typing import List, Dict, NamedTuple, Optional, Set, Tuple
+
+from app.services.metrics_service import observe_fcm_send, record_fcm_messages
+from app.models.hackathon_record import HackathonRecord, HackathonReminder
+from app.services.topic_routing_service import Topic, hackathon_topics, route_hackathons
+from app.services.preference_matching_service import load_preference_index, match_preferences
 
 logger = logging.getLogger(__name__)
 
@@ -58,118 +67,484 @@ try:
 except Exception as e:
     logger.error(f"Failed to initialize Firebase: {str(e)}")
 
-def send_notification(title: str, body: str, topic: str = "new_hackathons", data: Dict[str, str] = None):
+# Messages per messaging.send_each call (FCM accepts at most 500). send_each fans a
+# batch out over one thread per message, so this also bounds in-flight requests.
+FCM_BATCH_SIZE = min(int(os.getenv("FCM_BATCH_SIZE", "100")), 500)
+
+# Number of batches sent at the same time
+FCM_MAX_CONCURRENT_BATCHES = int(os.getenv("FCM_MAX_CONCURRENT_BATCHES", "4"))
+
+class OutgoingMessage(NamedTuple):
+    """A notification waiting to be sent to a topic, or to one device when token is set"""
+    title: str
+    body: str
+    topic: str = "new_hackathons"
+    data: Optional[Dict[str, str]] = None
+    token: Optional[str] = None
+    covers: Tuple[str, ...] = ()  # Keys of the hackathons this message announces
+
+    @property
+    def target(self) -> str:
+        return self.token or self.topic
+
+class SendResult(NamedTuple):
+    """Delivery outcome for a single OutgoingMessage"""
+    message: OutgoingMessage
+    success: bool
+    message_id: Optional[str] = None
+    error: Optional[str] = None
+
+def build_message(title: str, body: str, topic: str = "new_hackathons", data: Dict[str, str] = None,
+                  token: str = None) -> messaging.Message:
     """
-    Send a notification to all users subscribed to a topic.
+    Build an FCM message with Android, APNS and web push configuration.
     
     Args:
         title: Notification title
         body: Notification body
-        topic: Topic to send notification to (default: "new_hackathons")
+        topic: Topic to send notification to
         data: Additional data to send with the notification
+        token: Device registration token, sends to that device instead of the topic
     
     Returns:
-        bool: True if notification was sent successfully, False otherwise
+        messaging.Message: The message ready to be sent
     """
-    try:
-        if not firebase_admin._apps:
-            logger.warning("Firebase Admin SDK not initialized. Cannot send notification.")
-            return False
-        
-        # Create notification
-        notification = messaging.Notification(
-            title=title,
-            body=body,
-        )
-        
-        # Create Android specific notification config
-        android_config = messaging.AndroidConfig(
-            priority='high',
-            notification=messaging.AndroidNotification(
-                icon='notification_icon',
-                color='#4CAF50',
-                sound='default'
-            ),
-        )
-        
-        # Create APNS (Apple) specific config
-        apns_config = messaging.APNSConfig(
-            payload=messaging.APNSPayload(
-                aps=messaging.Aps(
-                    alert=messaging.ApsAlert(
-                        title=title,
-                        body=body,
-                    ),
-                    sound='default',
-                    badge=1,
+    # Create notification
+    notification = messaging.Notification(
+        title=title,
+        body=body,
+    )
+    
+    # Create Android specific notification config
+    android_config = messaging.AndroidConfig(
+        priority='high',
+        notification=messaging.AndroidNotification(
+            icon='notification_icon',
+            color='#4CAF50',
+            sound='default'
+        ),
+    )
+    
+    # Create APNS (Apple) specific config
+    apns_config = messaging.APNSConfig(
+        payload=messaging.APNSPayload(
+            aps=messaging.Aps(
+                alert=messaging.ApsAlert(
+                    title=title,
+                    body=body,
                 ),
+                sound='default',
+                badge=1,
             ),
-        )
-        
-        # Create web specific config - without the problematic link option
-        webpush_config = messaging.WebpushConfig(
-            notification=messaging.WebpushNotification(
-                title=title,
-                body=body,
-                icon='/logo2.png',
-            ),
-            # Removed the fcm_options with link that required HTTPS
-        )
-        
-        # Create message with all configs
-        message = messaging.Message(
-            notification=notification,
-            android=android_config,
-            apns=apns_config,
-            webpush=webpush_config,
-            data=data or {},
-            topic=topic,
-        )
-        
-        # Send message
-        response = messaging.send(message)
-        logger.info(f"Notification sent successfully: {response}")
+        ),
+    )
+    
+    # Create web specific config - without the problematic link option
+    webpush_config = messaging.WebpushConfig(
+        notification=messaging.WebpushNotification(
+            title=title,
+            body=body,
+            icon='/logo2.png',
+        ),
+        # Removed the fcm_options with link that required HTTPS
+    )
+    
+    # Create message with all configs
+    return messaging.Message(
+        notification=notification,
+        android=android_config,
+        apns=apns_config,
+        webpush=webpush_config,
+        data=data or {},
+        topic=None if token else topic,
+        token=token,
+    )
+
+class FirebaseTransport:
+    """Deliver messages through the Firebase Admin SDK"""
+    name = "firebase"
+    
+    def is_ready(self) -> bool:
+        return bool(firebase_admin._apps)
+    
+    def send_batch(self, batch: List[OutgoingMessage]) -> List[SendResult]:
+        response = messaging.send_each([
+            build_message(message.title, message.body, message.topic, message.data, message.token)
+            for message in batch
+        ])
+        return [
+            SendResult(message, item.success, item.message_id, str(item.exception) if item.exception else None)
+            for message, item in zip(batch, response.responses)
+        ]
+
+class HttpTransport:
+    """
+    Deliver messages to a local FCM stand-in (see benchmarks/fake_fcm.py).
+    
+    Each batch is one POST to <url>/v1/batch with {"messages": [...]}; the server
+    answers {"results": [{"success", "message_id", "error"}, ...]} in order.
+    """
+    name = "http"
+    
+    def __init__(self, url: str, timeout: float = 30):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(FCM_MAX_CONCURRENT_BATCHES, 10))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def is_ready(self) -> bool:
         return True
-        
+    
+    def send_batch(self, batch: List[OutgoingMessage]) -> List[SendResult]:
+        payload = {"messages": [
+            {"title": m.title, "body": m.body, "topic": m.topic, "token": m.token, "data": m.data or {}}
+            for m in batch
+        ]}
+        response = self.session.post(f"{self.url}/v1/batch", json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return [
+            SendResult(message, item["success"], item.get("message_id"), item.get("error"))
+            for message, item in zip(batch, response.json()["results"])
+        ]
+
+def _default_transport():
+    """Pick the transport from NOTIFICATION_TRANSPORT (firebase or http)"""
+    if os.getenv("NOTIFICATION_TRANSPORT", "firebase").lower() == "http":
+        url = os.getenv("FCM_STANDIN_URL", "http://127.0.0.1:8765")
+        logger.info(f"Sending notifications to the FCM stand-in at {url}")
+        return HttpTransport(url)
+    return FirebaseTransport()
+
+# Transport used for every send, replaceable with set_transport()
+transport = _default_transport()
+
+def set_transport(new_transport):
+    """Replace the notification transport (e.g. with an HttpTransport for benchmarks)"""
+    global transport
+    transport = new_transport
+
+def _send_batch(batch: List[OutgoingMessage]) -> List[SendResult]:
+    """Send one batch through the transport and record its latency and outcomes"""
+    send_start = time.perf_counter()
+    try:
+        results = transport.send_batch(batch)
     except Exception as e:
-        logger.error(f"Error sending notification: {str(e)}")
+        observe_fcm_send(time.perf_counter() - send_start, success=False)
+        record_fcm_messages(0, len(batch))
+        logger.error(f"Error sending notification batch of {len(batch)}: {str(e)}")
+        return [SendResult(message, False, error=str(e)) for message in batch]
+    
+    failure_count = sum(1 for result in results if not result.success)
+    observe_fcm_send(time.perf_counter() - send_start, success=failure_count == 0)
+    record_fcm_messages(len(results) - failure_count, failure_count)
+    return results
+
+def send_notification(title: str, body: str, topic: str = "new_hackathons", data: Dict[str, str] = None):
+    """
+    Send a notification to all users subscribed to a topic.
+    
+    Args:
+        title: Notification title
+        body: Notification body
+        topic: Topic to send notification to (default: "new_hackathons")
+        data: Additional data to send with the notification
+    
+    Returns:
+        bool: True if notification was sent successfully, False otherwise
+    """
+    if not transport.is_ready():
+        logger.warning("Firebase Admin SDK not initialized. Cannot send notification.")
         return False
+    
+    result = _send_batch([OutgoingMessage(title, body, topic, data)])[0]
+    if result.success:
+        logger.info(f"Notification sent successfully: {result.message_id}")
+    else:
+        logger.error(f"Error sending notification: {result.error}")
+    return result.success
 
-def notify_new_hackathons(hackathons: List[Dict[str, Any]]):
+def send_notifications(messages: List[OutgoingMessage]) -> List[SendResult]:
     """
-    Send notifications for new hackathons in Mumbai.
+    Send many notifications in batches through the configured transport.
+    
+    Messages are split into chunks of FCM_BATCH_SIZE and up to
+    FCM_MAX_CONCURRENT_BATCHES chunks are in flight at once, so total send time
+    stays close to a single round trip for typical batches.
     
     Args:
-        hackathons: List of new hackathon dictionaries
+        messages: Messages to send
+    
+    Returns:
+        List[SendResult]: One result per message, in the same order
     """
-    if not hackathons:
-        return
+    if not messages:
+        return []
     
-    # Filter hackathons to only include those in Mumbai
-    mumbai_hackathons = [h for h in hackathons if h.get('location') and 'Mumbai' in h.get('location')]
+    if not transport.is_ready():
+        logger.warning("Firebase Admin SDK not initialized. Cannot send notifications.")
+        return [SendResult(message, False, error="Firebase not initialized") for message in messages]
     
-    if not mumbai_hackathons:
-        logger.info("No Mumbai hackathons to send notifications for.")
-        return
+    batches = [messages[i:i + FCM_BATCH_SIZE] for i in range(0, len(messages), FCM_BATCH_SIZE)]
     
-    # Send a notification for each new Mumbai hackathon
-    for hackathon in mumbai_hackathons:
-        title = f"New Mumbai Hackathon: {hackathon['name']}"
-        body = f"A new hackathon in Mumbai has been added from {hackathon['source']}."
-        data = {
-            "hackathon_id": str(hackathon.get('id', '')),
-            "source": hackathon.get('source', ''),
-            "url": hackathon.get('url', ''),
-        }
-        
-        send_notification(title, body, "mumbai_hackathons", data)
+    if len(batches) == 1:
+        results = _send_batch(batches[0])
+    else:
+        with ThreadPoolExecutor(max_workers=min(FCM_MAX_CONCURRENT_BATCHES, len(batches))) as executor:
+            results = [result for batch_results in executor.map(_send_batch, batches) for result in batch_results]
     
-    # Send a summary notification if there are multiple Mumbai hackathons
-    if len(mumbai_hackathons) > 1:
-        title = f"{len(mumbai_hackathons)} New Mumbai Hackathons Added"
-        body = f"Check out {len(mumbai_hackathons)} new hackathons in Mumbai that were just added!"
+    failures = sum(1 for result in results if not result.success)
+    logger.info(f"Sent {len(results) - failures}/{len(results)} notifications in {len(batches)} batches")
+    return results
+
+# Notification text per topic kind, formatted with the topic label and hackathon
+TOPIC_TEMPLATES = {
+    "city": {
+        "title": "New {label} Hackathon: {name}",
+        "body": "A new hackathon in {label} has been added from {source}.",
+        "summary_title": "{count} New {label} Hackathons Added",
+        "summary_body": "Check out {count} new hackathons in {label} that were just added!",
+    },
+    "online": {
+        "title": "New Online Hackathon: {name}",
+        "body": "A new online hackathon has been added from {source}.",
+        "summary_title": "{count} New Online Hackathons Added",
+        "summary_body": "Check out {count} new online hackathons that were just added!",
+    },
+    "source": {
+        "title": "New {label} Hackathon: {name}",
+        "body": "A new hackathon has been added on {label}.",
+        "summary_title": "{count} New {label} Hackathons Added",
+        "summary_body": "Check out {count} new hackathons on {label} that were just added!",
+    },
+}
+
+def hackathon_key(hackathon: HackathonRecord) -> str:
+    """Identify a hackathon in delivery bookkeeping"""
+    return str(hackathon.id or '')
+
+def _hackathon_data(hackathon: HackathonRecord) -> Dict[str, str]:
+    """Data fields identifying the hackathon a single-hackathon notification is about"""
+    return {
+        "hackathon_id": hackathon_key(hackathon),
+        "source": hackathon.source or '',
+        "url": hackathon.registration_link or '',
+    }
+
+def build_topic_messages(topic: Topic, hackathons: List[HackathonRecord],
+                         delivered: Dict[str, Set[str]] = None) -> List[OutgoingMessage]:
+    """
+    Build the notifications for one topic: one per hackathon plus a summary when
+    more than one hackathon was routed to it.
+    
+    Args:
+        topic: The topic the hackathons were routed to
+        hackathons: New hackathons for this topic
+        delivered: Targets already notified per hackathon key; those are skipped
+            and only hackathons notified for the first time count in the summary
+    
+    Returns:
+        List[OutgoingMessage]: Messages for the topic
+    """
+    delivered = delivered or {}
+    templates = TOPIC_TEMPLATES[topic.kind]
+    messages = []
+    
+    pending = [h for h in hackathons if topic.name not in delivered.get(hackathon_key(h), ())]
+    for hackathon in pending:
+        title = templates["title"].format(label=topic.label, name=hackathon.name)
+        body = templates["body"].format(label=topic.label, source=hackathon.source)
+        data = _hackathon_data(hackathon)
+        messages.append(OutgoingMessage(title, body, topic.name, data, covers=(hackathon_key(hackathon),)))
+    
+    fresh = [h for h in pending if not delivered.get(hackathon_key(h))]
+    if len(fresh) > 1:
+        title = templates["summary_title"].format(label=topic.label, count=len(fresh))
+        body = templates["summary_body"].format(label=topic.label, count=len(fresh))
         data = {
-            "count": str(len(mumbai_hackathons)),
+            "count": str(len(fresh)),
             "type": "summary"
         }
-        send_notification(title, body, "mumbai_hackathons", data) 
\ No newline at end of file
+        messages.append(OutgoingMessage(title, body, topic.name, data))
+    
+    return messages
+
+def build_preference_messages(hackathons: List[HackathonRecord],
+                              delivered: Dict[str, Set[str]] = None) -> List[OutgoingMessage]:
+    """
+    Build device notifications for subscribers whose stored preferences match.
+    
+    Each subscriber gets a single notification covering every hackathon that
+    matched their rules.
+    
+    Args:
+        hackathons: New hackathons
+        delivered: Targets already notified per hackathon key; those are skipped
+    
+    Returns:
+        List[OutgoingMessage]: One message per matching device token
+    """
+    delivered = delivered or {}
+    try:
+        index = load_preference_index()
+    except Exception as e:
+        logger.error(f"Could not load notification preferences: {str(e)}")
+        return []
+    
+    # Drop hackathons a token was already notified about, then regroup
+    groups = defaultdict(list)
+    for hackathon_indexes, tokens in match_preferences(hackathons, index).items():
+        for token in tokens:
+            remaining = tuple(i for i in hackathon_indexes
+                              if token not in delivered.get(hackathon_key(hackathons[i]), ()))
+            if remaining:
+                groups[remaining].append(token)
+    
+    messages = []
+    for hackathon_indexes, tokens in groups.items():
+        matched = [hackathons[i] for i in hackathon_indexes]
+        covers = tuple(hackathon_key(h) for h in matched)
+        if len(matched) == 1:
+            hackathon = matched[0]
+            title = f"New Hackathon For You: {hackathon.name}"
+            body = f"A new hackathon matching your preferences has been added from {hackathon.source}."
+            data = dict(_hackathon_data(hackathon), type="preferences")
+        else:
+            title = f"{len(matched)} New Hackathons For You"
+            body = f"Check out {len(matched)} new hackathons that match your preferences!"
+            data = {
+                "count": str(len(matched)),
+                "type": "preferences",
+            }
+        messages.extend(OutgoingMessage(title, body, None, data, token, covers) for token in tokens)
+    
+    if messages:
+        logger.info(f"Matched {len(messages)} subscribers out of {len(index)} to new hackathons")
+    return messages
+
+def build_notification_messages(hackathons: List[HackathonRecord],
+                                delivered: Dict[str, Set[str]] = None) -> List[OutgoingMessage]:
+    """
+    Build every notification for a batch of new hackathons: city, online and
+    source topics plus subscribers whose stored preferences match.
+    
+    Args:
+        hackathons: New hackathons
+        delivered: Targets already notified per hackathon key; those are skipped
+    
+    Returns:
+        List[OutgoingMessage]: Messages to send
+    """
+    # Group hackathons per topic in a single pass
+    routed = route_hackathons(hackathons)
+    
+    messages = []
+    for topic, topic_hackathons in routed.items():
+        messages.extend(build_topic_messages(topic, topic_hackathons, delivered))
+    
+    logger.info(f"Routed {len(hackathons)} hackathons to {len(routed)} topics ({len(messages)} notifications)")
+    
+    # Targeted notifications for stored subscription rules
+    messages.extend(build_preference_messages(hackathons, delivered))
+    return messages
+
+# Reminder text per reminder kind; {scope} is "in <city>", "Online" or "on <source>"
+REMINDER_TEMPLATES = {
+    "starts_soon": {
+        "title": "Starting Soon: {name}",
+        "body": "{name} starts within {hours} hours. Get your team ready!",
+        "summary_title": "{count} Hackathons {scope} Start Soon",
+        "summary_body": "{count} hackathons {scope} start within the next {hours} hours.",
+    },
+    "closing_soon": {
+        "title": "Closing Soon: {name}",
+        "body": "{name} closes within {hours} hours. Don't miss out!",
+        "summary_title": "{count} Hackathons {scope} Close Soon",
+        "summary_body": "{count} hackathons {scope} close within the next {hours} hours. Don't miss out!",
+    },
+}
+
+REMINDER_SCOPES = {
+    "city": "in {label}",
+    "online": "Online",
+    "source": "on {label}",
+}
+
+def reminder_key(reminder: HackathonReminder) -> str:
+    """Identify a reminder in delivery bookkeeping"""
+    return f"{reminder.kind}:{hackathon_key(reminder.hackathon)}"
+
+def build_reminder_messages(reminders: List[HackathonReminder],
+                            delivered: Dict[str, Set[str]] = None) -> List[OutgoingMessage]:
+    """
+    Build batched deadline reminders for the topics each hackathon belongs to.
+
+    A topic gets one notification per reminder kind: a single-hackathon message
+    when only one is due, otherwise one summary covering all of them.
+
+    Args:
+        reminders: Due reminders
+        delivered: Targets already notified per reminder key; those are skipped
+
+    Returns:
+        List[OutgoingMessage]: Messages to send
+    """
+    delivered = delivered or {}
+    messages = []
+
+    routed = defaultdict(list)
+    for reminder in reminders:
+        for topic in hackathon_topics(reminder.hackathon):
+            routed[topic].append(reminder)
+
+    for topic, topic_reminders in routed.items():
+        by_kind = defaultdict(list)
+        for reminder in topic_reminders:
+            if topic.name not in delivered.get(reminder_key(reminder), ()):
+                by_kind[reminder.kind].append(reminder)
+
+        for kind, due in by_kind.items():
+            templates = REMINDER_TEMPLATES[kind]
+            hours = due[0].lead_hours
+            covers = tuple(reminder_key(reminder) for reminder in due)
+            if len(due) == 1:
+                hackathon = due[0].hackathon
+                title = templates["title"].format(name=hackathon.name)
+                body = templates["body"].format(name=hackathon.name, hours=hours)
+                data = dict(_hackathon_data(hackathon), type="reminder", reminder=kind)
+            else:
+                scope = REMINDER_SCOPES[topic.kind].format(label=topic.label)
+                title = templates["summary_title"].format(count=len(due), scope=scope)
+                body = templates["summary_body"].format(count=len(due), scope=scope, hours=hours)
+                data = {
+                    "count": str(len(due)),
+                    "type": "reminder",
+                    "reminder": kind,
+                }
+            messages.append(OutgoingMessage(title, body, topic.name, data, covers=covers))
+
+    return messages
+
+def notify_new_hackathons(hackathons: List[HackathonRecord]) -> List[SendResult]:
+    """
+    Send notifications for new hackathons to their city, online and source topics
+    and to subscribers whose stored preferences match.
+    
+    Args:
+        hackathons: New hackathons
+    
+    Returns:
+        List[SendResult]: Delivery result for every notification sent
+    """
+    if not hackathons:
+        return []
+    
+    messages = build_notification_messages(hackathons)
+    
+    if not messages:
+        logger.info("No notifications to send for the new hackathons.")
+        return []
+    
+    # Send everything in batches instead of one HTTPS call per message
+    return send_notifications(messages)
@@ -0,0 +1,230 @@
+import os
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import or_, and_
+
+from app.db.database import SessionLocal
+from app.models.hackathon import HackathonModel
+from app.models.notification_outbox import NotificationOutboxModel
+from app.models.hackathon_record import HackathonRecord, HackathonReminder
+from app.services.dedup_service import deduplicate_hackathons
+from app.services.notification_service import (
+    build_notification_messages, build_reminder_messages, hackathon_key, reminder_key, send_notifications
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+HACKATHON_CREATED = "hackathon_created"
+HACKATHON_REMINDER = "hackathon_reminder"
+
+# Events claimed and sent together
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "200"))
+
+# Batches processed per drain before yielding back to the scheduler
+OUTBOX_MAX_BATCHES = int(os.getenv("OUTBOX_MAX_BATCHES", "20"))
+
+# Attempts before an event is marked failed
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "6"))
+
+# Base delay of the exponential backoff between attempts
+OUTBOX_BACKOFF_SECONDS = int(os.getenv("OUTBOX_BACKOFF_SECONDS", "60"))
+
+# Claims older than this belong to a worker that died mid-send and are retried
+OUTBOX_CLAIM_TIMEOUT_SECONDS = int(os.getenv("OUTBOX_CLAIM_TIMEOUT_SECONDS", "900"))
+
+def persist_new_hackathon(db, db_hackathon, hackathon: HackathonRecord) -> HackathonRecord:
+    """
+    Insert a new hackathon and its notification event in the same transaction.
+
+    Either both rows are committed or neither is, so a hackathon can never be
+    stored without its notification being queued (or the other way round).
+
+    Args:
+        db: The scraper's database session
+        db_hackathon: The HackathonModel to insert
+        hackathon: The scraped hackathon
+
+    Returns:
+        HackathonRecord: The hackathon with its new id
+    """
+    try:
+        db.add(db_hackathon)
+        db.flush()
+        hackathon = hackathon._replace(id=db_hackathon.id)
+
+        db.add(NotificationOutboxModel(
+            idempotency_key=f"{HACKATHON_CREATED}:{db_hackathon.id}",
+            event_type=HACKATHON_CREATED,
+            payload=hackathon.to_payload(),
+        ))
+        db.commit()
+        return hackathon
+    except Exception:
+        db.rollback()
+        raise
+
+def _claim_batch(db, due_before: datetime) -> List[NotificationOutboxModel]:
+    """Lock a batch of due events and mark them as processing"""
+    stale_before = due_before - timedelta(seconds=OUTBOX_CLAIM_TIMEOUT_SECONDS)
+    rows = db.query(NotificationOutboxModel).filter(
+        or_(
+            and_(NotificationOutboxModel.status == "pending",
+                 NotificationOutboxModel.next_attempt_at <= due_before),
+            and_(NotificationOutboxModel.status == "processing",
+                 NotificationOutboxModel.claimed_at < stale_before),
+        )
+    ).order_by(NotificationOutboxModel.id).limit(OUTBOX_BATCH_SIZE).with_for_update(skip_locked=True).all()
+
+    claimed_at = datetime.utcnow()
+    for row in rows:
+        row.status = "processing"
+        row.claimed_at = claimed_at
+    db.commit()
+    return rows
+
+def _event(row: NotificationOutboxModel):
+    """The HackathonRecord or HackathonReminder an event's payload describes"""
+    if row.event_type == HACKATHON_REMINDER:
+        return HackathonReminder.from_payload(row.payload)
+    return HackathonRecord.from_payload(row.payload)
+
+def _event_key(event) -> str:
+    """Key the event's messages are covered by in delivery bookkeeping"""
+    if isinstance(event, HackathonReminder):
+        return reminder_key(event)
+    return hackathon_key(event)
+
+def _is_duplicate(hackathon) -> bool:
+    """Whether dedup_service linked the hackathon to a canonical event on another row"""
+    return hackathon.canonical_id is not None and hackathon.canonical_id != hackathon.id
+
+def _linked_hackathons(db, ids) -> Dict[int, HackathonModel]:
+    """
+    The stored hackathons of a batch by id, after duplicate detection has seen them.
+
+    Ingest commits a hackathon's event before deduplicate_hackathons() runs, so a
+    drain in between finds canonical_id still NULL. Such rows are linked first,
+    otherwise a duplicate would look unique and be notified.
+    """
+    query = db.query(HackathonModel).filter(HackathonModel.id.in_(ids))
+    current = {hackathon.id: hackathon for hackathon in query}
+    if any(hackathon.canonical_id is None for hackathon in current.values()):
+        deduplicate_hackathons()
+        current = {hackathon.id: hackathon for hackathon in query.populate_existing()}
+    return current
+
+def _cancelled_events(db, rows: List[NotificationOutboxModel], now: datetime) -> List[NotificationOutboxModel]:
+    """
+    Events that should no longer be delivered: any event for a cross-source
+    duplicate (its canonical event is notified instead), and reminders whose
+    hackathon is gone, already past, or whose date changed since queueing.
+    """
+    current = _linked_hackathons(db, {row.payload.get("id") for row in rows})
+
+    cancelled = []
+    for row in rows:
+        hackathon = current.get(row.payload.get("id"))
+        if hackathon is not None and _is_duplicate(hackathon):
+            cancelled.append(row)
+        elif row.event_type == HACKATHON_REMINDER:
+            due_at = getattr(hackathon, row.payload["due_field"], None) if hackathon else None
+            if due_at is None or due_at <= now or due_at.isoformat() != row.payload["due_at"]:
+                cancelled.append(row)
+    return cancelled
+
+def _process_batch(db, rows: List[NotificationOutboxModel]) -> Dict[str, int]:
+    """Send the notifications for claimed events and record the outcome per event"""
+    now = datetime.utcnow()
+    counts = {"sent": 0, "retry": 0, "failed": 0, "cancelled": 0}
+
+    cancelled = _cancelled_events(db, rows, now)
+    for row in cancelled:
+        row.status = "cancelled"
+        row.processed_at = now
+        row.claimed_at = None
+        counts["cancelled"] += 1
+    rows = [row for row in rows if row not in cancelled]
+
+    events = {row.id: _event(row) for row in rows}
+    delivered = {_event_key(events[row.id]): set(row.delivered_targets or []) for row in rows}
+    created = [event for event in events.values() if isinstance(event, HackathonRecord)]
+    reminders = [event for event in events.values() if isinstance(event, HackathonReminder)]
+
+    messages = build_notification_messages(created, delivered) if created else []
+    messages.extend(build_reminder_messages(reminders, delivered))
+    results = send_notifications(messages)
+
+    errors = defaultdict(list)
+    for result in results:
+        for key in result.message.covers:
+            if result.success:
+                delivered[key].add(result.message.target)
+            else:
+                errors[key].append(result.error or "unknown error")
+
+    now = datetime.utcnow()
+    for row in rows:
+        key = _event_key(events[row.id])
+        row.delivered_targets = sorted(delivered[key])
+        row.attempts = (row.attempts or 0) + 1
+        row.claimed_at = None
+
+        if not errors.get(key):
+            row.status = "sent"
+            row.processed_at = now
+            row.last_error = None
+            counts["sent"] += 1
+        elif row.attempts >= OUTBOX_MAX_ATTEMPTS:
+            row.status = "failed"
+            row.processed_at = now
+            row.last_error = errors[key][0][:1000]
+            counts["failed"] += 1
+        else:
+            row.status = "pending"
+            row.next_attempt_at = now + timedelta(seconds=OUTBOX_BACKOFF_SECONDS * 2 ** (row.attempts - 1))
+            row.last_error = errors[key][0][:1000]
+            counts["retry"] += 1
+
+    db.commit()
+    return counts
+
+def drain_outbox() -> Dict[str, int]:
+    """
+    Deliver pending notification events (new hackathons and reminders) in batches.
+
+    Events are claimed with SELECT ... FOR UPDATE SKIP LOCKED so several consumers
+    can drain concurrently. Targets that were already notified are remembered per
+    event and skipped on retries; failed deliveries are retried with exponential
+    backoff until OUTBOX_MAX_ATTEMPTS.
+
+    Returns:
+        Dict[str, int]: Number of events sent, scheduled for retry, failed and cancelled
+    """
+    db = SessionLocal()
+    totals = {"sent": 0, "retry": 0, "failed": 0, "cancelled": 0}
+    try:
+        # Only events due when the drain started, so retries wait for their backoff
+        started_at = datetime.utcnow()
+        for _ in range(OUTBOX_MAX_BATCHES):
+            rows = _claim_batch(db, started_at)
+            if not rows:
+                break
+            counts = _process_batch(db, rows)
+            for key, value in counts.items():
+                totals[key] += value
+
+        if any(totals.values()):
+            logger.info(f"Notification outbox drained: {totals['sent']} sent, "
+                        f"{totals['retry']} to retry, {totals['failed']} failed, "
+                        f"{totals['cancelled']} cancelled")
+        return totals
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error draining notification outbox: {str(e)}")
+        raise
+    finally:
+        db.close()
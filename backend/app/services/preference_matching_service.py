@@ -0,0 +1,176 @@
+import re
+import logging
+from collections import defaultdict
+from typing import List, Dict, Any, Iterable, Tuple
+
+from app.db.database import SessionLocal
+from app.models.notification_preference import NotificationPreferenceModel
+from app.models.hackathon_record import HackathonRecord
+from app.services.location_service import normalize_location, normalize_city as gazetteer_city
+
+logger = logging.getLogger(__name__)
+
+# Dimensions every rule is matched on; a hackathon must pass all of them
+DIMENSIONS = ("city", "theme", "source", "mode", "prize")
+
+# Bit positions set in each byte value, used to decode recipient bitmaps quickly
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+def normalize_city(city: str) -> str:
+    """Map a city name or alias to the canonical lowercase city name
+
+    Known cities go through location_service, so they match the stored city
+    column; other names are only lowercased and stripped of punctuation.
+    """
+    return (gazetteer_city(city) or " ".join(re.findall(r"[a-z0-9]+", city.lower()))).lower()
+
+def normalize_theme(theme: str) -> List[str]:
+    """Split a theme such as "Machine Learning/AI" into lookup keys
+
+    Returns the full theme plus each part, so a rule for "AI" matches it.
+    """
+    theme = theme.strip().lower()
+    keys = [theme] if theme else []
+    for part in re.split(r"[/&,]", theme):
+        part = part.strip()
+        if part and part not in keys:
+            keys.append(part)
+    return keys
+
+def hackathon_attributes(hackathon: HackathonRecord) -> Dict[str, List[str]]:
+    """
+    Extract the values a hackathon offers for each matching dimension.
+
+    Args:
+        hackathon: A new hackathon
+
+    Returns:
+        Dict[str, List[str]]: Attribute values per dimension
+    """
+    location = hackathon.location or ""
+    info = normalize_location(location)
+
+    cities = [info.city.lower()] if info.city else []
+    # Also offer location parts outside the gazetteer so rules for smaller places can match
+    for part in re.split(r"[|,]", location):
+        if gazetteer_city(part) is None:
+            city = normalize_city(part)
+            if city and city not in cities:
+                cities.append(city)
+
+    themes = []
+    for theme in hackathon.themes:
+        themes.extend(normalize_theme(theme))
+
+    return {
+        "city": cities,
+        "theme": themes,
+        "source": [(hackathon.source or "").lower()],
+        "mode": ["online" if info.is_online else "offline"],
+        "prize": ["yes"] if hackathon.has_prize else [],
+    }
+
+class PreferenceIndex:
+    """
+    Inverted index from attribute values to the subscribers whose rules accept them.
+
+    Subscribers are numbered by position and every posting list is stored as a
+    Python integer bitmap. For each dimension a hackathon's candidates are the
+    subscribers with no constraint on that dimension OR-ed with the postings of its
+    values; AND-ing the dimensions gives the recipients. Matching therefore costs a
+    few bitwise operations per hackathon instead of evaluating every rule.
+    """
+
+    def __init__(self, preferences: Iterable[Any]):
+        self.tokens = []
+        self.postings = {dimension: defaultdict(int) for dimension in DIMENSIONS}
+        self.wildcards = {dimension: 0 for dimension in DIMENSIONS}
+
+        for position, preference in enumerate(preferences):
+            self.tokens.append(preference.token)
+            bit = 1 << position
+
+            rules = {
+                "city": {normalize_city(city) for city in preference.cities or []},
+                "theme": {key for theme in preference.themes or [] for key in normalize_theme(theme)[:1]},
+                "source": {source.lower() for source in preference.sources or []},
+                "mode": set() if preference.mode in (None, "any") else {preference.mode},
+                "prize": {"yes"} if preference.require_prize else set(),
+            }
+            for dimension, values in rules.items():
+                if not values:
+                    self.wildcards[dimension] |= bit
+                for value in values:
+                    self.postings[dimension][value] |= bit
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def match(self, attributes: Dict[str, List[str]]) -> int:
+        """Return the bitmap of subscribers whose rules accept these attributes"""
+        recipients = (1 << len(self.tokens)) - 1
+        for dimension in DIMENSIONS:
+            candidates = self.wildcards[dimension]
+            postings = self.postings[dimension]
+            for value in attributes.get(dimension, []):
+                candidates |= postings.get(value, 0)
+            recipients &= candidates
+            if not recipients:
+                break
+        return recipients
+
+    def positions(self, bitmap: int) -> List[int]:
+        """Decode a recipient bitmap into subscriber positions"""
+        positions = []
+        for byte_index, value in enumerate(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")):
+            if value:
+                base = byte_index * 8
+                positions.extend(base + bit for bit in _BYTE_BITS[value])
+        return positions
+
+def load_preference_index(db=None) -> PreferenceIndex:
+    """Build the index from every stored preference"""
+    owns_session = db is None
+    db = db or SessionLocal()
+    try:
+        rows = db.query(
+            NotificationPreferenceModel.token,
+            NotificationPreferenceModel.cities,
+            NotificationPreferenceModel.themes,
+            NotificationPreferenceModel.sources,
+            NotificationPreferenceModel.mode,
+            NotificationPreferenceModel.require_prize,
+        ).all()
+        return PreferenceIndex(rows)
+    finally:
+        if owns_session:
+            db.close()
+
+def match_preferences(hackathons: List[HackathonRecord], index: PreferenceIndex) -> Dict[Tuple[int, ...], List[str]]:
+    """
+    Find which subscribers should hear about which new hackathons.
+
+    Subscribers that matched the same set of hackathons get the same notification,
+    so results are grouped by that set.
+
+    Args:
+        hackathons: New hackathons
+        index: The subscriber index
+
+    Returns:
+        Dict[Tuple[int, ...], List[str]]: Tokens per tuple of matched hackathon indexes
+    """
+    if not hackathons or not len(index):
+        return {}
+
+    matched = defaultdict(list)
+    for hackathon_index, hackathon in enumerate(hackathons):
+        bitmap = index.match(hackathon_attributes(hackathon))
+        if bitmap:
+            for position in index.positions(bitmap):
+                matched[position].append(hackathon_index)
+
+    groups = defaultdict(list)
+    for position, hackathon_indexes in matched.items():
+        groups[tuple(hackathon_indexes)].append(index.tokens[position])
+    return dict(groups)
@@ -0,0 +1,84 @@
+import os
+import re
+import logging
+from typing import Iterable, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Conversion rates into INR, the currency prize_inr is stored in
+INR_PER_USD = float(os.getenv("INR_PER_USD", "83"))
+INR_PER_EUR = float(os.getenv("INR_PER_EUR", "90"))
+INR_PER_GBP = float(os.getenv("INR_PER_GBP", "105"))
+
+INR_RATES = {"INR": 1.0, "USD": INR_PER_USD, "EUR": INR_PER_EUR, "GBP": INR_PER_GBP}
+
+# Currency symbols, codes and the names Unstop uses ("fa-rupee") -> ISO code
+CURRENCY_ALIASES = {
+    "₹": "INR", "rs": "INR", "inr": "INR", "rupee": "INR", "rupees": "INR",
+    "$": "USD", "usd": "USD", "dollar": "USD", "dollars": "USD",
+    "€": "EUR", "eur": "EUR", "euro": "EUR",
+    "£": "GBP", "gbp": "GBP", "pound": "GBP",
+}
+
+# Magnitude words after an amount ("$1.5M", "₹2 lakh")
+MULTIPLIERS = {"k": 1e3, "m": 1e6, "mn": 1e6, "million": 1e6, "lakh": 1e5, "lakhs": 1e5, "l": 1e5, "cr": 1e7, "crore": 1e7}
+
+_AMOUNT_PATTERN = re.compile(
+    r"(₹|\$|€|£|\b(?:rs|inr|usd|eur|gbp)\b\.?)?\s*(\d[\d,]*(?:\.\d+)?)\s*"
+    r"(k|mn|m|million|lakhs?|l|cr|crore)?\b\s*(inr|usd|eur|gbp|rupees?|dollars?)?",
+    re.IGNORECASE,
+)
+
+def currency_code(currency: Optional[str]) -> Optional[str]:
+    """Map a currency symbol, code or name to an ISO code, None if unknown"""
+    if not currency:
+        return None
+    key = currency.strip().lower().replace("fa-", "").rstrip(".")
+    return CURRENCY_ALIASES.get(key)
+
+def to_inr(amount: float, currency: Optional[str]) -> Optional[int]:
+    """Convert an amount to whole rupees, None if the currency is unknown"""
+    code = currency_code(currency) if currency not in INR_RATES else currency
+    if code is None:
+        return None
+    return int(round(amount * INR_RATES[code]))
+
+def parse_prize_amount(text: Optional[str]) -> Optional[int]:
+    """
+    Parse a scraped prize string such as "$10,000", "₹1,00,000" or "$1.5M" into INR.
+
+    Only amounts with a recognizable currency count; when a string mentions
+    several amounts the largest one is taken, as prize strings list a total
+    or a first prize before smaller ones.
+
+    Args:
+        text: The prize text, with any HTML already removed
+
+    Returns:
+        Optional[int]: The prize in INR, or None if no amount was found
+    """
+    if not text:
+        return None
+    best = None
+    for symbol, number, multiplier, suffix in _AMOUNT_PATTERN.findall(text):
+        currency = symbol or suffix
+        if not currency:
+            continue
+        amount = float(number.replace(",", "")) * MULTIPLIERS.get(multiplier.lower(), 1)
+        inr = to_inr(amount, currency)
+        if inr is not None and (best is None or inr > best):
+            best = inr
+    return best
+
+def total_prize_inr(prizes: Iterable[Tuple[Optional[float], Optional[str]]]) -> Optional[int]:
+    """Sum (amount, currency) prize entries in INR, None if none could be converted"""
+    total = None
+    for amount, currency in prizes:
+        try:
+            inr = to_inr(float(amount), currency) if amount else None
+        except (TypeError, ValueError):
+            inr = None
+        if inr is not None:
+            total = (total or 0) + inr
+    return total
@@ -0,0 +1,173 @@
+import os
+import re
+import sys
+import glob
+import hmac
+import time
+import logging
+import cProfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Allow API requests to opt into profiling with the X-Profile header
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+
+# Shared secret a request must send as its X-Profile header; without one no request is profiled
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+
+# Also profile loopback clients without a token, for local development only: behind a
+# same-host reverse proxy every request comes from loopback
+PROFILING_ALLOW_LOCAL = os.getenv("PROFILING_ALLOW_LOCAL", "false").lower() == "true"
+
+# Profile files kept on disk; the oldest are deleted beyond this
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+
+# Profile every run of the scrape task
+PROFILE_SCRAPES = os.getenv("PROFILE_SCRAPES", "false").lower() == "true"
+
+# "sampling" writes folded stacks, "cprofile" writes pstats files
+PROFILE_MODE = os.getenv("PROFILE_MODE", "sampling").lower()
+
+# Interval between stack samples in seconds
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+
+# Profiles are stored next to last_run.json
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                           "storage", "profiles")
+
+def profiling_allowed(token, client_host):
+    """Whether an API request may be profiled
+
+    Args:
+        token: Value of the request's X-Profile header
+        client_host: The client's address
+
+    Returns:
+        bool: True if the token matches PROFILING_TOKEN, or PROFILING_ALLOW_LOCAL
+        is set and the request comes from the local machine
+    """
+    if PROFILING_TOKEN and hmac.compare_digest(token.encode("latin-1"), PROFILING_TOKEN.encode("latin-1")):
+        return True
+    return PROFILING_ALLOW_LOCAL and client_host in ("127.0.0.1", "::1", "localhost")
+
+def _prune_profiles():
+    """Delete the oldest profiles so at most PROFILE_MAX_FILES remain after the next one is written"""
+    paths = sorted(glob.glob(os.path.join(PROFILE_DIR, "*")), key=os.path.getmtime)
+    for path in paths[:max(0, len(paths) - PROFILE_MAX_FILES + 1)]:
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not delete old profile {path}: {str(e)}")
+
+def _profile_path(name, extension):
+    """Build a unique file path for a profile"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    _prune_profiles()
+    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name.strip("/")) or "root"
+    timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    return os.path.join(PROFILE_DIR, f"{safe_name}-{timestamp}-{os.getpid()}.{extension}")
+
+class StackSampler:
+    """
+    Minimal sampling profiler for every thread of the process.
+
+    A background thread reads each thread's current frame at a fixed interval
+    and counts the collapsed call stacks, so work handed to thread pools (the
+    concurrent scrapes and their page fetches) is captured along with the
+    calling thread. Each stack starts with its thread's name, pool threads
+    grouped by pool, so one thread can be picked out in the flame graph. The
+    result is written in the folded format understood by flamegraph.pl and
+    speedscope.
+    """
+
+    def __init__(self, interval=PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self._thread.ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                # "ThreadPoolExecutor-0_3" -> "ThreadPoolExecutor-0" so a pool's threads merge
+                thread_name = re.sub(r"_\d+$", "", names.get(thread_id, str(thread_id)))
+                stack.append(thread_name.replace(";", "_").replace(" ", "_"))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.items():
+                f.write(f"{stack} {count}\n")
+
+@contextmanager
+def profile(name, mode=None):
+    """Profile the enclosed block and write the result to the profile directory
+
+    Args:
+        name: A label used in the file name (task name or request path)
+        mode: "sampling" or "cprofile", defaults to PROFILE_MODE. Sampling covers
+            every thread; cProfile only sees the thread that enters the block
+
+    Yields:
+        dict: Holds the file path the profile is written to under "path"
+    """
+    mode = mode or PROFILE_MODE
+    result = {"path": _profile_path(name, "prof" if mode == "cprofile" else "folded")}
+    start = time.perf_counter()
+
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield result
+        finally:
+            profiler.disable()
+            profiler.dump_stats(result["path"])
+    else:
+        sampler = StackSampler()
+        sampler.start()
+        try:
+            yield result
+        finally:
+            sampler.stop()
+            sampler.write(result["path"])
+
+    logger.info(f"Wrote {mode} profile for {name} ({time.perf_counter() - start:.2f}s) to {result['path']}")
+
+def profiled_task(name):
+    """Decorator that profiles every call of a task when PROFILE_SCRAPES is set
+
+    When profiling is disabled the function is returned unchanged, so the hook
+    costs nothing in production.
+    """
+    def decorator(func):
+        if not PROFILE_SCRAPES:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,114 @@
+import os
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+
+from app.db.database import SessionLocal
+from app.models.hackathon import HackathonModel
+from app.models.notification_outbox import NotificationOutboxModel
+from app.models.hackathon_record import HackathonRecord, HackathonReminder
+from app.services.outbox_service import HACKATHON_REMINDER
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# How long before start_date the "starts soon" reminder goes out, in hours
+REMINDER_START_LEAD_HOURS = int(os.getenv("REMINDER_START_LEAD_HOURS", "24"))
+
+# How long before end_date the "closing soon" reminder goes out, in hours
+REMINDER_CLOSING_LEAD_HOURS = int(os.getenv("REMINDER_CLOSING_LEAD_HOURS", "48"))
+
+# Reminder kind -> (date column it counts down to, lead time in hours)
+REMINDER_KINDS = {
+    "starts_soon": ("start_date", REMINDER_START_LEAD_HOURS),
+    "closing_soon": ("end_date", REMINDER_CLOSING_LEAD_HOURS),
+}
+
+def reminder_idempotency_key(kind: str, hackathon_id: int, due_at: datetime) -> str:
+    """
+    Outbox key of a reminder. It includes the date being counted down to, so a
+    hackathon whose date moves gets a fresh reminder for the new date.
+    """
+    return f"{HACKATHON_REMINDER}:{kind}:{hackathon_id}:{due_at.isoformat()}"
+
+def _reminder_payload(hackathon: HackathonModel, kind: str, field: str, lead_hours: int) -> Dict[str, Any]:
+    reminder = HackathonReminder(
+        HackathonRecord.from_model(hackathon), kind, field, getattr(hackathon, field).isoformat(), lead_hours
+    )
+    return reminder.to_payload()
+
+def schedule_reminders(now: datetime = None) -> Dict[str, int]:
+    """
+    Queue reminders for hackathons whose start or end date is coming up.
+
+    For each reminder kind only the rows whose date falls inside the lead window
+    (now, now + lead] are read, which is a range scan on the indexed date column
+    rather than a full-table scan. Reminders are written to the notification
+    outbox keyed by hackathon, kind and date, so repeated scans never queue the
+    same reminder twice. If a date changes between scrapes, the old reminder is
+    cancelled when the outbox sees the mismatch and the new date gets its own.
+
+    Args:
+        now: Current time, defaults to datetime.utcnow()
+
+    Returns:
+        Dict[str, int]: Number of reminders queued per kind
+    """
+    now = now or datetime.utcnow()
+    db = SessionLocal()
+    queued = {}
+    try:
+        for kind, (field, lead_hours) in REMINDER_KINDS.items():
+            column = getattr(HackathonModel, field)
+            due = db.query(HackathonModel).filter(
+                column > now,
+                column <= now + timedelta(hours=lead_hours),
+                # Duplicates on other sources are reminded through their canonical event
+                or_(HackathonModel.canonical_id.is_(None), HackathonModel.canonical_id == HackathonModel.id),
+            ).order_by(column).all()
+
+            events = {reminder_idempotency_key(kind, h.id, getattr(h, field)): h for h in due}
+            existing = {}
+            if events:
+                existing = {
+                    row.idempotency_key: row
+                    for row in db.query(NotificationOutboxModel).filter(
+                        NotificationOutboxModel.idempotency_key.in_(list(events))
+                    )
+                }
+
+            queued[kind] = 0
+            for key, hackathon in events.items():
+                row = existing.get(key)
+                if row is None:
+                    db.add(NotificationOutboxModel(
+                        idempotency_key=key,
+                        event_type=HACKATHON_REMINDER,
+                        payload=_reminder_payload(hackathon, kind, field, lead_hours),
+                    ))
+                    queued[kind] += 1
+                elif row.status == "cancelled":
+                    # The date moved away and came back; the reminder is due again
+                    row.status = "pending"
+                    row.next_attempt_at = now
+                    queued[kind] += 1
+
+        db.commit()
+    except IntegrityError:
+        # Another scheduler queued the same reminders first
+        db.rollback()
+        logger.warning("Reminders were queued concurrently, skipping this scan")
+        return {kind: 0 for kind in REMINDER_KINDS}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error scheduling reminders: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+    if any(queued.values()):
+        logger.info(f"Queued reminders: {queued}")
+    return queued
@@ -0,0 +1,161 @@
+import os
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+from app.services.last_run_service import get_state, compare_and_set_state
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Interval used the first time a source is scheduled, in hours
+SCRAPE_INITIAL_INTERVAL_HOURS = float(os.getenv("SCRAPE_INITIAL_INTERVAL_HOURS", "24"))
+
+# Bounds for the adaptive per-source interval, in hours
+SCRAPE_MIN_INTERVAL_HOURS = float(os.getenv("SCRAPE_MIN_INTERVAL_HOURS", "1"))
+SCRAPE_MAX_INTERVAL_HOURS = float(os.getenv("SCRAPE_MAX_INTERVAL_HOURS", "168"))
+
+# The interval is divided by this after a run that found new hackathons...
+SCRAPE_SPEEDUP_FACTOR = float(os.getenv("SCRAPE_SPEEDUP_FACTOR", "2"))
+
+# ...and multiplied by this after a run that found nothing
+SCRAPE_BACKOFF_FACTOR = float(os.getenv("SCRAPE_BACKOFF_FACTOR", "1.5"))
+
+# Minutes until a source whose fetch failed, timed out or was skipped by its
+# circuit breaker is tried again; its interval is left as it was
+SCRAPE_RETRY_MINUTES = int(os.getenv("SCRAPE_RETRY_MINUTES", "60"))
+
+# How long a dispatched scrape holds its source before it may be dispatched again
+SCRAPE_DISPATCH_LEASE_MINUTES = int(os.getenv("SCRAPE_DISPATCH_LEASE_MINUTES", "60"))
+
+# Attempts at a compare-and-set before giving up on a contended source
+_CAS_ATTEMPTS = 5
+
+class SourceSchedule(NamedTuple):
+    """When a source is next due and the interval it is currently scraped at"""
+    next_run: datetime
+    interval_hours: float
+
+def _key(source: str) -> str:
+    return f"scrape_schedule:{source}"
+
+def _encode(schedule: SourceSchedule) -> str:
+    return f"{schedule.next_run.isoformat()}|{schedule.interval_hours:.3f}"
+
+def _decode(value: Optional[str]) -> Optional[SourceSchedule]:
+    if not value:
+        return None
+    try:
+        next_run, interval_hours = value.split("|")
+        return SourceSchedule(datetime.fromisoformat(next_run), float(interval_hours))
+    except ValueError:
+        logger.error(f"Invalid scrape schedule value: {value}")
+        return None
+
+def next_interval(interval_hours: float, changed_count: int, outcome: str = "ok") -> float:
+    """
+    Adapt a source's interval to what its last run found.
+
+    Runs that find new or updated hackathons shrink the interval by
+    SCRAPE_SPEEDUP_FACTOR, quiet runs stretch it by SCRAPE_BACKOFF_FACTOR, so
+    busy sources converge on SCRAPE_MIN_INTERVAL_HOURS and idle ones on
+    SCRAPE_MAX_INTERVAL_HOURS. A run that did not complete says nothing about
+    how busy the source is, so it leaves the interval unchanged.
+
+    Args:
+        interval_hours: The interval the source was scraped at
+        changed_count: New and updated hackathons found by the run
+        outcome: How the fetch went: "ok", "partial", "failed" or "skipped"
+
+    Returns:
+        float: The interval for the source's following runs, in hours
+    """
+    if outcome != "ok":
+        return interval_hours
+    if changed_count > 0:
+        interval_hours /= SCRAPE_SPEEDUP_FACTOR
+    else:
+        interval_hours *= SCRAPE_BACKOFF_FACTOR
+    return min(SCRAPE_MAX_INTERVAL_HOURS, max(SCRAPE_MIN_INTERVAL_HOURS, interval_hours))
+
+def get_schedules(sources: List[str]) -> Dict[str, Optional[SourceSchedule]]:
+    """
+    Get the current schedule of each source (None for sources never scheduled).
+
+    Args:
+        sources: Source names
+
+    Returns:
+        Dict[str, Optional[SourceSchedule]]: Schedule per source
+    """
+    return {source: _decode(get_state(_key(source))) for source in sources}
+
+def claim_due_sources(sources: List[str], now: datetime = None) -> List[str]:
+    """
+    Claim the sources whose next run is due so exactly one node dispatches each.
+
+    A source that has never been scheduled is due immediately. Claiming moves
+    its next run SCRAPE_DISPATCH_LEASE_MINUTES ahead with compare-and-set, so a
+    concurrent dispatcher skips it and a scrape that dies is retried after the
+    lease. record_scrape_result() sets the real next run when the scrape ends.
+
+    Args:
+        sources: Source names
+        now: Current time, defaults to datetime.utcnow()
+
+    Returns:
+        List[str]: The sources this caller should scrape now
+    """
+    now = now or datetime.utcnow()
+    due = []
+    for source in sources:
+        raw = get_state(_key(source), use_cache=False)
+        schedule = _decode(raw)
+        if schedule and schedule.next_run > now:
+            continue
+
+        interval_hours = schedule.interval_hours if schedule else SCRAPE_INITIAL_INTERVAL_HOURS
+        lease = SourceSchedule(now + timedelta(minutes=SCRAPE_DISPATCH_LEASE_MINUTES), interval_hours)
+        if compare_and_set_state(_key(source), raw, _encode(lease)):
+            due.append(source)
+    return due
+
+def record_scrape_result(source: str, changed_count: int, outcome: str = "ok",
+                         now: datetime = None) -> Optional[SourceSchedule]:
+    """
+    Schedule a source's next run from the outcome of the run that just finished.
+
+    A completed run is followed after the adapted interval. A failed, partial or
+    skipped run keeps its interval and is retried after SCRAPE_RETRY_MINUTES
+    (or the interval, if that is shorter), so an outage doesn't push the
+    source out towards SCRAPE_MAX_INTERVAL_HOURS.
+
+    Args:
+        source: Source name
+        changed_count: New and updated hackathons stored from the run
+        outcome: How the fetch went: "ok", "partial", "failed" or "skipped"
+        now: Current time, defaults to datetime.utcnow()
+
+    Returns:
+        Optional[SourceSchedule]: The new schedule, None if the store stayed contended
+    """
+    now = now or datetime.utcnow()
+    for _ in range(_CAS_ATTEMPTS):
+        raw = get_state(_key(source), use_cache=False)
+        current = _decode(raw)
+        interval_hours = next_interval(
+            current.interval_hours if current else SCRAPE_INITIAL_INTERVAL_HOURS, changed_count, outcome
+        )
+        delay = timedelta(hours=interval_hours)
+        if outcome != "ok":
+            delay = min(delay, timedelta(minutes=SCRAPE_RETRY_MINUTES))
+        schedule = SourceSchedule(now + delay, interval_hours)
+        if compare_and_set_state(_key(source), raw, _encode(schedule)):
+            if outcome == "ok":
+                logger.info(f"{source} found {changed_count} new or updated hackathons, "
+                            f"next scrape in {interval_hours:.1f} hours")
+            else:
+                logger.info(f"{source} scrape was {outcome}, retrying at {schedule.next_run.isoformat()}")
+            return schedule
+    logger.warning(f"Could not update the scrape schedule for {source}: store is contended")
+    return None
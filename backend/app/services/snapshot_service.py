@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+import redis
+
+from app.db.database import SessionLocal
+from app.models.hackathon import HackathonModel
+from app.services.metrics_service import record_cache_lookup
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Where the upcoming-hackathons snapshot lives: redis, file or none (always query live)
+SNAPSHOT_STORE = os.getenv("SNAPSHOT_STORE", "redis" if os.getenv("REDIS_URL") else "file").lower()
+
+# Redis key prefix; the pointer lives at "<prefix>:current", each version at "<prefix>:<version>"
+SNAPSHOT_REDIS_PREFIX = os.getenv("SNAPSHOT_REDIS_PREFIX", "hackradar:snapshot:upcoming")
+
+# Directory holding the snapshot versions and pointer when SNAPSHOT_STORE=file
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "storage", "snapshots"))
+
+# Hackathons kept in the snapshot; pages beyond it are served by live queries
+SNAPSHOT_MAX_ROWS = int(os.getenv("SNAPSHOT_MAX_ROWS", "2000"))
+
+# Seconds superseded versions are kept for readers that already hold their pointer
+SNAPSHOT_RETENTION_SECONDS = int(os.getenv("SNAPSHOT_RETENTION_SECONDS", "3600"))
+
+# Seconds the API trusts the pointer it last read before checking for a new version
+SNAPSHOT_POINTER_TTL = float(os.getenv("SNAPSHOT_POINTER_TTL", "5"))
+
+class RedisSnapshotStore:
+    """Snapshot versions as Redis strings, swapped by rewriting a pointer key"""
+    name = "redis"
+
+    def __init__(self, url, prefix=SNAPSHOT_REDIS_PREFIX):
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def current_version(self):
+        version = self.client.get(f"{self.prefix}:current")
+        return version.decode() if version else None
+
+    def read(self, version):
+        return self.client.get(f"{self.prefix}:{version}")
+
+    def publish(self, version, blob):
+        previous = self.current_version()
+        pipe = self.client.pipeline(transaction=True)
+        pipe.set(f"{self.prefix}:{version}", blob)
+        pipe.set(f"{self.prefix}:current", version)
+        if previous and previous != version:
+            pipe.expire(f"{self.prefix}:{previous}", SNAPSHOT_RETENTION_SECONDS)
+        pipe.execute()
+
+class FileSnapshotStore:
+    """Snapshot versions as files, swapped by atomically replacing a pointer file"""
+    name = "file"
+
+    def __init__(self, directory=SNAPSHOT_DIR):
+        self.directory = directory
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def current_version(self):
+        try:
+            with open(self._path("upcoming.current")) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def read(self, version):
+        try:
+            with open(self._path(f"upcoming-{version}.json"), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write_atomic(self, name, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(name))
+
+    def publish(self, version, blob):
+        os.makedirs(self.directory, exist_ok=True)
+        self._write_atomic(f"upcoming-{version}.json", blob)
+        self._write_atomic("upcoming.current", version.encode())
+
+        # Drop superseded versions once readers have had time to move on
+        cutoff = time.time() - SNAPSHOT_RETENTION_SECONDS
+        for name in os.listdir(self.directory):
+            if name.startswith("upcoming-") and name != f"upcoming-{version}.json":
+                path = self._path(name)
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+
+def _create_store():
+    if SNAPSHOT_STORE == "redis" and os.getenv("REDIS_URL"):
+        return RedisSnapshotStore(os.getenv("REDIS_URL"))
+    if SNAPSHOT_STORE in ("redis", "file"):
+        if SNAPSHOT_STORE == "redis":
+            logger.warning("SNAPSHOT_STORE=redis but REDIS_URL is not set, using files")
+        return FileSnapshotStore()
+    return None
+
+# Store shared by this process, replaceable with set_store(); None disables snapshots
+store = _create_store()
+
+# The version this process has loaded: (version, items, complete) and when the pointer was last checked
+_loaded = None
+_pointer_checked_at = 0.0
+_lock = threading.Lock()
+
+def set_store(new_store):
+    """Replace the snapshot store and forget the loaded version"""
+    global store, _loaded, _pointer_checked_at
+    with _lock:
+        store = new_store
+        _loaded = None
+        _pointer_checked_at = 0.0
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+def serialize_hackathon(hackathon) -> Dict[str, Any]:
+    """A hackathon row as the JSON the /hackathons endpoint returns"""
+    data = {column.name: _json_value(getattr(hackathon, column.name)) for column in HackathonModel.__table__.columns}
+    data["themes"] = [{"id": theme.id, "key": theme.key, "name": theme.name} for theme in hackathon.themes]
+    return data
+
+def build_upcoming_snapshot() -> Optional[str]:
+    """
+    Rebuild the snapshot behind the default hackathon listing and swap it in.
+
+    Runs the default listing query (live hackathons, latest start date first)
+    once, serializes the rows, and publishes them under a version derived from
+    their content. The pointer to the current version is replaced in one step,
+    so readers see either the old or the new snapshot, never a mix. An unchanged
+    listing keeps its version and is not rewritten.
+
+    Returns:
+        Optional[str]: The current version, or None when snapshots are disabled
+    """
+    if store is None:
+        return None
+
+    db = SessionLocal()
+    try:
+        rows = db.query(HackathonModel).order_by(HackathonModel.start_date.desc()).limit(SNAPSHOT_MAX_ROWS + 1).all()
+        items = [serialize_hackathon(row) for row in rows[:SNAPSHOT_MAX_ROWS]]
+    finally:
+        db.close()
+
+    # Without the extra row the snapshot holds the whole listing, so any page can be served
+    complete = len(rows) <= SNAPSHOT_MAX_ROWS
+    body = json.dumps({"complete": complete, "items": items}, separators=(",", ":"), sort_keys=True).encode()
+    version = hashlib.sha256(body).hexdigest()[:16]
+
+    if store.current_version() == version:
+        return version
+    store.publish(version, body)
+    logger.info(f"Published upcoming hackathons snapshot {version} with {len(items)} hackathons")
+    return version
+
+def _current_snapshot():
+    """The loaded snapshot, reloading it when the pointer has moved"""
+    global _loaded, _pointer_checked_at
+    now = time.monotonic()
+    with _lock:
+        loaded = _loaded
+        if loaded and now - _pointer_checked_at < SNAPSHOT_POINTER_TTL:
+            return loaded
+
+    version = store.current_version()
+    if version and (loaded is None or loaded[0] != version):
+        blob = store.read(version)
+        if blob is None:
+            return None
+        data = json.loads(blob)
+        # Pre-encode each hackathon so a page is a byte join, not a serialization
+        items = [json.dumps(item, separators=(",", ":")).encode() for item in data["items"]]
+        loaded = (version, items, data["complete"])
+    elif not version:
+        loaded = None
+
+    with _lock:
+        _loaded = loaded
+        _pointer_checked_at = now
+    return loaded
+
+def upcoming_page(skip: int, limit: int) -> Optional[bytes]:
+    """
+    A page of the default hackathon listing as a JSON array, from the snapshot.
+
+    Args:
+        skip: Rows to skip
+        limit: Maximum rows to return
+
+    Returns:
+        Optional[bytes]: The encoded page, or None if it has to be queried live
+    """
+    if store is None or skip < 0 or limit < 0:
+        return None
+    try:
+        snapshot = _current_snapshot()
+    except Exception as e:
+        logger.warning(f"Could not read hackathon snapshot, querying live: {str(e)}")
+        snapshot = None
+
+    if snapshot is None or (not snapshot[2] and skip + limit > len(snapshot[1])):
+        record_cache_lookup("upcoming_snapshot", hit=False)
+        return None
+    record_cache_lookup("upcoming_snapshot", hit=True)
+    return b"[" + b",".join(snapshot[1][skip:skip + limit]) + b"]"
@@ -0,0 +1,112 @@
+import os
+import re
+import json
+import gzip
+import time
+import hashlib
+import tempfile
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.db.database import SessionLocal
+from app.models.hackathon import HackathonModel
+from app.services.snapshot_service import serialize_hackathon
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Directory the static snapshots are published to; serve it from a CDN or sync it to object storage
+STATIC_SNAPSHOT_DIR = os.getenv("STATIC_SNAPSHOT_DIR", os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "storage", "static"))
+
+# Seconds a shard no longer in the manifest is kept for clients holding an older manifest
+STATIC_SNAPSHOT_RETENTION_SECONDS = int(os.getenv("STATIC_SNAPSHOT_RETENTION_SECONDS", "86400"))
+
+MANIFEST_NAME = "manifest.json"
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
+
+def _write_atomic(path: str, data: bytes):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _shards(items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """The full listing plus one shard per source and per city, all latest first"""
+    shards = defaultdict(list)
+    shards["hackathons"] = items
+    for item in items:
+        shards[f"source/{_slug(item['source'])}"].append(item)
+        if item.get("city"):
+            shards[f"city/{_slug(item['city'])}"].append(item)
+    return shards
+
+def _publish_shard(directory: str, name: str, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Write one content-addressed, gzipped shard unless an identical one exists"""
+    body = json.dumps(items, separators=(",", ":"), sort_keys=True).encode()
+    digest = hashlib.sha256(body).hexdigest()
+    path = f"{name}.{digest[:16]}.json.gz"
+    full_path = os.path.join(directory, path)
+    if not os.path.exists(full_path):
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        # mtime=0 keeps the compressed bytes identical for identical content
+        _write_atomic(full_path, gzip.compress(body, compresslevel=9, mtime=0))
+    return {"path": path, "sha256": digest, "bytes": os.path.getsize(full_path), "count": len(items)}
+
+def _remove_unreferenced(directory: str, referenced: set):
+    """Delete shards that left the manifest more than the retention period ago"""
+    cutoff = time.time() - STATIC_SNAPSHOT_RETENTION_SECONDS
+    for root, _, files in os.walk(directory):
+        for file_name in files:
+            full_path = os.path.join(root, file_name)
+            path = os.path.relpath(full_path, directory).replace(os.sep, "/")
+            if path.endswith(".json.gz") and path not in referenced and os.path.getmtime(full_path) < cutoff:
+                os.remove(full_path)
+
+def publish_static_snapshots(directory: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Publish the live hackathons as static, precompressed JSON files.
+
+    Writes the full listing and one shard per source and per city. Each shard
+    is gzipped and named by the hash of its content, so a file never changes
+    once written and can be cached forever; unchanged shards are not rewritten.
+    The manifest listing the current shards, with their hashes, sizes and
+    counts, is replaced last and atomically, so clients never see a manifest
+    pointing at a shard that does not exist yet.
+
+    Args:
+        directory: Output directory, defaults to STATIC_SNAPSHOT_DIR
+
+    Returns:
+        Dict[str, Any]: The manifest that was published
+    """
+    directory = directory or STATIC_SNAPSHOT_DIR
+    os.makedirs(directory, exist_ok=True)
+
+    db = SessionLocal()
+    try:
+        rows = db.query(HackathonModel).order_by(HackathonModel.start_date.desc()).all()
+        items = [serialize_hackathon(row) for row in rows]
+    finally:
+        db.close()
+
+    shards = {name: _publish_shard(directory, name, shard_items) for name, shard_items in sorted(_shards(items).items())}
+    version = hashlib.sha256("".join(shard["sha256"] for shard in shards.values()).encode()).hexdigest()[:16]
+    manifest = {"version": version, "generated_at": datetime.utcnow().isoformat(), "shards": shards}
+    _write_atomic(os.path.join(directory, MANIFEST_NAME), json.dumps(manifest, indent=2).encode())
+
+    _remove_unreferenced(directory, {shard["path"] for shard in shards.values()})
+    logger.info(f"Published static snapshot {version}: {len(shards)} shards, {len(items)} hackathons")
+    return manifest
+
+def resolve_static_path(path: str, directory: Optional[str] = None) -> Optional[str]:
+    """The file a snapshot path refers to, None if it is missing or outside the snapshot directory"""
+    root = os.path.realpath(directory or STATIC_SNAPSHOT_DIR)
+    full_path = os.path.realpath(os.path.join(root, path))
+    if not full_path.startswith(root + os.sep) or not os.path.isfile(full_path):
+        return None
+    return full_path
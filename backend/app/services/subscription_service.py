@@ -0,0 +1,89 @@
+import os
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from firebase_admin import messaging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# How long tokens are buffered per topic before a bulk call, in seconds
+SUBSCRIBE_COALESCE_WINDOW = float(os.getenv("SUBSCRIBE_COALESCE_WINDOW", "0.05"))
+
+# Firebase accepts up to 1000 registration tokens per subscribe call
+SUBSCRIBE_MAX_BATCH = min(int(os.getenv("SUBSCRIBE_MAX_BATCH", "1000")), 1000)
+
+class CoalescingSubscriber:
+    """
+    Coalesce topic subscriptions from concurrent requests into bulk Firebase calls.
+
+    Requests add their tokens to a per-topic buffer and await a future. The buffer
+    is flushed once SUBSCRIBE_COALESCE_WINDOW has passed since its first token, or
+    straight away when it reaches SUBSCRIBE_MAX_BATCH. The blocking
+    messaging.subscribe_to_topic call runs in a thread so the event loop stays free,
+    and its per-index errors are mapped back to each caller's tokens.
+    """
+
+    def __init__(self, window: float = SUBSCRIBE_COALESCE_WINDOW, max_batch: int = SUBSCRIBE_MAX_BATCH):
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[str, List[Tuple[str, asyncio.Future]]] = defaultdict(list)
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks = set()  # Keeps in-flight sends referenced until they finish
+
+    async def subscribe(self, tokens: List[str], topic: str) -> Dict[str, str]:
+        """
+        Subscribe tokens to a topic together with other concurrent requests.
+
+        Args:
+            tokens: Device registration tokens
+            topic: The FCM topic
+
+        Returns:
+            Dict[str, str]: Error reason per token, None for tokens that succeeded
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        for token in tokens:
+            future = loop.create_future()
+            self._pending[topic].append((token, future))
+            futures.append(future)
+
+            if len(self._pending[topic]) >= self.max_batch:
+                self._flush(topic)
+            elif topic not in self._timers:
+                self._timers[topic] = loop.call_later(self.window, self._flush, topic)
+
+        errors = await asyncio.gather(*futures)
+        return dict(zip(tokens, errors))
+
+    def _flush(self, topic: str):
+        timer = self._timers.pop(topic, None)
+        if timer:
+            timer.cancel()
+        batch = self._pending.pop(topic, [])
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._send(topic, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, topic: str, batch: List[Tuple[str, asyncio.Future]]):
+        tokens = [token for token, _ in batch]
+        try:
+            response = await asyncio.get_running_loop().run_in_executor(
+                None, messaging.subscribe_to_topic, tokens, topic
+            )
+            errors = {error.index: error.reason for error in response.errors}
+            logger.info(f"Subscribed {response.success_count}/{len(tokens)} tokens to {topic}")
+        except Exception as e:
+            logger.error(f"Error subscribing {len(tokens)} tokens to {topic}: {str(e)}")
+            errors = {index: str(e) for index in range(len(tokens))}
+
+        for index, (_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result(errors.get(index))
+
+# Shared by all requests in this process
+subscriber = CoalescingSubscriber()
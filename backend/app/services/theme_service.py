@@ -0,0 +1,75 @@
+import re
+import logging
+from typing import Dict, Iterable, List
+
+from sqlalchemy.exc import IntegrityError
+
+from app.models.theme import ThemeModel
+from app.services.preference_matching_service import normalize_theme
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Longest key or name the themes table stores
+_MAX_THEME_LENGTH = 100
+
+def theme_keys(themes: Iterable[str]) -> Dict[str, str]:
+    """
+    Lookup keys for a hackathon's scraped themes, mapped to display names.
+
+    Uses the same splitting as notification preferences, so a hackathon tagged
+    "Machine Learning/AI" is linked to "machine learning/ai", "machine learning"
+    and "ai", and a filter for "AI" finds it.
+
+    Args:
+        themes: Theme names as scraped
+
+    Returns:
+        Dict[str, str]: Theme key -> display name
+    """
+    keys = {}
+    for theme in themes or []:
+        theme = re.sub(r"\s+", " ", theme or "").strip()
+        if not theme:
+            continue
+        names = {part.strip().lower(): part.strip() for part in [theme] + re.split(r"[/&,]", theme)}
+        for key in normalize_theme(theme):
+            keys.setdefault(key[:_MAX_THEME_LENGTH], names.get(key, key)[:_MAX_THEME_LENGTH])
+    return keys
+
+def get_or_create_themes(db, names_by_key: Dict[str, str]) -> Dict[str, ThemeModel]:
+    """
+    Load the themes with the given keys, inserting the ones that don't exist yet.
+
+    New themes are committed one by one so a concurrent persist task inserting
+    the same theme only costs a retry of the lookup, not the whole batch.
+
+    Args:
+        db: Database session
+        names_by_key: Theme key -> display name, as returned by theme_keys
+
+    Returns:
+        Dict[str, ThemeModel]: Theme key -> stored theme
+    """
+    if not names_by_key:
+        return {}
+
+    keys = list(names_by_key)
+    themes = {theme.key: theme for theme in db.query(ThemeModel).filter(ThemeModel.key.in_(keys))}
+    for key in keys:
+        if key in themes:
+            continue
+        try:
+            theme = ThemeModel(key=key, name=names_by_key[key])
+            db.add(theme)
+            db.commit()
+        except IntegrityError:
+            # Another worker inserted it first
+            db.rollback()
+            theme = db.query(ThemeModel).filter(ThemeModel.key == key).one()
+        themes[key] = theme
+    return themes
+
+def themes_for(themes_by_key: Dict[str, ThemeModel], themes: Iterable[str]) -> List[ThemeModel]:
+    """The stored themes a hackathon with these scraped themes links to"""
+    return [themes_by_key[key] for key in theme_keys(themes) if key in themes_by_key]
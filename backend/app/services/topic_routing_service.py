@@ -0,0 +1,99 @@
+import os
+import re
+import logging
+from collections import defaultdict
+from typing import List, Dict, NamedTuple
+
+from app.models.hackathon_record import HackathonRecord
+from app.services.location_service import normalize_location
+
+logger = logging.getLogger(__name__)
+
+# Gazetteer cities that get their own "<city>_hackathons" topic
+NOTIFICATION_CITIES = [
+    "Mumbai", "Delhi", "Bangalore", "Hyderabad", "Chennai", "Kolkata",
+    "Pune", "Ahmedabad", "Jaipur", "Surat", "Lucknow", "Kanpur",
+    "Nagpur", "Indore", "Thane", "Bhopal", "Visakhapatnam", "Patna",
+    "Vadodara", "Ghaziabad", "Ludhiana", "Agra", "Nashik", "Ranchi",
+    "Faridabad", "Coimbatore", "Gurgaon", "Noida", "Kochi", "Chandigarh",
+    "New York", "San Francisco", "London", "Berlin", "Toronto", "Singapore",
+    "Sydney", "Tokyo", "Paris", "Amsterdam", "Chicago", "Seattle"
+]
+
+# Kinds of topics to route to: city, online and/or source
+TOPIC_KINDS = [kind.strip() for kind in os.getenv("NOTIFICATION_TOPIC_KINDS", "city,online,source").split(",") if kind.strip()]
+
+class Topic(NamedTuple):
+    """An FCM topic a hackathon can be routed to"""
+    name: str
+    kind: str
+    label: str
+
+ONLINE_TOPIC = Topic("online_hackathons", "online", "Online")
+
+def _topic_name(label: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", label.lower()).strip("_") + "_hackathons"
+
+# Topic per city, precomputed once
+CITY_TOPICS = {city: Topic(_topic_name(city), "city", city) for city in NOTIFICATION_CITIES}
+
+def location_topics(location: str) -> List[Topic]:
+    """
+    Find the city and online topics for a location string.
+
+    The location is normalized by location_service.normalize_location, the same
+    way the stored city and is_online columns are, so a hackathon is announced
+    on the topic of the city it is listed under.
+
+    Args:
+        location: The hackathon's location string
+
+    Returns:
+        List[Topic]: Matching topics without duplicates
+    """
+    info = normalize_location(location)
+    topics = []
+    if info.city in CITY_TOPICS:
+        topics.append(CITY_TOPICS[info.city])
+    if info.is_online:
+        topics.append(ONLINE_TOPIC)
+    return topics
+
+def hackathon_topics(hackathon: HackathonRecord, kinds: List[str] = None) -> List[Topic]:
+    """
+    Get every topic a hackathon should be announced on.
+
+    Args:
+        hackathon: The hackathon to route
+        kinds: Topic kinds to include, defaults to TOPIC_KINDS
+
+    Returns:
+        List[Topic]: The topics for this hackathon
+    """
+    kinds = TOPIC_KINDS if kinds is None else kinds
+    topics = [topic for topic in location_topics(hackathon.location) if topic.kind in kinds]
+
+    source = hackathon.source
+    if source and "source" in kinds:
+        topics.append(Topic(_topic_name(source), "source", source))
+
+    return topics
+
+def route_hackathons(hackathons: List[HackathonRecord], kinds: List[str] = None) -> Dict[Topic, List[HackathonRecord]]:
+    """
+    Group new hackathons by the topics they should be announced on.
+
+    One pass over the hackathons; each one can land in several topics.
+
+    Args:
+        hackathons: New hackathons
+        kinds: Topic kinds to include, defaults to TOPIC_KINDS
+
+    Returns:
+        Dict[Topic, List[HackathonRecord]]: Hackathons per topic, in input order
+    """
+    routed = defaultdict(list)
+    for hackathon in hackathons:
+        for topic in hackathon_topics(hackathon, kinds):
+            routed[topic].append(hackathon)
+    return dict(routed)
@@ -1,5 +1,7 @@
 from celery import Celery
+from celery.signals import before_task_publish
 import os
+import time
 import logging
 from ssl import CERT_NONE, CERT_REQUIRED
 from dotenv import load_dotenv
@@ -85,12 +87,35 @@ celery_config = {
     'beat_scheduler': 'celery.beat.PersistentScheduler',
     # Schedule periodic tasks
     'beat_schedule': {
-        'scrape-hackathons-every-24-hours': {
-            'task': 'app.services.hackathon_service.scrape_all_sources',
-            'schedule': 86400.0,  # Every 24 hours
-            'options': {'expires': 86400 * 2}  # Task expires after 48 hours
+        'dispatch-due-source-scrapes-every-15-minutes': {
+            'task': 'app.services.hackathon_service.dispatch_due_scrapes',
+            'schedule': 900.0,  # Each source has its own adaptive interval, see scrape_schedule_service
+            'options': {'expires': 900}
+        },
+        'drain-notification-outbox-every-5-minutes': {
+            'task': 'app.services.hackathon_service.drain_notification_outbox',
+            'schedule': 300.0,  # Picks up retries and anything a crashed worker left behind
+            'options': {'expires': 300}
+        },
+        'schedule-hackathon-reminders-every-15-minutes': {
+            'task': 'app.services.hackathon_service.schedule_hackathon_reminders',
+            'schedule': 900.0,  # Reminders go out within 15 minutes of their window opening
+            'options': {'expires': 900}
+        },
+        'archive-ended-hackathons-daily': {
+            'task': 'app.services.hackathon_service.archive_hackathons',
+            'schedule': 86400.0,  # Keeps the live hackathons table to current events
+            'options': {'expires': 3600}
         },
     },
+    # Fetch tasks only wait on the network and run on a high-concurrency thread pool
+    # ("fetch" queue); everything that touches the database runs on a small
+    # prefork pool ("persist" queue), so network concurrency doesn't add DB connections
+    'task_default_queue': 'persist',
+    'task_routes': {
+        'app.services.hackathon_service.fetch_source': {'queue': 'fetch'},
+        'app.services.hackathon_service.persist_source': {'queue': 'persist'},
+    },
     # Important: include modules with tasks to ensure they're found
     'imports': [
         'app.services.hackathon_service',
@@ -104,10 +129,17 @@ if broker_ssl_options:
 
 celery_app.conf.update(**celery_config)
 
+# Stamp every task with its publish time so the run_celery.py supervisor can see
+# how long the oldest queued task has been waiting
+@before_task_publish.connect
+def _stamp_sent_time(headers=None, **kwargs):
+    if headers is not None:
+        headers["sent_at"] = time.time()
+
 # Only log configuration during startup if requested
 if os.environ.get("SHOW_STARTUP_LOGS", "true").lower() == "true":
     logger.info(f"Celery broker configured")
-    logger.info(f"Celery beat schedule configured for scraping every 24 hours")
+    logger.info(f"Celery beat schedule configured for adaptive per-source scraping")
 
 # Import tasks AFTER creating Celery app to avoid circular imports
 # Force import the tasks to ensure they're registered
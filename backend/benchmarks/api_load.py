@@ -0,0 +1,166 @@
+"""
+Load driver for the hackathon listing.
+
+Runs a weighted mix of typical listing queries and reports p50/p95/p99 latency and
+throughput per query and overall. Two targets are supported:
+
+    # A running API (uvicorn app.main:app)
+    python -m benchmarks.api_load --url http://localhost:8000 --concurrency 8 --duration 30
+
+    # get_hackathons() in-process, isolating the database from HTTP overhead
+    python -m benchmarks.api_load --direct --database-url sqlite:////tmp/hackradar-load.db
+
+Seed the table first with benchmarks.seed_hackathons. Results can be written as
+JSON with --output so runs can be diffed.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# name -> (weight, query parameters)
+QUERY_MIX = {
+    "default": (40, {}),
+    "location_mumbai": (20, {"location": "Mumbai"}),
+    "location_online": (10, {"location": "Online"}),
+    "source_devpost": (10, {"source": "Devpost"}),
+    "location_and_source": (10, {"location": "Mumbai", "source": "Unstop"}),
+    "deep_page": (10, {"skip": 5000, "limit": 100}),
+    "theme_ai": (5, {"theme": ["AI"]}),
+    "min_prize": (5, {"min_prize_inr": 500000}),
+    "radius_mumbai": (5, {"lat": 19.076, "lon": 72.8777, "radius_km": 50}),
+    "canonical_only": (5, {"canonical_only": True}),
+}
+
+# Query parameters whose get_hackathons() argument has another name
+DIRECT_PARAMS = {"lat": "latitude", "lon": "longitude", "theme": "themes"}
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def summarize(latencies, elapsed, errors=0):
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3) if ordered else None,
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3) if ordered else None,
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3) if ordered else None,
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else None,
+    }
+
+def http_runner(base_url):
+    """Build a callable issuing one listing request over HTTP"""
+    import requests
+
+    local = threading.local()
+
+    def run(params):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        response = session.get(f"{base_url}/api/hackathons", params=params, timeout=30)
+        response.raise_for_status()
+        response.content
+    return run
+
+def direct_runner():
+    """Build a callable running get_hackathons() against the configured database"""
+    from app.db.database import SessionLocal
+    from app.services.hackathon_service import get_hackathons
+
+    def run(params):
+        db = SessionLocal()
+        try:
+            get_hackathons(db, **{DIRECT_PARAMS.get(key, key): value for key, value in params.items()})
+        finally:
+            db.close()
+    return run
+
+def run_load(run, mix, concurrency, duration, seed_value=7):
+    """Drive the runner from a thread pool for a fixed duration"""
+    names = list(mix)
+    weights = [mix[name][0] for name in names]
+    results = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(worker_id):
+        rng = random.Random(seed_value + worker_id)
+        local_results = {name: [] for name in names}
+        local_errors = {name: 0 for name in names}
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                run(mix[name][1])
+                local_results[name].append(time.perf_counter() - start)
+            except Exception:
+                local_errors[name] += 1
+        with lock:
+            for name in names:
+                results[name].extend(local_results[name])
+                errors[name] += local_errors[name]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    report = {name: summarize(results[name], elapsed, errors[name]) for name in names}
+    report["overall"] = summarize([value for name in names for value in results[name]],
+                                  elapsed, sum(errors.values()))
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Listing load benchmark")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running API")
+    target.add_argument("--direct", action="store_true", help="Call get_hackathons() in-process")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="Database for --direct")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    if args.direct:
+        from benchmarks.scrapers import prepare_database
+        prepare_database(args.database_url)
+        run = direct_runner()
+    else:
+        run = http_runner(args.url.rstrip("/"))
+
+    report = {
+        "config": {
+            "target": "direct" if args.direct else args.url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "mix": {name: {"weight": weight, "params": params} for name, (weight, params) in QUERY_MIX.items()},
+        },
+        "results": run_load(run, QUERY_MIX, args.concurrency, args.duration),
+    }
+
+    print(f"{'query':<22} {'requests':>9} {'errors':>7} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, row in report["results"].items():
+        print(f"{name:<22} {row['requests']:>9} {row['errors']:>7} {row['throughput_rps'] or 0:>9.1f} "
+              f"{row['p50_ms'] or 0:>9.2f} {row['p95_ms'] or 0:>9.2f} {row['p99_ms'] or 0:>9.2f}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Local FCM stand-in for the notification HttpTransport.
+
+Accepts POST /v1/batch with {"messages": [...]} and answers one result per
+message. Latency and errors can be injected:
+
+    --latency / --jitter   seconds added to every batch request
+    --error-rate           fraction of messages answered with an UNAVAILABLE error
+    --fail-rate            fraction of batch requests answered with HTTP 503
+
+Run it standalone and point the app at it with
+NOTIFICATION_TRANSPORT=http FCM_STANDIN_URL=http://127.0.0.1:8765:
+
+    cd backend
+    python -m benchmarks.fake_fcm --port 8765 --latency 0.08
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeFCMServer:
+    """Threaded HTTP server imitating the FCM batch send endpoint"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, fail_rate=0.0, seed_value=11):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.fail_rate = fail_rate
+        self.stats = Counter()
+        self.topics = Counter()
+        self._rng = random.Random(seed_value)
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path != "/v1/batch":
+                    return self._reply(404, {"error": "unknown endpoint"})
+
+                messages = json.loads(body).get("messages", [])
+                with fake._lock:
+                    delay = fake.latency + fake._rng.uniform(0, fake.jitter)
+                    fail_request = fake._rng.random() < fake.fail_rate
+                    failures = [fake._rng.random() < fake.error_rate for _ in messages]
+                    fake.stats["requests"] += 1
+                    fake.stats["messages"] += len(messages)
+                    for message in messages:
+                        fake.topics[message.get("topic") or "token"] += 1
+
+                if delay:
+                    time.sleep(delay)
+
+                if fail_request:
+                    with fake._lock:
+                        fake.stats["failed_requests"] += 1
+                    return self._reply(503, {"error": "UNAVAILABLE"})
+
+                results = []
+                for failed in failures:
+                    if failed:
+                        results.append({"success": False, "message_id": None, "error": "UNAVAILABLE"})
+                    else:
+                        results.append({"success": True, "message_id": f"projects/fake/messages/{uuid.uuid4().hex}",
+                                        "error": None})
+                with fake._lock:
+                    fake.stats["failed_messages"] += sum(failures)
+                self._reply(200, {"results": results})
+
+            def _reply(self, status, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local FCM stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    server = FakeFCMServer(args.host, args.port, args.latency, args.jitter, args.error_rate, args.fail_rate)
+    print(f"Fake FCM listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(dict(server.stats))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Throughput benchmark for the new-hackathon notification pipeline.
+
+Generates thousands of new hackathons spread over the notification cities,
+optionally seeds stored subscriber preferences, builds every topic and
+preference notification and sends them through the HttpTransport to the local
+FCM stand-in (benchmarks/fake_fcm.py). Reports messages per second and the
+p50/p95/p99 latency of batch sends:
+
+    cd backend
+    python -m benchmarks.notifications --hackathons 5000 --subscribers 20000 --latency 0.08
+
+FCM_BATCH_SIZE and FCM_MAX_CONCURRENT_BATCHES are read from the environment as
+in production, so runs can be compared across settings.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+from benchmarks.api_load import percentile
+from benchmarks.scrapers import prepare_database
+from benchmarks.seed_hackathons import SOURCES, THEMES, NAME_WORDS
+
+class TimedTransport:
+    """Wrap a transport and record the wall time of every batch"""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.name = inner.name
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def is_ready(self):
+        return self.inner.is_ready()
+
+    def send_batch(self, batch):
+        start = time.perf_counter()
+        try:
+            return self.inner.send_batch(batch)
+        finally:
+            with self._lock:
+                self.latencies.append(time.perf_counter() - start)
+
+def make_hackathons(count, cities, rng):
+    """New hackathon records shaped like the scrapers' output"""
+    from app.models.hackathon_record import HackathonRecord
+
+    hackathons = []
+    for index in range(count):
+        source = rng.choice(SOURCES)
+        roll = rng.random()
+        if roll < 0.3:
+            location = "Online"
+        elif roll < 0.45:
+            location = f"Online | {rng.choice(cities)}"
+        else:
+            location = f"{rng.choice(cities)}, India"
+        hackathons.append(HackathonRecord(
+            name=f"{rng.choice(NAME_WORDS)}{rng.choice(NAME_WORDS)} {index}",
+            description=None,
+            start_date=None,
+            end_date=None,
+            location=location,
+            registration_link=f"https://example.com/{source.lower()}/{index}",
+            source=source,
+            themes=tuple(rng.sample(THEMES, rng.randint(1, 3))),
+            has_prize=rng.random() < 0.6,
+            id=index + 1,
+        ))
+    return hackathons
+
+def seed_preferences(count, cities, rng, batch_size=5000):
+    """Insert synthetic subscriber preferences with a mix of narrow and broad rules"""
+    from app.db.database import engine
+    from app.models.notification_preference import NotificationPreferenceModel
+
+    with engine.begin() as connection:
+        for offset in range(0, count, batch_size):
+            rows = []
+            for index in range(offset, min(count, offset + batch_size)):
+                rows.append({
+                    "token": f"bench-token-{index}",
+                    "cities": rng.sample(cities, rng.randint(1, 2)) if rng.random() < 0.7 else [],
+                    "themes": rng.sample(THEMES, 1) if rng.random() < 0.5 else [],
+                    "sources": [rng.choice(SOURCES)] if rng.random() < 0.3 else [],
+                    "mode": rng.choice(["any", "any", "online", "offline"]),
+                    "require_prize": rng.random() < 0.2,
+                })
+            connection.execute(NotificationPreferenceModel.__table__.insert(), rows)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Notification pipeline benchmark")
+    parser.add_argument("--hackathons", type=int, default=2000, help="New hackathons to notify about")
+    parser.add_argument("--cities", type=int, default=30, help="Notification cities the hackathons are spread over")
+    parser.add_argument("--subscribers", type=int, default=0, help="Stored preference rules to seed")
+    parser.add_argument("--latency", type=float, default=0.05, help="Injected latency per batch request in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Extra random latency per batch request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of messages answered with an error")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of batch requests answered with 503")
+    parser.add_argument("--database-url", help="Scratch database URL (default: fresh SQLite)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        prepare_database(args.database_url or f"sqlite:///{os.path.join(tmp_dir, 'notifications.db')}")
+
+        from benchmarks.fake_fcm import FakeFCMServer
+        from app.services import notification_service
+        from app.services.topic_routing_service import NOTIFICATION_CITIES
+
+        rng = random.Random(args.seed)
+        cities = NOTIFICATION_CITIES[:args.cities]
+        if args.subscribers:
+            seed_preferences(args.subscribers, cities, rng)
+        hackathons = make_hackathons(args.hackathons, cities, rng)
+
+        server = FakeFCMServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                               fail_rate=args.fail_rate).start()
+        timed = TimedTransport(notification_service.HttpTransport(server.url))
+        notification_service.set_transport(timed)
+
+        try:
+            start = time.perf_counter()
+            messages = notification_service.build_notification_messages(hackathons)
+            build_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = notification_service.send_notifications(messages)
+            send_time = time.perf_counter() - start
+        finally:
+            server.stop()
+
+    failures = sum(1 for result in results if not result.success)
+    latencies = sorted(timed.latencies)
+    report = {
+        "config": {
+            "hackathons": args.hackathons,
+            "cities": len(cities),
+            "subscribers": args.subscribers,
+            "latency_s": args.latency,
+            "jitter_s": args.jitter,
+            "error_rate": args.error_rate,
+            "fail_rate": args.fail_rate,
+            "batch_size": notification_service.FCM_BATCH_SIZE,
+            "max_concurrent_batches": notification_service.FCM_MAX_CONCURRENT_BATCHES,
+        },
+        "results": {
+            "messages": len(messages),
+            "topics": len([topic for topic in server.topics if topic != "token"]),
+            "batches": len(latencies),
+            "failures": failures,
+            "build_time_s": round(build_time, 4),
+            "send_time_s": round(send_time, 4),
+            "messages_per_s": round(len(messages) / send_time, 1) if send_time else None,
+            "batch_p50_ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+            "batch_p95_ms": round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+            "batch_p99_ms": round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        },
+    }
+
+    row = report["results"]
+    print(f"{row['messages']} messages to {row['topics']} topics and device tokens in {row['batches']} batches "
+          f"({row['failures']} failed)")
+    print(f"build {row['build_time_s']:.3f}s, send {row['send_time_s']:.3f}s, {row['messages_per_s']} msg/s")
+    print(f"batch latency p50 {row['batch_p50_ms']} ms, p95 {row['batch_p95_ms']} ms, p99 {row['batch_p99_ms']} ms")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Offline benchmark for scrape_devpost, scrape_unstop and scrape_devfolio.
+
+Each source runs in its own process against the local stub server so peak RSS is
+attributable to that source. Results are printed as a table and can be written
+as JSON for diffing between runs:
+
+    cd backend
+    python -m benchmarks.scrapers --pages 5 --latency 0.05 --output storage/benchmarks/base.json
+
+By default every run uses a fresh SQLite database. Pass --database-url to run
+against a local Postgres scratch database instead (its tables are created if
+missing and are never truncated).
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+SOURCES = {
+    "Devpost": ("app.scrapers.devpost_scraper", "scrape_devpost"),
+    "Unstop": ("app.scrapers.unstop_scraper", "scrape_unstop"),
+    "Devfolio": ("app.scrapers.devfolio_scraper", "scrape_devfolio"),
+}
+
+def prepare_database(database_url):
+    """Point the app at the benchmark database and create the tables
+
+    SQLite has no "public" schema, so one is attached to every connection.
+    """
+    os.environ["DATABASE_URL"] = database_url
+
+    from sqlalchemy import event
+    from app.db import database
+
+    if database_url.startswith("sqlite"):
+        public_path = database_url.replace("sqlite:///", "") + ".public"
+
+        @event.listens_for(database.engine, "connect")
+        def _attach_public_schema(dbapi_connection, connection_record):
+            dbapi_connection.execute(f"ATTACH DATABASE '{public_path}' AS public")
+
+    from app.db.init_db import init_db
+    init_db()
+    return database.engine
+
+def run_source(source, stub_url, database_url, results):
+    """Run one scraper in the current (child) process and record its numbers"""
+    import importlib
+    from sqlalchemy import event
+    from benchmarks.stub_server import increment, redirect_requests
+
+    engine = prepare_database(database_url)
+    counter = {"requests": 0, "statements": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_statement(conn, cursor, statement, parameters, context, executemany):
+        increment(counter, "statements")
+
+    redirect_requests(stub_url, counter)
+    module_name, function_name = SOURCES[source]
+    scrape = getattr(importlib.import_module(module_name), function_name)
+
+    counter["statements"] = 0
+    start = time.perf_counter()
+    new_hackathons = scrape() or []
+    wall_time = time.perf_counter() - start
+
+    results[source] = {
+        "wall_time_s": round(wall_time, 4),
+        "requests": counter["requests"],
+        "db_statements": counter["statements"],
+        "new_hackathons": len(new_hackathons),
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline scraper benchmark")
+    parser.add_argument("--sources", nargs="+", default=list(SOURCES), choices=list(SOURCES))
+    parser.add_argument("--pages", type=int, default=3, help="Pages served for paginated sources")
+    parser.add_argument("--per-page", type=int, default=9, help="Devpost entries per page")
+    parser.add_argument("--devfolio-count", type=int, default=12, help="Devfolio open hackathons")
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected latency per request in seconds")
+    parser.add_argument("--database-url", help="Scratch database URL (default: fresh SQLite per source)")
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    from benchmarks.stub_server import StubPlatforms, StubServer
+
+    platforms = StubPlatforms(pages=args.pages, per_page=args.per_page, devfolio_count=args.devfolio_count)
+    server = StubServer(platforms, latency=args.latency).start()
+
+    context = multiprocessing.get_context("spawn")
+    manager = context.Manager()
+    results = manager.dict()
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for source in args.sources:
+                database_url = args.database_url or f"sqlite:///{os.path.join(tmp_dir, source.lower() + '.db')}"
+                process = context.Process(target=run_source, args=(source, server.url, database_url, results))
+                process.start()
+                process.join()
+                if process.exitcode != 0:
+                    print(f"{source} benchmark failed with exit code {process.exitcode}", file=sys.stderr)
+    finally:
+        server.stop()
+
+    report = {
+        "config": {
+            "pages": args.pages,
+            "per_page": args.per_page,
+            "devfolio_count": args.devfolio_count,
+            "latency_s": args.latency,
+            "database": "postgres" if args.database_url else "sqlite",
+        },
+        "results": dict(results),
+    }
+    manager.shutdown()
+
+    print(f"{'source':<10} {'wall (s)':>10} {'requests':>9} {'db stmts':>9} {'new':>5} {'peak RSS (MB)':>14}")
+    for source, row in report["results"].items():
+        print(f"{source:<10} {row['wall_time_s']:>10.3f} {row['requests']:>9} {row['db_statements']:>9} "
+              f"{row['new_hackathons']:>5} {row['peak_rss_mb']:>14.1f}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Fill the hackathons table with realistic synthetic rows for load testing.
+
+Rows mix the three sources, Online / city / "Online | City" locations (weighted
+towards Mumbai and Online like production), and start dates spread around today.
+They carry the structured columns the listing filters on: normalized location
+and coordinates, theme links, prize_inr, organizer, and canonical_id, with a
+share of rows listed again on a second source as a cross-source duplicate.
+
+    cd backend
+    python -m benchmarks.seed_hackathons --rows 50000 --database-url sqlite:////tmp/hackradar-load.db
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.services.location_service import location_columns
+from app.services.prize_service import to_inr
+
+SOURCES = ["Devpost", "Unstop", "Devfolio"]
+
+CITIES = [
+    "Mumbai", "Delhi", "Bangalore", "Hyderabad", "Chennai", "Kolkata", "Pune", "Ahmedabad",
+    "Jaipur", "Lucknow", "Nagpur", "Indore", "Thane", "Kochi", "Chandigarh", "Noida",
+    "New York", "San Francisco", "London", "Berlin", "Toronto", "Singapore",
+]
+
+THEMES = ["Machine Learning/AI", "Web3", "Fintech", "Health", "Social Good", "IoT", "Open Ended", "Education"]
+
+ORGANIZERS = ["MLH", "Devfolio", "IIT Bombay", "Google Developer Groups", "Polygon", "Microsoft", None]
+
+# Share of rows that repeat an earlier row's event on another source
+DUPLICATE_SHARE = 0.1
+
+NAME_WORDS = ["Hack", "Build", "Code", "Innovate", "Sprint", "Summit", "Jam", "Quest", "Forge", "Launch"]
+
+def make_location(rng):
+    """Pick a location string in the formats the scrapers produce"""
+    roll = rng.random()
+    if roll < 0.35:
+        return "Online"
+    if roll < 0.55:
+        return "Mumbai" if rng.random() < 0.6 else "Mumbai, Maharashtra, India"
+    city = rng.choice(CITIES)
+    if roll < 0.65:
+        return f"Online | {city}"
+    return city if rng.random() < 0.5 else f"{city}, India"
+
+def make_row(rng, hackathon_id, now):
+    source = rng.choice(SOURCES)
+    start_date = now + timedelta(days=rng.randint(-365, 180), hours=rng.randint(0, 23))
+    end_date = start_date + timedelta(days=rng.choice([1, 2, 3, 7, 14, 30]))
+    themes = rng.sample(THEMES, rng.randint(1, 3))
+    prize_usd = rng.randint(1, 50) * 500 if rng.random() < 0.8 else None
+    row = {
+        "id": hackathon_id,
+        "name": f"{rng.choice(NAME_WORDS)}{rng.choice(NAME_WORDS)} {hackathon_id}",
+        "description": f"Themes: {', '.join(themes)}" + (f" | Prize: ${prize_usd}" if prize_usd else ""),
+        "start_date": start_date,
+        "end_date": end_date,
+        "location": make_location(rng),
+        "registration_link": f"https://example.com/{source.lower()}/{hackathon_id}",
+        "source": source,
+        "image_url": None,
+        "organizer": rng.choice(ORGANIZERS),
+        "prize_inr": to_inr(prize_usd, "USD") if prize_usd else None,
+        "canonical_id": hackathon_id,
+    }
+    row.update(location_columns(row["location"]))
+    return row, themes
+
+def make_duplicate(rng, original, hackathon_id):
+    """List an earlier row's event again on another source, linked to it by canonical_id"""
+    source = rng.choice([s for s in SOURCES if s != original["source"]])
+    return dict(
+        original,
+        id=hackathon_id,
+        source=source,
+        registration_link=f"https://example.com/{source.lower()}/{hackathon_id}",
+        canonical_id=original["canonical_id"],
+    )
+
+def seed(rows, batch_size=5000, seed_value=42):
+    """Insert synthetic hackathons and their theme links in batches
+
+    Args:
+        rows: Number of rows to insert
+        batch_size: Rows per INSERT batch
+        seed_value: Random seed so datasets are reproducible
+
+    Returns:
+        float: Seconds spent inserting
+    """
+    from sqlalchemy import func
+
+    from app.db.database import SessionLocal
+    from app.models.hackathon import HackathonModel, ArchivedHackathonModel
+    from app.models.theme import hackathon_themes
+    from app.services.theme_service import theme_keys, get_or_create_themes
+
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        theme_ids = {key: theme.id for key, theme in get_or_create_themes(db, theme_keys(THEMES)).items()}
+        # Ids are assigned here so theme links can be inserted in the same batch
+        first_id = max(db.query(func.max(model.id)).scalar() or 0
+                       for model in (HackathonModel, ArchivedHackathonModel)) + 1
+
+        for offset in range(0, rows, batch_size):
+            batch, links = [], []
+            for hackathon_id in range(first_id + offset, first_id + min(offset + batch_size, rows)):
+                if batch and rng.random() < DUPLICATE_SHARE:
+                    row = make_duplicate(rng, rng.choice(batch), hackathon_id)
+                    themes = [link["theme_id"] for link in links if link["hackathon_id"] == row["canonical_id"]]
+                else:
+                    row, names = make_row(rng, hackathon_id, now)
+                    themes = {theme_ids[key] for key in theme_keys(names)}
+                batch.append(row)
+                links.extend({"theme_id": theme_id, "hackathon_id": hackathon_id} for theme_id in themes)
+            db.execute(HackathonModel.__table__.insert(), batch)
+            db.execute(hackathon_themes.insert(), links)
+            db.commit()
+    finally:
+        db.close()
+    return time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed synthetic hackathons")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    args = parser.parse_args(argv)
+
+    from benchmarks.scrapers import prepare_database
+
+    prepare_database(args.database_url)
+    elapsed = seed(args.rows, args.batch_size, args.seed)
+    print(f"Inserted {args.rows} hackathons in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
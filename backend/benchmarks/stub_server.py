@@ -0,0 +1,161 @@
+"""
+Local stand-in for the Devpost, Unstop and Devfolio endpoints used by the scrapers.
+
+Responses are built from the recorded samples in benchmarks/fixtures. Each page is
+filled by cycling through the recorded entries and giving them unique names, so a
+run against a fresh database inserts every row. Latency and page counts are
+configurable so scraper changes can be compared on a repeatable baseline.
+
+Requests reach the server through `redirect_requests()`, which rewrites
+"https://<host>/<path>" to "http://127.0.0.1:<port>/<host>/<path>" for every call
+made with the requests library.
+"""
+import copy
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import requests
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Guards benchmark counters, which are bumped from scraper worker threads
+_counter_lock = threading.Lock()
+
+DEVFOLIO_LOCATIONS = ["Mumbai, India", "Bengaluru, India", "Pune, Maharashtra, India", "New Delhi, India"]
+
+def _load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+        if name.endswith(".json"):
+            return json.load(f)
+        return f.read()
+
+def _fill_page(entries, count, page, name_key):
+    """Cycle through recorded entries to build a page of uniquely named items"""
+    items = []
+    for i in range(count):
+        item = copy.deepcopy(entries[i % len(entries)])
+        item[name_key] = f"{item[name_key]} [{page}-{i}]"
+        if "slug" in item:
+            item["slug"] = f"{item['slug']}-{page}-{i}"
+        items.append(item)
+    return items
+
+class StubPlatforms:
+    """Builds platform responses from the recorded fixtures"""
+
+    def __init__(self, pages=3, per_page=9, devfolio_count=12):
+        self.pages = pages
+        self.per_page = per_page
+        self.devfolio_count = devfolio_count
+        self.devpost = _load_fixture("devpost_hackathons.json")
+        self.unstop = _load_fixture("unstop_hackathons.json")
+        self.unstop_cities = _load_fixture("unstop_cities.json")
+        self.devfolio = _load_fixture("devfolio_hackathons.json")
+        self.devfolio_detail = _load_fixture("devfolio_detail.html")
+
+    def respond(self, host, path, query):
+        """Return (status, content type, body) for a rewritten request"""
+        page = int(query.get("page", ["1"])[0])
+
+        if host == "devpost.com" and path.startswith("/api/hackathons"):
+            entries = self.devpost["hackathons"]
+            hackathons = _fill_page(entries, self.per_page, page, "title") if page <= self.pages else []
+            body = {"hackathons": hackathons,
+                    "meta": {"total_count": self.pages * self.per_page, "per_page": self.per_page}}
+            return 200, "application/json", json.dumps(body)
+
+        if host == "unstop.com" and path == "/api/public/city-name":
+            return 200, "application/json", json.dumps(self.unstop_cities)
+
+        if host == "unstop.com" and path.startswith("/api/public/opportunity/search-result"):
+            per_page = int(query.get("per_page", [str(self.per_page)])[0])
+            entries = self.unstop["data"]["data"]
+            data = _fill_page(entries, per_page, page, "title") if page <= self.pages else []
+            body = {"data": {"current_page": page, "last_page": self.pages, "per_page": per_page, "data": data}}
+            return 200, "application/json", json.dumps(body)
+
+        if host == "devfolio.co" and path.endswith("/hackathons.json"):
+            body = copy.deepcopy(self.devfolio)
+            state = body["pageProps"]["dehydratedState"]["queries"][0]["state"]["data"]
+            state["open_hackathons"] = _fill_page(state["open_hackathons"], self.devfolio_count, 1, "name")
+            return 200, "application/json", json.dumps(body)
+
+        if host.endswith(".devfolio.co"):
+            slug = host[: -len(".devfolio.co")]
+            location = DEVFOLIO_LOCATIONS[sum(map(ord, slug)) % len(DEVFOLIO_LOCATIONS)]
+            html = self.devfolio_detail.replace("{name}", slug).replace("{location}", location)
+            return 200, "text/html; charset=utf-8", html
+
+        return 404, "application/json", json.dumps({"error": "not recorded"})
+
+class StubServer:
+    """Threaded HTTP server serving StubPlatforms responses with injected latency"""
+
+    def __init__(self, platforms, latency=0.0, host="127.0.0.1", port=0):
+        self.platforms = platforms
+        self.latency = latency
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                target_host, _, target_path = parts.path.lstrip("/").partition("/")
+                if stub.latency:
+                    time.sleep(stub.latency)
+                status, content_type, body = stub.platforms.respond(
+                    target_host, "/" + target_path, parse_qs(parts.query)
+                )
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def increment(counter, key):
+    """Add one to counter[key], safe to call from several threads"""
+    with _counter_lock:
+        counter[key] = counter.get(key, 0) + 1
+
+def redirect_requests(stub_url, counter=None):
+    """Send every requests call to the stub server instead of the live platforms
+
+    Args:
+        stub_url: Base URL of a running StubServer
+        counter: Optional dict incremented under "requests" for every call
+    """
+    original_request = requests.sessions.Session.request
+
+    def request(self, method, url, *args, **kwargs):
+        parts = urlsplit(url)
+        rewritten = f"{stub_url}/{parts.netloc}{parts.path or '/'}"
+        if parts.query:
+            rewritten = f"{rewritten}?{parts.query}"
+        if counter is not None:
+            increment(counter, "requests")
+        return original_request(self, method, rewritten, *args, **kwargs)
+
+    requests.sessions.Session.request = request
+    return original_request
@@ -0,0 +1,22 @@
+"""
+Test setup: point the app at a throwaway SQLite database before any app module
+is imported, and give tests an isolated scheduling-state store.
+"""
+import tempfile
+
+import pytest
+
+from benchmarks.scrapers import prepare_database
+
+# app.db.database binds its engine on import, so this has to run first
+prepare_database(f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+@pytest.fixture
+def state_store(tmp_path):
+    """Keep last-run and scheduling state in a temporary file for one test"""
+    from app.services import last_run_service
+
+    previous = last_run_service.store
+    last_run_service.set_store(last_run_service.FileLastRunStore(str(tmp_path / "last_run.json")))
+    yield last_run_service.store
+    last_run_service.set_store(previous)
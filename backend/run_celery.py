@@ -1,12 +1,17 @@
 """
 Run Celery worker and beat scheduler for HackRadar
 This script provides a reliable way to run both Celery worker and beat.
+It supervises them: crashed processes are restarted and the number of worker
+processes per queue follows the Redis queue depth.
 """
 import os
+import json
 import logging
+import signal
 import subprocess
 import sys
 import time
+import redis
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -29,53 +34,216 @@ if not REDIS_URL:
     logger.error("REDIS_URL not set in environment variables!")
     sys.exit(1)
 
+# Threads serving the "fetch" queue; fetch tasks spend their time waiting on the network
+FETCH_CONCURRENCY = int(os.getenv("CELERY_FETCH_CONCURRENCY", "16"))
+
+# Processes serving the "persist" queue; each one holds its own DB connection
+PERSIST_CONCURRENCY = int(os.getenv("CELERY_PERSIST_CONCURRENCY", "2"))
+
+# Upper bound on worker processes per queue when scaling up
+FETCH_MAX_WORKERS = int(os.getenv("CELERY_FETCH_MAX_WORKERS", "4"))
+PERSIST_MAX_WORKERS = int(os.getenv("CELERY_PERSIST_MAX_WORKERS", "2"))
+
+# Seconds between health checks and scaling decisions
+SUPERVISOR_CHECK_INTERVAL = float(os.getenv("SUPERVISOR_CHECK_INTERVAL", "5"))
+
+# Add a worker when more than this many tasks are queued per running worker...
+SUPERVISOR_SCALE_UP_DEPTH = int(os.getenv("SUPERVISOR_SCALE_UP_DEPTH", "20"))
+
+# ...or when the oldest queued task has waited longer than this, in seconds
+SUPERVISOR_SCALE_UP_WAIT = float(os.getenv("SUPERVISOR_SCALE_UP_WAIT", "60"))
+
+# Remove an extra worker once its queue has been empty for this long, in seconds
+SUPERVISOR_SCALE_DOWN_IDLE = float(os.getenv("SUPERVISOR_SCALE_DOWN_IDLE", "300"))
+
+# Longest delay between restarts of a process that keeps crashing, in seconds
+SUPERVISOR_MAX_RESTART_DELAY = float(os.getenv("SUPERVISOR_MAX_RESTART_DELAY", "60"))
+
+class ManagedProcess:
+    """A child process that is restarted with exponential backoff when it exits"""
+    
+    def __init__(self, name, cmd):
+        self.name = name
+        self.cmd = cmd
+        self.process = None
+        self.restarts = 0
+        self.restart_at = None
+        self.started_at = None
+    
+    def start(self):
+        self.process = subprocess.Popen(self.cmd)
+        self.started_at = time.monotonic()
+        self.restart_at = None
+        logger.info(f"Started {self.name} (pid {self.process.pid})")
+    
+    def check(self):
+        """Restart the process if it has exited and its backoff delay has passed"""
+        if self.process is None or self.process.poll() is None:
+            # A process that stayed up for a while starts its backoff from scratch
+            if self.process and self.restarts and time.monotonic() - self.started_at > SUPERVISOR_MAX_RESTART_DELAY:
+                self.restarts = 0
+            return
+        
+        now = time.monotonic()
+        if self.restart_at is None:
+            delay = min(SUPERVISOR_MAX_RESTART_DELAY, 2 ** self.restarts)
+            self.restart_at = now + delay
+            logger.error(f"{self.name} exited with code {self.process.returncode}, restarting in {delay:.0f}s")
+        elif now >= self.restart_at:
+            self.restarts += 1
+            self.start()
+    
+    def stop(self, wait=True):
+        if self.process and self.process.poll() is None:
+            # SIGTERM is a warm shutdown for Celery: running tasks are finished first
+            self.process.terminate()
+            if wait:
+                self.process.wait()
+
+class QueueWorkers:
+    """Worker processes consuming one queue, scaled between one and max_workers"""
+    
+    def __init__(self, queue, pool, concurrency, max_workers):
+        self.queue = queue
+        self.pool = pool
+        self.concurrency = concurrency
+        self.max_workers = max(1, max_workers)
+        self.workers = []
+        self.retiring = []
+        self.idle_since = None
+        self._next_index = 0
+    
+    def _command(self, index):
+        return ["celery", "-A", "app.worker", "worker", "--loglevel=WARNING",
+                "-Q", self.queue, "-P", self.pool, "-c", str(self.concurrency), "-n", f"{self.queue}{index}@%h"]
+    
+    def add_worker(self):
+        worker = ManagedProcess(f"{self.queue} worker {self._next_index}", self._command(self._next_index))
+        self._next_index += 1
+        worker.start()
+        self.workers.append(worker)
+    
+    def remove_worker(self):
+        worker = self.workers.pop()
+        logger.info(f"Stopping {worker.name}")
+        worker.stop(wait=False)
+        self.retiring.append(worker)
+    
+    def check(self):
+        for worker in self.workers:
+            worker.check()
+        # Reap workers that finished their warm shutdown
+        self.retiring = [worker for worker in self.retiring if worker.process.poll() is None]
+    
+    def autoscale(self, depth, oldest_wait):
+        """Add a worker under backlog, remove an extra one after a quiet period"""
+        now = time.monotonic()
+        busy = depth > SUPERVISOR_SCALE_UP_DEPTH * len(self.workers) or oldest_wait > SUPERVISOR_SCALE_UP_WAIT
+        if busy and len(self.workers) < self.max_workers:
+            logger.info(f"{self.queue} queue has {depth} tasks, oldest waiting {oldest_wait:.0f}s: adding a worker")
+            self.add_worker()
+        
+        if depth:
+            self.idle_since = None
+        elif self.idle_since is None:
+            self.idle_since = now
+        elif now - self.idle_since > SUPERVISOR_SCALE_DOWN_IDLE and len(self.workers) > 1:
+            self.remove_worker()
+            self.idle_since = now
+    
+    def stop(self):
+        for worker in self.workers + self.retiring:
+            worker.stop(wait=False)
+        for worker in self.workers + self.retiring:
+            if worker.process:
+                worker.process.wait()
+
+def queue_stats(client, queue):
+    """Number of tasks waiting in a Celery queue and the age of the oldest one in seconds"""
+    depth = client.llen(queue)
+    oldest_wait = 0.0
+    if depth:
+        # Kombu pushes on the left and consumes from the right
+        oldest = client.lindex(queue, -1)
+        try:
+            sent_at = json.loads(oldest).get("headers", {}).get("sent_at")
+            if sent_at:
+                oldest_wait = max(0.0, time.time() - sent_at)
+        except (TypeError, ValueError):
+            pass
+    return depth, oldest_wait
+
+def _handle_sigterm(signum, frame):
+    raise KeyboardInterrupt
+
 def run_worker():
-    """Run Celery worker and beat"""
+    """Run and supervise the Celery workers and beat"""
     logger.info("Starting Celery worker and beat for HackRadar")
     
     # Set environment variable to suppress detailed startup logs
     os.environ["SHOW_STARTUP_LOGS"] = "false"
     
-    # Start Celery worker first - make sure it's ready to receive tasks
-    worker_cmd = ["celery", "-A", "app.worker", "worker", "--loglevel=WARNING"]
-    worker_process = subprocess.Popen(worker_cmd)
-    logger.info("Started Celery worker")
+    # Start the Celery workers first - make sure they're ready to receive tasks.
+    # Network-bound fetch tasks get a thread pool, DB writes a small prefork pool.
+    queues = [
+        QueueWorkers("fetch", "threads", FETCH_CONCURRENCY, FETCH_MAX_WORKERS),
+        QueueWorkers("persist", "prefork", PERSIST_CONCURRENCY, PERSIST_MAX_WORKERS),
+    ]
+    for queue_workers in queues:
+        queue_workers.add_worker()
     
     # Wait a moment for worker to initialize
     time.sleep(3)
     
     # Start Celery beat
-    beat_cmd = ["celery", "-A", "app.worker", "beat", "--loglevel=WARNING"]
-    beat_process = subprocess.Popen(beat_cmd)
-    logger.info("Started Celery beat scheduler")
+    beat = ManagedProcess("Celery beat scheduler", ["celery", "-A", "app.worker", "beat", "--loglevel=WARNING"])
+    beat.start()
     
+    # Treat SIGTERM (e.g. from the container runtime) like Ctrl+C
+    signal.signal(signal.SIGTERM, _handle_sigterm)
+    
+    client = redis.Redis.from_url(REDIS_URL)
     try:
-        # Keep the processes running
         while True:
-            time.sleep(1)
+            time.sleep(SUPERVISOR_CHECK_INTERVAL)
+            beat.check()
+            for queue_workers in queues:
+                queue_workers.check()
+                try:
+                    depth, oldest_wait = queue_stats(client, queue_workers.queue)
+                except redis.RedisError as e:
+                    logger.warning(f"Could not read the {queue_workers.queue} queue depth: {str(e)}")
+                    continue
+                queue_workers.autoscale(depth, oldest_wait)
     except KeyboardInterrupt:
         logger.info("Stopping Celery processes...")
-        beat_process.terminate()
-        worker_process.terminate()
+        beat.stop(wait=False)
+        for queue_workers in queues:
+            queue_workers.stop()
         
         # Wait for processes to terminate
-        beat_process.wait()
-        worker_process.wait()
+        beat.process.wait()
         logger.info("Celery processes stopped")
         sys.exit(0)
 
-def trigger_manual_scrape():
-    """Trigger manual scraping task"""
+def trigger_manual_scrape(profile_mode=None):
+    """Trigger manual scraping task, optionally under the profiler"""
     try:
         # Import the task directly
         # We use direct import to ensure the task is registered properly
-        from app.services.hackathon_service import scrape_all_sources
+        from app.services.hackathon_service import scrape_all_sources, SCRAPE_TASK_NAME
+        from app.services.profiling_service import profile
         
         logger.info("Manually triggering scrapers...")
         
         # Run the task synchronously for testing/debugging
         logger.info("Running scrapers - this may take a moment...")
-        result = scrape_all_sources()
+        if profile_mode:
+            with profile(SCRAPE_TASK_NAME, mode=profile_mode) as profile_result:
+                result = scrape_all_sources()
+            logger.info(f"Profile written to {profile_result['path']}")
+        else:
+            result = scrape_all_sources()
         
         if result:
             # Show only essential information about fetched hackathons
@@ -104,6 +272,7 @@ def test_database_connection():
     import datetime
     from app.db.database import SessionLocal
     from app.models.hackathon import HackathonModel
+    from app.models.hackathon_record import HackathonRecord
     from app.services.notification_service import notify_new_hackathons
     
     # Create a unique test hackathon
@@ -136,19 +305,9 @@ def test_database_connection():
         count_after = db.query(HackathonModel).count()
         logger.info(f"Database test successful! Added test hackathon (before: {count_before}, after: {count_after})")
         
-        # Convert to dict format for the notification service
-        test_hackathon_dict = {
-            'id': test_hackathon.id,
-            'name': test_hackathon.name,
-            'description': test_hackathon.description,
-            'location': test_hackathon.location,
-            'source': test_hackathon.source,
-            'url': test_hackathon.registration_link
-        }
-        
         # Send notification for the test hackathon
         logger.info("Sending test notification...")
-        notify_new_hackathons([test_hackathon_dict])
+        notify_new_hackathons([HackathonRecord.from_model(test_hackathon)])
         
     except Exception as e:
         logger.error(f"Database test failed: {str(e)}")
@@ -161,10 +320,12 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         if sys.argv[1] == "scrape":
             trigger_manual_scrape()
+        elif sys.argv[1] == "profile-scrape":
+            trigger_manual_scrape(sys.argv[2] if len(sys.argv) > 2 else "sampling")
         elif sys.argv[1] == "test-db":
             test_database_connection()
         else:
             logger.error(f"Unknown command: {sys.argv[1]}")
-            logger.info("Available commands: scrape, test-db")
+            logger.info("Available commands: scrape, profile-scrape [sampling|cprofile], test-db")
     else:
         run_worker()
\ No newline at end of file
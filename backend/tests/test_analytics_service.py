@@ -0,0 +1,16 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from app.services.analytics_service import LATEST_NAME, export_analytics_snapshot, load_snapshot
+
+DAY = datetime(2026, 1, 1)
+
+def test_concurrent_exports_each_publish_a_complete_snapshot(tmp_path):
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        paths = list(pool.map(lambda _: export_analytics_snapshot(str(tmp_path), DAY), range(4)))
+
+    assert set(paths) == {str(tmp_path / "hackathons-2026-01-01.parquet")}
+    assert os.readlink(tmp_path / LATEST_NAME) == "hackathons-2026-01-01.parquet"
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+    load_snapshot(str(tmp_path / LATEST_NAME))
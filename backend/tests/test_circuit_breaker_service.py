@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from app.services import circuit_breaker_service as circuit
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+def _fail(times, now=NOW):
+    for _ in range(times):
+        state = circuit.record_circuit_result("Devpost", False, now)
+    return state
+
+def test_circuit_stays_closed_below_threshold(state_store):
+    state = _fail(circuit.CIRCUIT_FAILURE_THRESHOLD - 1)
+    assert state == circuit.CircuitState(circuit.CIRCUIT_FAILURE_THRESHOLD - 1, None)
+    assert circuit.circuit_allows("Devpost", NOW)
+
+def test_circuit_opens_at_threshold(state_store):
+    state = _fail(circuit.CIRCUIT_FAILURE_THRESHOLD)
+    assert state.open_until == NOW + timedelta(minutes=circuit.CIRCUIT_OPEN_MINUTES)
+    assert not circuit.circuit_allows("Devpost", NOW)
+    assert circuit.circuit_allows("Unstop", NOW)
+
+def test_half_open_trial_after_open_period(state_store):
+    state = _fail(circuit.CIRCUIT_FAILURE_THRESHOLD)
+    assert circuit.circuit_allows("Devpost", state.open_until)
+
+def test_open_period_doubles_and_is_capped(state_store):
+    state = _fail(circuit.CIRCUIT_FAILURE_THRESHOLD + 1)
+    assert state.open_until == NOW + timedelta(minutes=2 * circuit.CIRCUIT_OPEN_MINUTES)
+    state = _fail(20)
+    assert state.open_until == NOW + timedelta(minutes=circuit.CIRCUIT_MAX_OPEN_MINUTES)
+
+def test_success_closes_circuit(state_store):
+    _fail(circuit.CIRCUIT_FAILURE_THRESHOLD)
+    assert circuit.record_circuit_result("Devpost", True, NOW) == circuit.CircuitState(0, None)
+    assert circuit.circuit_allows("Devpost", NOW)
+    assert circuit.get_circuit("Devpost") == circuit.CircuitState(0, None)
+
+def test_invalid_stored_state_reads_as_closed(state_store):
+    circuit.compare_and_set_state("scrape_circuit:Devpost", None, "garbage")
+    assert circuit.get_circuit("Devpost") == circuit.CircuitState(0, None)
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+from app.services.dedup_service import (
+    DedupRecord, dates_overlap, find_canonical_ids, jaccard, minhash_signature, normalize_name, shingles,
+)
+
+START = datetime(2026, 3, 1)
+
+def record(record_id, name, source, start=START, days=2):
+    return DedupRecord(record_id, name, source, start, start + timedelta(days=days) if start else None)
+
+def test_normalize_name_drops_filler_and_spacing():
+    assert normalize_name("HackMIT 2026") == normalize_name("Hack MIT 2026 Hackathon")
+    assert normalize_name("Code & Coffee - Online Edition") == "codeandcoffee"
+
+def test_shingles_and_jaccard():
+    assert shingles("ab") == frozenset(["ab"])
+    assert shingles("") == frozenset()
+    assert jaccard(shingles("hackmit"), shingles("hackmit")) == 1.0
+    assert jaccard(frozenset(), shingles("hackmit")) == 0.0
+
+def test_minhash_signature_is_deterministic():
+    assert minhash_signature(shingles("hackmit")) == minhash_signature(shingles("hackmit"))
+    assert minhash_signature(shingles("hackmit")) != minhash_signature(shingles("ethindia"))
+
+def test_dates_overlap_with_tolerance():
+    assert dates_overlap(record(1, "a", "x"), record(2, "a", "y", START + timedelta(days=4)))
+    assert not dates_overlap(record(1, "a", "x"), record(2, "a", "y", START + timedelta(days=30)))
+    assert dates_overlap(record(1, "a", "x", None), record(2, "a", "y")) is None
+
+def test_cross_source_listings_share_the_lowest_id():
+    records = [
+        record(7, "ETHIndia 2026", "Devfolio"),
+        record(3, "ETHIndia 2026 Hackathon", "Devpost", START + timedelta(days=1)),
+        record(9, "ETH India 2026", "Unstop"),
+        record(4, "Smart India Hackathon", "Unstop"),
+    ]
+    assert find_canonical_ids(records) == {7: 3, 3: 3, 9: 3, 4: 4}
+
+def test_same_source_or_distant_dates_are_not_merged():
+    records = [
+        record(1, "HackMIT 2026", "Devpost"),
+        record(2, "HackMIT 2026", "Devpost"),
+        record(3, "HackMIT 2026", "Devfolio", START + timedelta(days=60)),
+    ]
+    assert find_canonical_ids(records) == {1: 1, 2: 2, 3: 3}
+
+def test_undated_listings_need_closer_names():
+    records = [
+        record(1, "Build for Bharat", "Devfolio", None),
+        record(2, "Build for Bharat", "Unstop"),
+        record(3, "Build for Bharat Fellowship Challenge", "Devpost", None),
+    ]
+    assert find_canonical_ids(records) == {1: 1, 2: 1, 3: 3}
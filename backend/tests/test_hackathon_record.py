@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from app.models.hackathon_record import HackathonRecord, HackathonReminder
+
+RECORD = HackathonRecord(
+    name="HackMIT", description="Build things", start_date=datetime(2026, 9, 12, 9, 0),
+    end_date=datetime(2026, 9, 14, 18, 0), location="Cambridge, MA", registration_link="https://hackmit.org",
+    source="Devpost", organizer="MIT", prize_inr=500000, themes=("AI", "Web3"), has_prize=True, id=42,
+)
+
+def test_payload_round_trip():
+    payload = RECORD.to_payload()
+    assert payload["start_date"] == "2026-09-12T09:00:00"
+    assert payload["themes"] == ["AI", "Web3"]
+    assert HackathonRecord.from_payload(payload) == RECORD
+
+def test_payload_round_trip_without_dates_or_themes():
+    record = RECORD._replace(start_date=None, end_date=None, themes=())
+    assert HackathonRecord.from_payload(record.to_payload()) == record
+
+def test_from_payload_fills_defaults_and_ignores_unknown_keys():
+    record = HackathonRecord.from_payload({
+        "name": "Old", "description": None, "start_date": None, "end_date": None,
+        "location": None, "registration_link": "https://example.com", "source": "Unstop", "extra": 1,
+    })
+    assert record.themes == () and record.has_prize is False and record.id is None
+
+def test_from_payload_falls_back_to_legacy_url():
+    record = HackathonRecord.from_payload({"name": "Old", "source": "Unstop", "url": "https://example.com/old"})
+    assert record.registration_link == "https://example.com/old"
+
+def test_reminder_payload_round_trip():
+    reminder = HackathonReminder(RECORD, "starts_soon", "start_date", "2026-09-12T09:00:00", 24)
+    payload = reminder.to_payload()
+    assert payload["reminder"] == "starts_soon" and payload["name"] == "HackMIT"
+    assert HackathonReminder.from_payload(payload) == reminder
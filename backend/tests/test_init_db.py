@@ -0,0 +1,36 @@
+from app.db.database import SessionLocal
+from app.db.init_db import _backfill_catalog, _parse_description
+from app.models.hackathon import HackathonModel
+from app.services.prize_service import INR_PER_USD
+
+def test_parse_description():
+    parsed = _parse_description("Themes: AI, Web3 | Prizes: $1,000, $500 | Organized by: MLH | Open to all")
+    assert parsed == {"themes": ["AI", "Web3"], "prize_inr": round(1500 * INR_PER_USD), "organizer": "MLH"}
+    assert _parse_description(None) == {"themes": [], "prize_inr": None, "organizer": None}
+
+def test_backfill_catalog_picks_up_unfilled_rows_on_any_run():
+    db = SessionLocal()
+    try:
+        legacy = HackathonModel(name="Legacy Hack", description="Themes: Fintech | Prize: ₹50,000",
+                                registration_link="https://example.com/legacy", source="Unstop")
+        plain = HackathonModel(name="Plain Hack", description="No labels here",
+                               registration_link="https://example.com/plain", source="Unstop")
+        db.add_all([legacy, plain])
+        db.commit()
+
+        _backfill_catalog()
+        db.expire_all()
+        assert legacy.prize_inr == 50000
+        assert [theme.key for theme in legacy.themes] == ["fintech"]
+        assert plain.prize_inr is None and plain.themes == []
+
+        # Filled rows are no longer candidates, so running again changes nothing
+        legacy.prize_inr = 1
+        db.commit()
+        _backfill_catalog()
+        db.refresh(legacy)
+        assert legacy.prize_inr == 1
+    finally:
+        db.query(HackathonModel).filter(HackathonModel.name.in_(["Legacy Hack", "Plain Hack"])).delete()
+        db.commit()
+        db.close()
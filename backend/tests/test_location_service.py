@@ -0,0 +1,61 @@
+import pytest
+
+from app.services.location_service import (
+    LocationInfo, bounding_box, distance_km, location_columns, normalize_city, normalize_location,
+)
+
+@pytest.mark.parametrize("location, city, country, is_online", [
+    ("Online | Mumbai", "Mumbai", "India", True),
+    ("Pune, India", "Pune", "India", False),
+    ("Mumbai, Maharashtra, India", "Mumbai", "India", False),
+    ("New York, NY, USA", "New York", "United States", False),
+    ("Bengaluru", "Bangalore", "India", False),
+    ("Cochin, Kerala", "Kochi", "India", False),
+    ("Goa", None, "India", False),
+    ("Berlin, Germany", "Berlin", "Germany", False),
+    ("Virtual", None, None, True),
+])
+def test_normalize_location(location, city, country, is_online):
+    info = normalize_location(location)
+    assert (info.city, info.country, info.is_online) == (city, country, is_online)
+    assert (info.latitude is None) == (city is None)
+
+def test_normalize_location_empty():
+    assert normalize_location(None) == LocationInfo()
+    assert normalize_location("") == LocationInfo()
+
+def test_first_city_wins():
+    assert normalize_location("Delhi / Mumbai").city == "Delhi"
+
+def test_normalize_city():
+    assert normalize_city("Gurugram") == "Gurgaon"
+    assert normalize_city("new york city") == "New York"
+    assert normalize_city("Atlantis") is None
+    assert normalize_city(None) is None
+
+def test_location_columns_match_model_columns():
+    assert set(location_columns("Pune")) == {"city", "country", "is_online", "latitude", "longitude"}
+
+def test_distance_km():
+    mumbai, pune = normalize_location("Mumbai"), normalize_location("Pune")
+    assert distance_km(mumbai.latitude, mumbai.longitude, mumbai.latitude, mumbai.longitude) == 0
+    assert 115 < distance_km(mumbai.latitude, mumbai.longitude, pune.latitude, pune.longitude) < 125
+
+def test_bounding_box_contains_the_radius():
+    latitude, longitude, radius = 19.076, 72.8777, 50
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius)
+    assert distance_km(latitude, longitude, max_lat, longitude) == pytest.approx(radius, rel=0.01)
+    assert distance_km(latitude, longitude, latitude, max_lon) >= radius * 0.99
+    assert min_lat < latitude < max_lat and min_lon < longitude < max_lon
+
+def test_bounding_box_near_pole_spans_all_longitudes():
+    _, _, min_lon, max_lon = bounding_box(90, 10, 100)
+    assert max_lon - min_lon == 360
+
+@pytest.mark.parametrize("location", ["Online | Bengaluru", "Bombay, India", "NYC", "Mysuru"])
+def test_topics_follow_the_stored_city(location):
+    from app.services.topic_routing_service import CITY_TOPICS, location_topics
+
+    city = normalize_location(location).city
+    city_topics = [topic.label for topic in location_topics(location) if topic.kind == "city"]
+    assert city_topics == ([city] if city in CITY_TOPICS else [])
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.database import SessionLocal
+from app.models.hackathon import HackathonModel
+from app.models.hackathon_record import HackathonRecord
+from app.models.notification_outbox import NotificationOutboxModel
+from app.services import outbox_service
+from app.services.notification_service import SendResult
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    session.query(NotificationOutboxModel).delete()
+    session.commit()
+    yield session
+    session.query(NotificationOutboxModel).delete()
+    session.commit()
+    session.close()
+
+def add_event(db, key, **columns):
+    hackathon = HackathonRecord(f"Hack {key}", None, None, None, "Online | Pune", "https://example.com", "Devpost",
+                                id=1000 + key)
+    row = NotificationOutboxModel(idempotency_key=f"{outbox_service.HACKATHON_CREATED}:{key}",
+                                  event_type=outbox_service.HACKATHON_CREATED, payload=hackathon.to_payload(),
+                                  **columns)
+    db.add(row)
+    db.commit()
+    return row.id
+
+def test_claim_batch_takes_due_events_and_stale_claims(db):
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=outbox_service.OUTBOX_CLAIM_TIMEOUT_SECONDS + 60)
+    due = add_event(db, 1, status="pending", next_attempt_at=now - timedelta(minutes=1))
+    add_event(db, 2, status="pending", next_attempt_at=now + timedelta(minutes=5))
+    abandoned = add_event(db, 3, status="processing", next_attempt_at=stale, claimed_at=stale)
+    add_event(db, 4, status="processing", next_attempt_at=now, claimed_at=now)
+    add_event(db, 5, status="sent", next_attempt_at=now - timedelta(minutes=1))
+
+    claimed = outbox_service._claim_batch(db, now)
+
+    assert [row.id for row in claimed] == [due, abandoned]
+    assert all(row.status == "processing" and row.claimed_at is not None for row in claimed)
+
+def test_failed_delivery_backs_off_then_fails(db, monkeypatch):
+    monkeypatch.setattr(outbox_service, "OUTBOX_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(outbox_service, "send_notifications",
+                        lambda messages: [SendResult(message, False, error="unavailable") for message in messages])
+    row_id = add_event(db, 1, next_attempt_at=datetime.utcnow() - timedelta(seconds=1))
+
+    assert outbox_service.drain_outbox()["retry"] == 1
+    row = db.get(NotificationOutboxModel, row_id)
+    db.refresh(row)
+    assert (row.status, row.attempts, row.last_error) == ("pending", 1, "unavailable")
+    delay = row.next_attempt_at - datetime.utcnow()
+    assert timedelta(seconds=outbox_service.OUTBOX_BACKOFF_SECONDS - 5) < delay <= timedelta(
+        seconds=outbox_service.OUTBOX_BACKOFF_SECONDS)
+
+    # Not due yet, so the next drain leaves it alone
+    assert not any(outbox_service.drain_outbox().values())
+
+    row.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    assert outbox_service.drain_outbox()["failed"] == 1
+    db.refresh(row)
+    assert (row.status, row.attempts) == ("failed", 2)
+
+def test_retries_skip_targets_already_notified(db, monkeypatch):
+    sent = []
+    failing = {"devpost_hackathons"}
+
+    def send(messages):
+        sent.append({message.target for message in messages})
+        return [SendResult(message, message.target not in failing) for message in messages]
+
+    monkeypatch.setattr(outbox_service, "send_notifications", send)
+    row_id = add_event(db, 1, next_attempt_at=datetime.utcnow() - timedelta(seconds=1))
+
+    outbox_service.drain_outbox()
+    row = db.get(NotificationOutboxModel, row_id)
+    db.refresh(row)
+    assert "devpost_hackathons" not in row.delivered_targets
+    assert {"pune_hackathons", "online_hackathons"} <= set(row.delivered_targets)
+
+    row.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    failing.clear()
+    assert outbox_service.drain_outbox()["sent"] == 1
+    assert sent[1] == {"devpost_hackathons"}
+
+def test_duplicates_stored_but_not_yet_linked_are_cancelled(db, monkeypatch):
+    sent = []
+    monkeypatch.setattr(outbox_service, "send_notifications",
+                        lambda messages: sent.extend(messages) or [SendResult(message, True) for message in messages])
+    start = datetime(2026, 3, 1)
+    rows = [HackathonModel(name="Smart India Hackathon 2026", description=None, start_date=start, end_date=start,
+                           location="Online", registration_link=f"https://example.com/{source}", source=source)
+            for source in ("Devpost", "Unstop")]
+    db.add_all(rows)
+    db.commit()
+    canonical, duplicate = rows
+    # Ingest commits these events before duplicate detection links the rows
+    for row in rows:
+        db.add(NotificationOutboxModel(idempotency_key=f"{outbox_service.HACKATHON_CREATED}:{row.id}",
+                                       event_type=outbox_service.HACKATHON_CREATED,
+                                       payload=HackathonRecord.from_model(row).to_payload(),
+                                       next_attempt_at=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+
+    try:
+        assert outbox_service.drain_outbox() == {"sent": 1, "retry": 0, "failed": 0, "cancelled": 1}
+        db.refresh(duplicate)
+        assert duplicate.canonical_id == canonical.id
+        assert {message.target for message in sent} >= {"devpost_hackathons"}
+        assert "unstop_hackathons" not in {message.target for message in sent}
+    finally:
+        for row in rows:
+            db.delete(row)
+        db.commit()
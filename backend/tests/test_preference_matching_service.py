@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from app.models.hackathon_record import HackathonRecord
+from app.services.preference_matching_service import (
+    PreferenceIndex, hackathon_attributes, match_preferences, normalize_city, normalize_theme,
+)
+
+def preference(token, cities=None, themes=None, sources=None, mode=None, require_prize=False):
+    return SimpleNamespace(token=token, cities=cities, themes=themes, sources=sources,
+                           mode=mode, require_prize=require_prize)
+
+def hackathon(location, source="Devfolio", themes=(), has_prize=False):
+    return HackathonRecord("Hack", None, None, None, location, "https://example.com", source,
+                           themes=tuple(themes), has_prize=has_prize)
+
+def tokens(index, hackathon_record):
+    return {index.tokens[position] for position in index.positions(index.match(hackathon_attributes(hackathon_record)))}
+
+def test_normalize_city_maps_aliases_and_keeps_unknown_names():
+    assert normalize_city("Bengaluru") == "bangalore"
+    assert normalize_city(" New  York City ") == "new york"
+    assert normalize_city("Anand") == "anand"
+
+def test_normalize_theme_returns_full_theme_then_parts():
+    assert normalize_theme("Machine Learning/AI") == ["machine learning/ai", "machine learning", "ai"]
+    assert normalize_theme("  ") == []
+
+def test_hackathon_attributes():
+    attributes = hackathon_attributes(hackathon("Online | Bengaluru", themes=["Web3"], has_prize=True))
+    assert attributes["city"][0] == "bangalore"
+    assert attributes["theme"] == ["web3"]
+    assert attributes["source"] == ["devfolio"]
+    assert attributes["mode"] == ["online"]
+    assert attributes["prize"] == ["yes"]
+
+def test_empty_rules_match_everything():
+    index = PreferenceIndex([preference("all")])
+    assert tokens(index, hackathon("Pune")) == {"all"}
+
+def test_every_dimension_must_match():
+    index = PreferenceIndex([
+        preference("mumbai", cities=["Bombay"]),
+        preference("mumbai-ai", cities=["Mumbai"], themes=["AI"]),
+        preference("online", mode="online"),
+        preference("prize", require_prize=True),
+        preference("unstop", sources=["Unstop"]),
+    ])
+
+    assert tokens(index, hackathon("Mumbai, India")) == {"mumbai"}
+    assert tokens(index, hackathon("Mumbai", themes=["Machine Learning/AI"])) == {"mumbai", "mumbai-ai"}
+    assert tokens(index, hackathon("Online", has_prize=True)) == {"online", "prize"}
+    assert tokens(index, hackathon("Delhi", source="Unstop")) == {"unstop"}
+
+def test_positions_decodes_bits_across_bytes():
+    index = PreferenceIndex([preference(str(i)) for i in range(20)])
+    assert index.positions((1 << 0) | (1 << 9) | (1 << 19)) == [0, 9, 19]
+    assert index.positions(0) == []
+
+def test_match_preferences_groups_subscribers_by_matched_hackathons():
+    index = PreferenceIndex([
+        preference("a", cities=["Pune"]),
+        preference("b", cities=["Pune"]),
+        preference("c"),
+    ])
+    groups = match_preferences([hackathon("Pune"), hackathon("Delhi")], index)
+    assert groups == {(0,): ["a", "b"], (0, 1): ["c"]}
+    assert match_preferences([], index) == {}
@@ -0,0 +1,39 @@
+import pytest
+
+from app.services.prize_service import (
+    INR_PER_EUR, INR_PER_USD, currency_code, parse_prize_amount, to_inr, total_prize_inr,
+)
+
+@pytest.mark.parametrize("text, expected", [
+    ("$10,000", 10000 * INR_PER_USD),
+    ("₹1,00,000", 100000),
+    ("$1.5M in prizes", 1.5e6 * INR_PER_USD),
+    ("₹2 lakh", 200000),
+    ("Rs. 50k", 50000),
+    ("5000 INR", 5000),
+    ("€2,000 first prize, €500 second", 2000 * INR_PER_EUR),
+    ("Swag and goodies", None),
+    ("10,000 points", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_prize_amount(text, expected):
+    assert parse_prize_amount(text) == (None if expected is None else int(round(expected)))
+
+def test_parse_prize_amount_takes_the_largest_amount():
+    assert parse_prize_amount("₹10,000 or $500") == 500 * INR_PER_USD
+
+def test_currency_code():
+    assert currency_code("fa-rupee") == "INR"
+    assert currency_code("$") == "USD"
+    assert currency_code("doge") is None
+    assert currency_code(None) is None
+
+def test_to_inr():
+    assert to_inr(10, "USD") == round(10 * INR_PER_USD)
+    assert to_inr(10, "dollars") == round(10 * INR_PER_USD)
+    assert to_inr(10, "XYZ") is None
+
+def test_total_prize_inr_skips_unconvertible_entries():
+    assert total_prize_inr([(1000, "INR"), (10, "USD"), (5, "XYZ"), (None, "INR"), ("n/a", "INR")]) == 1000 + 10 * INR_PER_USD
+    assert total_prize_inr([(5, "XYZ")]) is None
@@ -0,0 +1,25 @@
+import pytest
+
+from app.services import profiling_service
+
+@pytest.fixture
+def profiling(monkeypatch):
+    def configure(token="", allow_local=False):
+        monkeypatch.setattr(profiling_service, "PROFILING_TOKEN", token)
+        monkeypatch.setattr(profiling_service, "PROFILING_ALLOW_LOCAL", allow_local)
+    return configure
+
+def test_no_token_denies_every_client(profiling):
+    profiling()
+    assert not profiling_service.profiling_allowed("1", "127.0.0.1")
+    assert not profiling_service.profiling_allowed("1", "203.0.113.7")
+
+def test_token_must_match(profiling):
+    profiling(token="secret")
+    assert profiling_service.profiling_allowed("secret", "203.0.113.7")
+    assert not profiling_service.profiling_allowed("guess", "127.0.0.1")
+
+def test_local_clients_only_with_opt_in(profiling):
+    profiling(allow_local=True)
+    assert profiling_service.profiling_allowed("1", "::1")
+    assert not profiling_service.profiling_allowed("1", "203.0.113.7")
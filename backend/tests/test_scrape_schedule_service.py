@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services import scrape_schedule_service as schedule
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+def test_next_interval_speeds_up_after_changes_and_backs_off_when_quiet():
+    assert schedule.next_interval(24, 3) == 24 / schedule.SCRAPE_SPEEDUP_FACTOR
+    assert schedule.next_interval(24, 0) == 24 * schedule.SCRAPE_BACKOFF_FACTOR
+
+def test_next_interval_stays_within_bounds():
+    assert schedule.next_interval(schedule.SCRAPE_MIN_INTERVAL_HOURS, 5) == schedule.SCRAPE_MIN_INTERVAL_HOURS
+    assert schedule.next_interval(schedule.SCRAPE_MAX_INTERVAL_HOURS, 0) == schedule.SCRAPE_MAX_INTERVAL_HOURS
+
+@pytest.mark.parametrize("outcome", ["partial", "failed", "skipped"])
+def test_next_interval_ignores_incomplete_runs(outcome):
+    assert schedule.next_interval(24, 0, outcome) == 24
+    assert schedule.next_interval(24, 7, outcome) == 24
+
+def test_first_claim_takes_every_source_once(state_store):
+    assert schedule.claim_due_sources(["Devpost", "Unstop"], NOW) == ["Devpost", "Unstop"]
+    # The lease holds them until it runs out
+    assert schedule.claim_due_sources(["Devpost", "Unstop"], NOW) == []
+    lease_end = NOW + timedelta(minutes=schedule.SCRAPE_DISPATCH_LEASE_MINUTES, seconds=1)
+    assert schedule.claim_due_sources(["Devpost"], lease_end) == ["Devpost"]
+
+def test_completed_run_schedules_after_adapted_interval(state_store):
+    result = schedule.record_scrape_result("Devpost", 0, "ok", NOW)
+    interval = schedule.SCRAPE_INITIAL_INTERVAL_HOURS * schedule.SCRAPE_BACKOFF_FACTOR
+    assert result == schedule.SourceSchedule(NOW + timedelta(hours=interval), interval)
+    assert schedule.get_schedules(["Devpost", "Unstop"]) == {"Devpost": result, "Unstop": None}
+
+def test_failed_run_keeps_interval_and_retries_soon(state_store):
+    schedule.record_scrape_result("Devpost", 4, "ok", NOW)
+    interval = schedule.SCRAPE_INITIAL_INTERVAL_HOURS / schedule.SCRAPE_SPEEDUP_FACTOR
+
+    result = schedule.record_scrape_result("Devpost", 0, "failed", NOW)
+
+    assert result.interval_hours == interval
+    assert result.next_run == NOW + min(timedelta(hours=interval), timedelta(minutes=schedule.SCRAPE_RETRY_MINUTES))